@@ -1,11 +1,16 @@
 # project_forge/cli/menu.py
 import argparse
+import glob
 import yaml
 import sys
 import os
 import shutil
 from typing import Optional, List
 from ..cli.colors import Colors
+from ..core.catalog import SORT_COLUMNS
+from ..core.copier import COPY_MODES
+from ..core.plan import OrganizePlan
+from .reporter import create_reporter
 
 def print_menu(title: str, options: List[str], width: int = 50) -> None:
     """Print a styled menu"""
@@ -33,12 +38,25 @@ class CLI:
                             help='Path to configuration file')
         parser.add_argument('--reconfigure', action='store_true',
                             help='Reconfigure master folders and base path')
+        output_group = parser.add_mutually_exclusive_group()
+        output_group.add_argument('--quiet', dest='output', action='store_const', const='quiet',
+                                  help='Only print errors and summaries')
+        output_group.add_argument('--progress', dest='output', action='store_const', const='progress',
+                                  help='Show a single live progress line instead of one line per file')
+        output_group.add_argument('--json', dest='output', action='store_const', const='json',
+                                  help='Print events as JSON lines')
+        parser.add_argument('--refresh-rate', type=float, default=10,
+                            help='Maximum progress line redraws per second (default: 10)')
         
         subparsers = parser.add_subparsers(dest='command', help='Commands')
 
         # Create project command
         create_parser = subparsers.add_parser('create', help='Create new project')
-        create_parser.add_argument('name', help='Project name')
+        create_parser.add_argument('name', nargs='?', help='Project name')
+        create_parser.add_argument('--from', dest='from_file', metavar='FILE',
+                                   help='Create every project listed in a .csv or .yaml file')
+        create_parser.add_argument('--workers', type=int,
+                                   help='Parallel workers for --from (default: organize.workers)')
         create_parser.add_argument('--status', 
                                    choices=[f['name'] for f in self.create_manager().master_folders],
                                    default=self.create_manager().defaults['status'],
@@ -55,8 +73,102 @@ class CLI:
         organize_parser.add_argument('--pattern',
                                      choices=list(self.create_manager().naming_patterns.keys()),
                                      help='Naming pattern')
-
-        return parser.parse_args()
+        organize_parser.add_argument('--copy-mode', choices=COPY_MODES,
+                                     help='Copy strategy (default: organize.copy_mode from config)')
+        organize_parser.add_argument('--allow-hardlinks', action='store_true', default=None,
+                                     help='Allow hardlinking files that cannot be reflinked')
+        organize_parser.add_argument('--dedup', action='store_true', default=None,
+                                     help='Store identical same-named files only once')
+        organize_parser.add_argument('--full', action='store_true',
+                                     help='Ignore the source manifest and copy every file again')
+        organize_parser.add_argument('--delete-removed', action='store_true', default=None,
+                                     help='Remove files of the software copy that are gone from the source')
+        organize_parser.add_argument('--dry-run', action='store_true',
+                                     help='Only plan the run and print what it would do')
+        organize_parser.add_argument('--plan-out', metavar='FILE',
+                                     help='Write the plan to FILE (.json or .jsonl)')
+        organize_parser.add_argument('--in-place', action='store_true',
+                                     help='Reorganize the source directory itself by moving files '
+                                          '(with --dry-run or --plan-out, only plan the moves)')
+
+        # Execute plan command
+        execute_parser = subparsers.add_parser('execute', help='Execute a saved organize plan')
+        execute_parser.add_argument('plan', help='Plan file written with organize --plan-out')
+        execute_parser.add_argument('--copy-mode', choices=COPY_MODES,
+                                    help='Copy strategy (default: organize.copy_mode from config)')
+        execute_parser.add_argument('--allow-hardlinks', action='store_true', default=None,
+                                    help='Allow hardlinking files that cannot be reflinked')
+        execute_parser.add_argument('--delete-removed', action='store_true', default=None,
+                                    help='Remove files of the software copy that are gone from the source')
+
+        # Move projects command
+        statuses = [f['name'] for f in self.create_manager().master_folders]
+        move_parser = subparsers.add_parser('move', help='Move projects to another status')
+        move_parser.add_argument('names', nargs='*', help='Project names')
+        move_parser.add_argument('--to', dest='to_status', required=True, choices=statuses,
+                                 help='New status')
+        move_parser.add_argument('--from', dest='from_status', choices=statuses,
+                                 help='Current status (looked up in the catalog if omitted)')
+        move_parser.add_argument('--tag', dest='tags', action='append', default=[],
+                                 help='Also move projects with this tag (repeatable, all must match)')
+        move_parser.add_argument('--name', dest='name_glob', metavar='GLOB',
+                                 help='Also move projects whose name matches this pattern')
+        move_parser.add_argument('--workers', type=int,
+                                 help='Parallel copy workers across filesystems (default: organize.workers)')
+
+        # List projects command
+        list_parser = subparsers.add_parser('list', help='List projects from the project catalog')
+        list_parser.add_argument('--status', action='append',
+                                 help='Only projects in this status (repeatable)')
+        list_parser.add_argument('--tag', dest='tags', action='append', default=[],
+                                 help='Only projects with this tag (repeatable, all must match)')
+        list_parser.add_argument('--type', dest='software_type',
+                                 help='Only software projects of this type (e.g. platformio)')
+        list_parser.add_argument('--created-after', metavar='YYYY-MM-DD',
+                                 help='Only projects created on or after this day')
+        list_parser.add_argument('--name', dest='name_glob', metavar='GLOB',
+                                 help='Only projects whose name matches this pattern')
+        list_parser.add_argument('--sort', choices=SORT_COLUMNS, default='name',
+                                 help='Sort column (default: name)')
+        list_parser.add_argument('--desc', action='store_true',
+                                 help='Sort in descending order')
+        list_parser.add_argument('--limit', type=int,
+                                 help='Show at most this many projects')
+        list_parser.add_argument('--offset', type=int, default=0,
+                                 help='Skip this many projects (for paging)')
+        list_parser.add_argument('--refresh', dest='deep', action='store_true',
+                                 help='Re-read every project, including files changed in subfolders')
+
+        # Library store commands
+        libs_parser = subparsers.add_parser('libs', help='Manage the shared library store')
+        libs_commands = libs_parser.add_subparsers(dest='libs_command', required=True)
+        gc_parser = libs_commands.add_parser('gc', help='Remove libraries no project uses')
+        gc_parser.add_argument('--dry-run', action='store_true',
+                               help='Only list what would be removed')
+
+        # Backup commands
+        backups_parser = subparsers.add_parser('backups', help='Manage structure backups')
+        backups_commands = backups_parser.add_subparsers(dest='backups_command', required=True)
+        backups_gc_parser = backups_commands.add_parser('gc', help='Apply the backups retention policy')
+        backups_gc_parser.add_argument('--dry-run', action='store_true',
+                                       help='Only list what would be removed or packed')
+        backups_gc_parser.add_argument('--no-pack', dest='pack', action='store_false',
+                                       help='Do not pack old snapshots into archives')
+
+        # Rollback command
+        rollback_parser = subparsers.add_parser('rollback', help='Undo an in-place organization')
+        rollback_parser.add_argument('source', help='Directory organized with organize --in-place')
+
+        args = parser.parse_args()
+        if args.command == 'organize' and args.in_place:
+            # Moves within the source neither copy, deduplicate nor use the manifest
+            ignored = [flag for flag, value in (('--copy-mode', args.copy_mode),
+                                                ('--allow-hardlinks', args.allow_hardlinks),
+                                                ('--dedup', args.dedup), ('--full', args.full),
+                                                ('--delete-removed', args.delete_removed)) if value]
+            if ignored:
+                organize_parser.error(f"{', '.join(ignored)} cannot be used with --in-place")
+        return args
 
     def interactive_mode(self) -> None:
         """Run interactive CLI menu"""
@@ -359,32 +471,33 @@ This will:
                 continue
 
             # Move project
-            try:
-                old_path = os.path.join(self.create_manager().base_path, current_status, project_name)
-                new_path = os.path.join(self.create_manager().base_path, new_status, project_name)
-                
-                if os.path.exists(new_path):
-                    print(Colors.error(f"A project named '{project_name}' already exists in {new_status}!"))
-                    input(Colors.info("\nPress Enter to continue..."))
-                    continue
-                    
-                shutil.move(old_path, new_path)
-                
-                # Update project.yaml
-                yaml_path = os.path.join(new_path, "project.yaml")
-                if os.path.exists(yaml_path):
-                    with open(yaml_path, 'r') as f:
-                        data = yaml.safe_load(f)
-                    data['status'] = new_status
-                    with open(yaml_path, 'w') as f:
-                        yaml.dump(data, f, default_flow_style=False)
-                        
-                print(Colors.success(f"\nSuccessfully moved '{project_name}' to {new_status}"))
-                input(Colors.info("\nPress Enter to continue..."))
-                
-            except Exception as e:
-                print(Colors.error(f"Error moving project: {e}"))
-                input(Colors.info("\nPress Enter to continue..."))
+            self.create_manager().move_projects([(project_name, current_status, new_status)])
+            input(Colors.info("\nPress Enter to continue..."))
+
+    @staticmethod
+    def _resolve_moves(manager, args) -> List[tuple]:
+        """(name, from_status, to_status) moves for the move command's arguments"""
+        moves = []
+        if args.tags or args.name_glob:
+            for project in manager.query_projects(status=args.from_status, tags=args.tags,
+                                                  name_glob=args.name_glob):
+                if project['status'] != args.to_status:
+                    moves.append((project['name'], project['status'], args.to_status))
+        for name in args.names:
+            if args.from_status:
+                moves.append((name, args.from_status, args.to_status))
+                continue
+            found = [p['status'] for p in manager.query_projects(name_glob=glob.escape(name))
+                     if p['name'] == name and p['status'] != args.to_status]
+            if len(found) == 1:
+                moves.append((name, found[0], args.to_status))
+            elif found:
+                manager.reporter.note('error', f"'{name}' exists in {', '.join(found)}; use --from")
+            else:
+                manager.reporter.note('error', f"No project '{name}' outside {args.to_status}")
+        if not moves:
+            manager.reporter.note('warning', "No projects to move")
+        return list(dict.fromkeys(moves))
 
     def _list_projects(self):
         """List all projects"""
@@ -421,11 +534,60 @@ def main():
             cli.interactive_mode()
         else:
             manager = cli.create_manager()
+            manager.set_reporter(create_reporter(args.output or 'lines', args.refresh_rate))
             if args.command == 'create':
-                manager.create_project(args.name, args.status)
+                if args.from_file:
+                    manager.create_projects_from_file(args.from_file, args.workers, args.status)
+                elif args.name:
+                    manager.create_project(args.name, args.status)
+                else:
+                    manager.reporter.note('error', "Give a project name or --from FILE")
             elif args.command == 'organize':
-                manager.organize_existing_project(args.source, args.name, 
-                                                  args.status, args.pattern)
+                if args.in_place and (args.dry_run or args.plan_out):
+                    plan = manager.plan_in_place(args.source, args.name, args.status, args.pattern)
+                    manager.print_plan_summary(plan)
+                    if args.plan_out:
+                        plan.write(args.plan_out)
+                        manager.reporter.note('success', f"Plan written to {args.plan_out}")
+                elif args.in_place:
+                    manager.organize_project_in_place(args.source, args.name, args.status, args.pattern)
+                elif args.dry_run or args.plan_out:
+                    plan = manager.plan_existing_project(args.source, args.name, args.status,
+                                                         args.pattern, dedup=args.dedup,
+                                                         incremental=False if args.full else None)
+                    manager.print_plan_summary(plan)
+                    if args.plan_out:
+                        plan.write(args.plan_out)
+                        manager.reporter.note('success', f"Plan written to {args.plan_out}")
+                    if not args.dry_run:
+                        manager.execute_plan(plan, args.copy_mode, args.allow_hardlinks, args.delete_removed)
+                else:
+                    manager.organize_existing_project(args.source, args.name, 
+                                                      args.status, args.pattern,
+                                                      copy_mode=args.copy_mode,
+                                                      allow_hardlinks=args.allow_hardlinks,
+                                                      dedup=args.dedup,
+                                                      incremental=False if args.full else None,
+                                                      delete_removed=args.delete_removed)
+            elif args.command == 'execute':
+                plan = OrganizePlan.load(args.plan)
+                manager.print_plan_summary(plan)
+                manager.execute_plan(plan, args.copy_mode, args.allow_hardlinks, args.delete_removed)
+            elif args.command == 'move':
+                moves = cli._resolve_moves(manager, args)
+                if moves:
+                    manager.move_projects(moves, args.workers)
+            elif args.command == 'list':
+                manager.list_projects(args.status, args.tags, args.software_type, args.created_after,
+                                      args.name_glob, args.sort, args.desc, args.limit, args.offset,
+                                      args.deep)
+            elif args.command == 'libs':
+                manager.gc_libraries(args.dry_run)
+            elif args.command == 'backups':
+                manager.gc_backups(args.dry_run, args.pack)
+            elif args.command == 'rollback':
+                manager.rollback_in_place(args.source)
+            manager.reporter.close()
 
     except KeyboardInterrupt:
         print(Colors.warning("\nOperation cancelled by user"))
@@ -0,0 +1,125 @@
+# project_forge/cli/reporter.py
+import json
+import shutil
+import sys
+import time
+from collections import Counter
+from typing import Any, Optional, TextIO
+from .colors import Colors
+
+# Reporting modes selectable from the command line
+REPORT_MODES = ['lines', 'quiet', 'progress', 'json']
+
+
+class Reporter:
+    """Console output for handlers: one colored line per event
+
+    Handlers report per-file/per-folder events with item() and headers or
+    summaries with note(). Subclasses change how much of that reaches the
+    terminal; item() is called in hot loops, so it must stay cheap.
+    """
+
+    def item(self, status: str, message: str, **data: Any) -> None:
+        """Report one processed file or folder
+
+        status is a Colors style (success, info, warning, error, header) or
+        'plain' for uncolored text; data carries structured fields for
+        machine-readable output.
+        """
+        print(self._format(status, message))
+
+    def note(self, status: str, message: str, **data: Any) -> None:
+        """Report a header, summary line or other one-off message"""
+        print(self._format(status, message))
+
+    def close(self) -> None:
+        """Flush any pending output"""
+
+    @staticmethod
+    def _format(status: str, message: str) -> str:
+        return message if status == 'plain' else getattr(Colors, status)(message)
+
+
+class QuietReporter(Reporter):
+    """Only errors, headers and summaries"""
+
+    def item(self, status: str, message: str, **data: Any) -> None:
+        if status == 'error':
+            print(Colors.error(message))
+
+
+class ProgressReporter(Reporter):
+    """A single status line, redrawn at most refresh_rate times per second"""
+
+    def __init__(self, refresh_rate: float = 10, stream: TextIO = None):
+        self.interval = 1.0 / refresh_rate if refresh_rate > 0 else 0
+        self.stream = stream or sys.stdout
+        self.counts = Counter()
+        self._last_draw = 0.0
+        self._last_message = ''
+        self._drawn = False
+
+    def item(self, status: str, message: str, **data: Any) -> None:
+        self.counts[status] += 1
+        self._last_message = message
+        if status == 'error':
+            self._clear()
+            print(Colors.error(message), file=self.stream)
+        now = time.monotonic()
+        if now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._draw()
+
+    def note(self, status: str, message: str, **data: Any) -> None:
+        self._clear()
+        super().note(status, message)
+
+    def close(self) -> None:
+        if self.counts:
+            self._draw()
+            self.stream.write('\n')
+            self.stream.flush()
+        self.counts.clear()
+        self._drawn = False
+
+    def _draw(self) -> None:
+        width = shutil.get_terminal_size((80, 20)).columns
+        done = sum(self.counts.values())
+        line = f"{done} processed, {self.counts['error']} errors | {self._last_message}"
+        self.stream.write('\r' + line[:width - 1].ljust(width - 1))
+        self.stream.flush()
+        self._drawn = True
+
+    def _clear(self) -> None:
+        if self._drawn:
+            width = shutil.get_terminal_size((80, 20)).columns
+            self.stream.write('\r' + ' ' * (width - 1) + '\r')
+            self._drawn = False
+
+
+class JsonReporter(Reporter):
+    """Machine-readable JSON lines, one object per event"""
+
+    def __init__(self, stream: TextIO = None):
+        self.stream = stream or sys.stdout
+
+    def item(self, status: str, message: str, **data: Any) -> None:
+        self.stream.write(json.dumps({'event': 'item', 'status': status, 'message': message, **data}) + '\n')
+
+    def note(self, status: str, message: str, **data: Any) -> None:
+        self.stream.write(json.dumps({'event': 'note', 'status': status, 'message': message.strip(), **data}) + '\n')
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+def create_reporter(mode: str = 'lines', refresh_rate: float = 10,
+                    stream: Optional[TextIO] = None) -> Reporter:
+    """Build the reporter for a mode in REPORT_MODES"""
+    if mode == 'quiet':
+        return QuietReporter()
+    if mode == 'progress':
+        return ProgressReporter(refresh_rate, stream)
+    if mode == 'json':
+        return JsonReporter(stream)
+    return Reporter()
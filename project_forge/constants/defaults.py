@@ -80,6 +80,37 @@ Add project description here.
             'test'
         ]
     },
+    'software_detection': {
+        'max_depth': 8             # Directory levels searched for project markers
+    },
+    'software_copy': {
+        'exclude': [               # Regenerable caches left out of software copies
+            '.pio/build',
+            '.pio/libdeps'
+        ],
+        'delta_sync': True,        # Update existing copies instead of replacing them
+        'delete_removed': False    # Also remove files of a copy that are gone from the source
+    },
+    'library_store': {
+        'enabled': False,          # Share identical firmware libraries across projects
+        'link_mode': 'hardlink',   # hardlink (copy across filesystems) or symlink
+        'path': None               # Defaults to <base_path>/.forge_libs
+    },
+    'catalog': {
+        'path': None               # Project index, defaults to <base_path>/.forge_catalog.sqlite
+    },
+    'backups': {
+        'path': None,              # Defaults to <base_path>/.forge_backups
+        'keep_last': 5,            # Always keep the newest N backups
+        'keep_daily': 7,           # Newest backup of each of the last N days with one
+        'keep_weekly': 4,          # Newest backup of each of the last N weeks with one
+        'max_bytes': None,         # Drop the oldest backups beyond this total size
+        'pack_after_days': 30      # Pack older snapshots into .tar.gz archives (None: never)
+    },
+    'arduino_libraries': {
+        'resolve_includes': True,  # Copy only libraries the sketch #includes
+        'cache_path': None         # Include cache, defaults to <base_path>/.forge_arduino_libraries.json
+    },
     'preserved_software_structure': [
         'src',
         'include',
@@ -91,6 +122,15 @@ Add project description here.
         'scripts',
         'data'
     ],
+    'organize': {
+        'workers': 8,              # Parallel copy threads
+        'queue_size': 256,         # Pending copies buffered between scan and copy
+        'copy_mode': 'auto',       # auto, reflink, copy_file_range, hardlink, rename, copy
+        'allow_hardlinks': False,  # Let 'auto' hardlink files it cannot reflink
+        'dedup': False,            # Store identical same-named files only once
+        'incremental': True,       # Skip files unchanged since the last organize
+        'case_sensitive_names': None  # None probes the target filesystem; True/False forces it
+    },
     'ignore_patterns': [
         r'^\.',           # Hidden files
         r'^__pycache__$', # Python cache
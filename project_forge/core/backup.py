@@ -0,0 +1,322 @@
+# project_forge/core/backup.py
+import errno
+import os
+import re
+import shutil
+import tarfile
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .copier import DEFAULT_WORKERS, CopyEngine, CopyJob, FileCopier
+from .scanner import DirectoryScanner
+
+# Backups live in a hidden folder of the workspace, out of the status folders
+BACKUP_DIR = '.forge_backups'
+BACKUP_PREFIX = 'structure_backup_'
+ARCHIVE_SUFFIX = '.tar.gz'
+BACKUP_PATTERN = re.compile(r'^structure_backup_(\d{8}_\d{6})(\.tar\.gz)?$')
+# Snapshots, archives and migrated backups are written under this name, then renamed
+PARTIAL_PATTERN = re.compile(r'^\.structure_backup_.*\.partial$')
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def backup_time(path: str) -> datetime:
+    """When a backup (folder or archive) was taken, from its name"""
+    return datetime.strptime(BACKUP_PATTERN.match(os.path.basename(path)).group(1), TIMESTAMP_FORMAT)
+
+
+def list_backups(backup_root: str, archives: bool = False) -> List[str]:
+    """Paths of the finished backups in backup_root, oldest first
+
+    Only snapshot folders are listed unless archives is set; packed
+    snapshots cannot serve as the base of a new one.
+    """
+    backups = []
+    try:
+        with os.scandir(backup_root) as entries:
+            for entry in entries:
+                match = BACKUP_PATTERN.match(entry.name)
+                if match and (entry.is_dir() if not match.group(2) else archives and entry.is_file()):
+                    backups.append((match.group(1), entry.path))
+    except OSError:
+        return []
+    return [path for _, path in sorted(backups)]
+
+
+def _partial_path(target: str) -> str:
+    """Hidden name a backup is written under until it is complete"""
+    return os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.partial")
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def migrate_legacy_backups(base_path: str, backup_root: str) -> int:
+    """Move structure_backup_* folders out of the workspace root, return how many
+
+    A backup folder configured on another filesystem gets a copy, made
+    under its partial name so an interrupted one is never listed.
+    """
+    moved = 0
+    for path in list_backups(base_path, archives=True):
+        os.makedirs(backup_root, exist_ok=True)
+        target = os.path.join(backup_root, os.path.basename(path))
+        if os.path.exists(target):
+            continue
+        try:
+            os.rename(path, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            partial = _partial_path(target)
+            _remove(partial)
+            if os.path.isdir(path):
+                shutil.copytree(path, partial, symlinks=True)
+            else:
+                shutil.copy2(path, partial)
+            os.rename(partial, target)
+            _remove(path)
+        moved += 1
+    return moved
+
+
+class IncrementalBackup:
+    """Snapshots that hardlink unchanged files to the previous snapshot
+
+    Like rsync --link-dest: a file whose size and mtime match its copy in
+    the previous snapshot is hardlinked to that copy, anything else is
+    copied (keeping its mtime, so the next snapshot can compare against
+    it). Each snapshot is a complete tree, but only changed files take
+    new space. A snapshot is built under a hidden name and renamed into
+    place when complete, so a partial one is never used as a base.
+    """
+
+    def __init__(self, copier: FileCopier = None, engine: CopyEngine = None):
+        self.copier = copier or FileCopier()
+        self.engine = engine or CopyEngine(copy_func=self.copier.copy)
+        self.stats = Counter()
+
+    def snapshot(self, source_root: str, names: Iterable[str], target: str,
+                 previous: Optional[str] = None) -> Counter:
+        """Back up the named folders of source_root into target"""
+        self.stats = Counter()
+        partial = _partial_path(target)
+        _remove(partial)
+        os.makedirs(partial)
+
+        for result in self.engine.run(self._jobs(source_root, names, partial, previous)):
+            if result.error:
+                self.stats['failed'] += 1
+                raise result.error
+        os.rename(partial, target)
+        return self.stats
+
+    def _jobs(self, source_root: str, names: Iterable[str], partial: str,
+              previous: Optional[str]) -> Iterator[CopyJob]:
+        """Recreate folders and symlinks; link unchanged files, yield copies for the rest
+
+        Folders are yielded by the scanner before anything below them, so
+        they exist before any copy into them is queued. A folder that
+        cannot be read fails the snapshot instead of leaving it incomplete.
+        """
+        scanner = DirectoryScanner(on_error=self._unreadable)
+        for name in names:
+            os.mkdir(os.path.join(partial, name))
+            for entry, relative_path in scanner.scan(os.path.join(source_root, name), include_dirs=True):
+                relative_path = os.path.join(name, relative_path)
+                destination = os.path.join(partial, relative_path)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), destination)
+                elif entry.is_dir():
+                    os.mkdir(destination)
+                elif previous and self._link_unchanged(entry, os.path.join(previous, relative_path), destination):
+                    self.stats['linked'] += 1
+                else:
+                    self.stats['copied'] += 1
+                    self.stats['copied_bytes'] += entry.stat().st_size
+                    yield CopyJob(entry.path, destination)
+
+    @staticmethod
+    def _unreadable(error: OSError) -> None:
+        raise error
+
+    @staticmethod
+    def _link_unchanged(entry: os.DirEntry, previous_file: str, destination: str) -> bool:
+        """Hardlink destination to previous_file if it matches entry's size and mtime"""
+        try:
+            current, old = entry.stat(), os.lstat(previous_file)
+        except OSError:
+            return False
+        if (current.st_size, current.st_mtime_ns) != (old.st_size, old.st_mtime_ns):
+            return False
+        try:
+            os.link(previous_file, destination)
+        except OSError as e:
+            # Too many links or another filesystem: copy instead
+            if e.errno in (errno.EMLINK, errno.EXDEV, errno.EPERM):
+                return False
+            raise
+        return True
+
+
+class RetentionPolicy:
+    """Which backups to keep: the last N, one per day and week, and a size budget
+
+    keep_daily and keep_weekly keep the newest backup of each of that many
+    most recent days and ISO weeks that have one. max_bytes then drops the
+    oldest kept backups (never the newest) until the space they use, with
+    hardlinked files counted once, fits. Snapshot folders older than
+    pack_after_days are packed into compressed tar archives, except the
+    newest one, which the next snapshot links against.
+    """
+
+    def __init__(self, keep_last: int = 5, keep_daily: int = 7, keep_weekly: int = 4,
+                 max_bytes: Optional[int] = None, pack_after_days: Optional[int] = 30):
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+        self.max_bytes = max_bytes
+        self.pack_after_days = pack_after_days
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RetentionPolicy':
+        """Policy from the 'backups' section of the config"""
+        settings = config.get('backups', {}) or {}
+        return cls(settings.get('keep_last', 5), settings.get('keep_daily', 7),
+                   settings.get('keep_weekly', 4), settings.get('max_bytes'),
+                   settings.get('pack_after_days', 30))
+
+    def select(self, backups: List[str]) -> Set[str]:
+        """Backups (oldest first) kept by count and age rules"""
+        newest_first = list(reversed(backups))
+        keep = set(newest_first[:max(self.keep_last, 1)])
+        for period, count in ((lambda t: t.date(), self.keep_daily),
+                              (lambda t: t.isocalendar()[:2], self.keep_weekly)):
+            seen = []
+            for path in newest_first:
+                key = period(backup_time(path))
+                if key not in seen:
+                    if len(seen) == count:
+                        break
+                    seen.append(key)
+                    keep.add(path)
+        return keep
+
+
+class BackupGC:
+    """Apply a RetentionPolicy to a backup folder"""
+
+    def __init__(self, backup_root: str, policy: RetentionPolicy, workers: int = DEFAULT_WORKERS):
+        self.backup_root = backup_root
+        self.policy = policy
+        self.workers = workers
+
+    def run(self, dry_run: bool = False, pack: bool = True) -> List[Tuple[str, str, int]]:
+        """Remove and pack backups, return (action, name, bytes freed) for each
+
+        Partial snapshots and archives left by an interrupted run are
+        removed too.
+        """
+        result = []
+        for path in self._leftovers():
+            size = sum(self._inodes(path).values())
+            if not dry_run:
+                _remove(path)
+            result.append(('remove', os.path.basename(path), size))
+
+        backups = list_backups(self.backup_root, archives=True)
+        if not backups:
+            return result
+        keep = self.policy.select(backups)
+        usage = {path: self._inodes(path) for path in backups}
+
+        # Files shared with a backup that stays are not freed by a removal
+        remaining = list(backups)
+        removals = []
+        for path in backups:
+            if path not in keep:
+                remaining.remove(path)
+                removals.append((path, self._freed(path, remaining, usage)))
+        if self.policy.max_bytes is not None:
+            while len(remaining) > 1 and self._total(remaining, usage) > self.policy.max_bytes:
+                oldest = remaining.pop(0)
+                removals.append((oldest, self._freed(oldest, remaining, usage)))
+
+        to_pack = []
+        if pack and self.policy.pack_after_days is not None:
+            cutoff = datetime.now() - timedelta(days=self.policy.pack_after_days)
+            folders = [path for path in remaining if os.path.isdir(path)]
+            to_pack = [path for path in folders[:-1] if backup_time(path) < cutoff]
+
+        if dry_run:
+            return result + [('remove', os.path.basename(path), size) for path, size in removals] + \
+                   [('pack', os.path.basename(path), 0) for path in to_pack]
+
+        for path, size in removals:
+            _remove(path)
+            result.append(('remove', os.path.basename(path), size))
+
+        # Pack old snapshots several archives at a time; gzip releases the GIL
+        engine = CopyEngine(self.workers, copy_func=self._pack)
+        jobs = (CopyJob(path, path + ARCHIVE_SUFFIX,
+                        info=self._freed(path, [other for other in remaining if other != path], usage))
+                for path in to_pack)
+        for job_result in engine.run(jobs):
+            if job_result.error:
+                raise job_result.error
+            archive_size = os.path.getsize(job_result.job.target)
+            result.append(('pack', os.path.basename(job_result.job.source),
+                           max(job_result.job.info - archive_size, 0)))
+        return result
+
+    def _leftovers(self) -> List[str]:
+        """Partial snapshots and archives in the backup folder"""
+        try:
+            with os.scandir(self.backup_root) as entries:
+                return sorted(entry.path for entry in entries if PARTIAL_PATTERN.match(entry.name))
+        except OSError:
+            return []
+
+    @staticmethod
+    def _pack(source: str, target: str) -> None:
+        """Stream a snapshot folder into a gzip'd tar, then remove the folder"""
+        partial = _partial_path(target)
+        with tarfile.open(partial, 'w:gz', compresslevel=6) as tar:
+            tar.add(source, arcname=os.path.basename(source))
+        os.rename(partial, target)
+        shutil.rmtree(source)
+
+    @staticmethod
+    def _inodes(path: str) -> Dict[Tuple[int, int], int]:
+        """Size of every distinct file of a backup, keyed by (device, inode)"""
+        if not os.path.isdir(path):
+            st = os.stat(path)
+            return {(st.st_dev, st.st_ino): st.st_size}
+        sizes = {}
+        for entry, _ in DirectoryScanner().scan(path):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            sizes[(st.st_dev, st.st_ino)] = st.st_size
+        return sizes
+
+    @staticmethod
+    def _total(paths: List[str], usage: Dict[str, Dict[Tuple[int, int], int]]) -> int:
+        combined = {}
+        for path in paths:
+            combined.update(usage[path])
+        return sum(combined.values())
+
+    @staticmethod
+    def _freed(path: str, others: List[str], usage: Dict[str, Dict[Tuple[int, int], int]]) -> int:
+        """Bytes freed by deleting path while the backups in others stay"""
+        shared = set()
+        for other in others:
+            shared.update(usage[other])
+        return sum(size for inode, size in usage[path].items() if inode not in shared)
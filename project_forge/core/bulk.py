@@ -0,0 +1,46 @@
+# project_forge/core/bulk.py
+import csv
+import os
+import re
+from typing import Any, Dict, List
+
+import yaml
+
+# Tags in a CSV column are separated by semicolons or commas
+_TAG_SEPARATOR = re.compile(r'[;,]')
+
+
+def read_project_list(path: str) -> List[Dict[str, Any]]:
+    """Read the projects to create from a .csv, .yaml or .yml file
+
+    CSV files need a header row with a 'name' column; 'status',
+    'description' and 'tags' columns are optional. YAML files hold a list
+    of mappings with the same keys, either at the top level or under
+    'projects'. Each returned row has name, status (None if unset),
+    description and a list of tags.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            records = list(csv.DictReader(f))
+    elif extension in ('.yaml', '.yml'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or []
+        records = data.get('projects', []) if isinstance(data, dict) else data
+    else:
+        raise ValueError(f"Unsupported project list format '{extension}' (use .csv, .yaml or .yml)")
+
+    rows = []
+    for number, record in enumerate(records, 1):
+        if not isinstance(record, dict):
+            raise ValueError(f"{path}: entry {number} is not a mapping")
+        tags = record.get('tags') or []
+        if isinstance(tags, str):
+            tags = [tag.strip() for tag in _TAG_SEPARATOR.split(tags) if tag.strip()]
+        rows.append({
+            'name': str(record.get('name') or '').strip(),
+            'status': str(record['status']).strip() if record.get('status') else None,
+            'description': str(record.get('description') or '').strip(),
+            'tags': [str(tag) for tag in tags],
+        })
+    return rows
@@ -0,0 +1,288 @@
+# project_forge/core/catalog.py
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import yaml
+
+from .scanner import DirectoryScanner
+
+CATALOG_NAME = '.forge_catalog.sqlite'
+SCHEMA_VERSION = 1
+
+# Folders changed this recently are listed again on the next refresh, as a
+# later change within the same mtime tick would not alter their mtime
+RACY_WINDOW_NS = 2_000_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statuses (
+    name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_date TEXT,
+    tags TEXT NOT NULL DEFAULT '[]',
+    software_type TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    dir_mtime_ns INTEGER NOT NULL DEFAULT 0,
+    yaml_mtime_ns INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS project_tags (
+    path TEXT NOT NULL REFERENCES projects(path) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (path, tag)
+);
+CREATE INDEX IF NOT EXISTS projects_status ON projects(status, name);
+CREATE INDEX IF NOT EXISTS projects_software_type ON projects(software_type);
+CREATE INDEX IF NOT EXISTS projects_created_date ON projects(created_date);
+CREATE INDEX IF NOT EXISTS project_tags_tag ON project_tags(tag);
+"""
+
+# Columns query() can sort by
+SORT_COLUMNS = ['name', 'status', 'created_date', 'software_type', 'size', 'file_count']
+
+# The C loader is much faster when many project.yaml files change at once
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _subdirs(path: str) -> List[str]:
+    """Names of the non-hidden folders directly below path"""
+    try:
+        with os.scandir(path) as entries:
+            return [e.name for e in entries if not e.name.startswith('.') and e.is_dir()]
+    except OSError:
+        return []
+
+
+class ProjectCatalog:
+    """SQLite index of every project in the workspace
+
+    One row per <status>/<project> folder holds the project's name,
+    status, created_date, tags and software_type from project.yaml, plus
+    its size and file count. refresh() only lists a status folder again
+    when its mtime changed (a project was added, removed or moved), and
+    only re-reads a project whose folder or project.yaml mtime changed,
+    so an unchanged workspace costs one stat per status folder and two
+    per project. Files added or removed below a project's top folder do
+    not change those mtimes; deep=True re-reads every project to catch
+    them. Operations that write into a project call update_project().
+    """
+
+    def __init__(self, db_path: str, base_path: str):
+        self.db_path = db_path
+        self.base_path = base_path
+        self._db: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_path: str) -> 'ProjectCatalog':
+        """Catalog configured in the 'catalog' section"""
+        settings = config.get('catalog', {}) or {}
+        db_path = settings.get('path') or os.path.join(base_path, CATALOG_NAME)
+        return cls(os.path.expanduser(db_path), base_path)
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute('PRAGMA foreign_keys = ON')
+            # Readers (dashboards) are not blocked while a refresh writes
+            self._db.execute('PRAGMA journal_mode = WAL')
+            if self._db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                # The catalog only caches the workspace, so rebuild it
+                self._db.executescript('DROP TABLE IF EXISTS project_tags; DROP TABLE IF EXISTS projects; '
+                                       'DROP TABLE IF EXISTS statuses;')
+                self._db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def refresh(self, deep: bool = False) -> Counter:
+        """Bring the catalog up to date with the workspace folders"""
+        stats = Counter()
+        started_ns = time.time_ns()
+        known = {row['name']: row['mtime_ns'] for row in self.db.execute('SELECT name, mtime_ns FROM statuses')}
+        statuses = _subdirs(self.base_path)
+
+        with self.db:
+            for status in set(known) - set(statuses):
+                stats['removed'] += self.db.execute('DELETE FROM projects WHERE status = ?', (status,)).rowcount
+                self.db.execute('DELETE FROM statuses WHERE name = ?', (status,))
+
+            added = set()
+            for status in statuses:
+                status_path = os.path.join(self.base_path, status)
+                mtime_ns = _mtime_ns(status_path)
+                if known.get(status) != mtime_ns:
+                    stats.update(self._sync_status(status, added))
+                    racy = mtime_ns > started_ns - RACY_WINDOW_NS
+                    self.db.execute('INSERT OR REPLACE INTO statuses (name, mtime_ns) VALUES (?, ?)',
+                                    (status, 0 if racy else mtime_ns))
+
+            rows = self.db.execute('SELECT path, dir_mtime_ns, yaml_mtime_ns FROM projects').fetchall()
+            for row in rows:
+                if row['path'] in added:
+                    continue
+                project_path = os.path.join(self.base_path, row['path'])
+                if deep or (_mtime_ns(project_path), _mtime_ns(os.path.join(project_path, 'project.yaml'))) \
+                        != (row['dir_mtime_ns'], row['yaml_mtime_ns']):
+                    self._index_project(row['path'])
+                    stats['updated'] += 1
+        return stats
+
+    def update_project(self, project_path: str) -> None:
+        """Re-read one project now (or drop it if the folder is gone)"""
+        relative_path = os.path.relpath(os.path.abspath(project_path), os.path.abspath(self.base_path))
+        status = os.path.dirname(relative_path)
+        if not status or os.sep in status or status.startswith('.'):
+            return  # Not a <status>/<project> folder of this workspace
+        with self.db:
+            if os.path.isdir(project_path):
+                self._index_project(relative_path)
+            else:
+                self.db.execute('DELETE FROM projects WHERE path = ?', (relative_path,))
+
+    def projects_by_status(self) -> Dict[str, List[str]]:
+        """Project names per status folder, sorted"""
+        projects = {row['name']: [] for row in self.db.execute('SELECT name FROM statuses ORDER BY name')}
+        for row in self.db.execute('SELECT status, name FROM projects ORDER BY status, name'):
+            projects.setdefault(row['status'], []).append(row['name'])
+        return projects
+
+    def query(self, status: Union[str, Iterable[str]] = None, tags: Iterable[str] = (),
+              software_type: str = None, created_after: str = None, name_glob: str = None,
+              sort: str = 'name', descending: bool = False, limit: int = None,
+              offset: int = 0) -> List[Dict[str, Any]]:
+        """Projects matching every given filter
+
+        status may be one status or several; a project must carry all of
+        tags; created_after (YYYY-MM-DD) keeps projects created on or after
+        that day; name_glob is a case-sensitive shell pattern.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column '{sort}' (choose from {', '.join(SORT_COLUMNS)})")
+        where, params = self._filters(status, tags, software_type, created_after, name_glob)
+        order = 'DESC' if descending else 'ASC'
+        sql = (f'SELECT * FROM projects{where} ORDER BY {sort} {order}, path {order} '
+               'LIMIT ? OFFSET ?')
+        rows = self.db.execute(sql, params + [-1 if limit is None else limit, offset])
+        return [self._row_dict(row) for row in rows]
+
+    def count(self, status: Union[str, Iterable[str]] = None, tags: Iterable[str] = (),
+              software_type: str = None, created_after: str = None, name_glob: str = None) -> int:
+        """Number of projects query() would return without limit/offset"""
+        where, params = self._filters(status, tags, software_type, created_after, name_glob)
+        return self.db.execute(f'SELECT COUNT(*) FROM projects{where}', params).fetchone()[0]
+
+    @staticmethod
+    def _filters(status, tags, software_type, created_after, name_glob) -> Tuple[str, List[Any]]:
+        """WHERE clause and parameters for the query filters"""
+        clauses, params = [], []
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        tags = sorted(set(tags or ()))
+        if tags:
+            clauses.append(f"path IN (SELECT path FROM project_tags WHERE tag IN ({', '.join('?' * len(tags))}) "
+                           "GROUP BY path HAVING COUNT(*) = ?)")
+            params.extend(tags + [len(tags)])
+        if software_type:
+            clauses.append('software_type = ?')
+            params.append(software_type)
+        if created_after:
+            clauses.append('created_date >= ?')
+            params.append(str(created_after))
+        if name_glob:
+            clauses.append('name GLOB ?')
+            params.append(name_glob)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def _row_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'name': row['name'],
+            'status': row['status'],
+            'path': os.path.join(self.base_path, row['path']),
+            'created_date': row['created_date'],
+            'tags': json.loads(row['tags']),
+            'software_type': row['software_type'],
+            'size': row['size'],
+            'file_count': row['file_count'],
+        }
+
+    def _sync_status(self, status: str, added: set) -> Counter:
+        """Add and remove the rows of one status folder, collecting added paths"""
+        stats = Counter()
+        on_disk = {os.path.join(status, name) for name in _subdirs(os.path.join(self.base_path, status))}
+        indexed = {row['path'] for row in self.db.execute('SELECT path FROM projects WHERE status = ?', (status,))}
+        for relative_path in sorted(indexed - on_disk):
+            self.db.execute('DELETE FROM projects WHERE path = ?', (relative_path,))
+            stats['removed'] += 1
+        for relative_path in sorted(on_disk - indexed):
+            self._index_project(relative_path)
+            added.add(relative_path)
+            stats['added'] += 1
+        return stats
+
+    def _index_project(self, relative_path: str) -> None:
+        """Write the row of one project folder from its project.yaml and contents"""
+        status, name = os.path.split(relative_path)
+        project_path = os.path.join(self.base_path, relative_path)
+        yaml_path = os.path.join(project_path, 'project.yaml')
+        metadata = self._read_metadata(yaml_path)
+        tags = sorted({str(tag) for tag in (metadata.get('metadata') or {}).get('tags') or []})
+        size, file_count = self._measure(project_path)
+        created_date = metadata.get('created_date')
+        # Recently changed mtimes are stored as 0, so the next refresh reads the project again
+        racy_ns = time.time_ns() - RACY_WINDOW_NS
+        dir_mtime_ns, yaml_mtime_ns = _mtime_ns(project_path), _mtime_ns(yaml_path)
+
+        self.db.execute(
+            'INSERT OR REPLACE INTO projects (path, name, status, created_date, tags, software_type, '
+            'size, file_count, dir_mtime_ns, yaml_mtime_ns) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (relative_path, name, status, str(created_date) if created_date else None, json.dumps(tags),
+             metadata.get('software_type'), size, file_count,
+             0 if dir_mtime_ns > racy_ns else dir_mtime_ns, 0 if yaml_mtime_ns > racy_ns else yaml_mtime_ns))
+        self.db.execute('DELETE FROM project_tags WHERE path = ?', (relative_path,))
+        self.db.executemany('INSERT INTO project_tags (path, tag) VALUES (?, ?)',
+                            [(relative_path, tag) for tag in tags])
+
+    @staticmethod
+    def _read_metadata(yaml_path: str) -> Dict[str, Any]:
+        try:
+            with open(yaml_path, 'r') as f:
+                data = yaml.load(f, Loader=_YAML_LOADER)
+            return data if isinstance(data, dict) else {}
+        except (OSError, yaml.YAMLError):
+            return {}
+
+    @staticmethod
+    def _measure(project_path: str) -> Tuple[int, int]:
+        """Total size and number of files below a project folder"""
+        size = file_count = 0
+        for entry, _ in DirectoryScanner().scan(project_path):
+            try:
+                size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            file_count += 1
+        return size, file_count
@@ -0,0 +1,295 @@
+# project_forge/core/copier.py
+import errno
+import os
+import queue
+import shutil
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE_SIZE = 256
+
+# Copy strategies, each one falls back to the ones after it
+COPY_MODES = ['auto', 'reflink', 'copy_file_range', 'hardlink', 'rename', 'copy']
+
+# ioctl request number for FICLONE (_IOW(0x94, 9, int)) on Linux
+FICLONE = 0x40049409
+
+# Errors meaning "this backend can't work here", as opposed to a real failure
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS, errno.EPERM,
+    errno.EOPNOTSUPP, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+    errno.EBADF, errno.EMLINK
+}
+
+
+class FileCopier:
+    """Copy files with the cheapest backend the filesystem supports
+
+    In 'auto' mode a copy is attempted as a reflink (FICLONE), then with
+    os.copy_file_range, then as a hardlink if allowed, and finally with
+    shutil.copy2. Choosing a specific mode starts the chain at that backend.
+    'rename' moves the source instead of copying it and is never picked
+    automatically. A backend that reports it is unsupported is not retried
+    for the rest of the run.
+    """
+
+    def __init__(self, mode: str = 'auto', allow_hardlinks: bool = False):
+        if mode not in COPY_MODES:
+            raise ValueError(f"Unknown copy mode '{mode}' (choose from {', '.join(COPY_MODES)})")
+        self.mode = mode
+        self.allow_hardlinks = allow_hardlinks or mode == 'hardlink'
+        self.backends = self._build_chain()
+        self.counts = Counter()
+        self._disabled = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], mode: str = None,
+                    allow_hardlinks: bool = None) -> 'FileCopier':
+        """Create a copier from the 'organize' config section, with overrides"""
+        settings = config.get('organize', {}) or {}
+        if mode is None:
+            mode = settings.get('copy_mode', 'auto')
+        if allow_hardlinks is None:
+            allow_hardlinks = settings.get('allow_hardlinks', False)
+        return cls(mode, allow_hardlinks)
+
+    def _build_chain(self) -> List[str]:
+        """Backends to try, in order, for the selected mode"""
+        if self.mode == 'copy':
+            return ['copy']
+        if self.mode == 'rename':
+            return ['rename', 'copy']
+        if self.mode == 'hardlink':
+            return ['hardlink', 'copy']
+
+        chain = ['reflink', 'copy_file_range']
+        if self.mode == 'copy_file_range':
+            chain = ['copy_file_range']
+        if self.allow_hardlinks:
+            chain.append('hardlink')
+        chain.append('copy')
+        return chain
+
+    def copy(self, source: str, target: str) -> str:
+        """Copy source to target (like shutil.copy2), return the backend used"""
+        for backend in self.backends:
+            if backend in self._disabled:
+                continue
+            try:
+                getattr(self, f'_{backend}')(source, target)
+            except OSError as e:
+                if backend == 'copy' or e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                with self._lock:
+                    self._disabled.add(backend)
+                continue
+            with self._lock:
+                self.counts[backend] += 1
+            return backend
+        raise OSError(f"No copy backend available for {source}")
+
+    def copytree(self, source: str, target: str, **kwargs) -> str:
+        """shutil.copytree that copies every file through this copier"""
+        kwargs.setdefault('copy_function', self.copy)
+        return shutil.copytree(source, target, **kwargs)
+
+    def summary(self) -> str:
+        """Describe the selected mode and how many files each backend handled"""
+        if not self.counts:
+            return f"{self.mode} (no files copied)"
+        used = ', '.join(f"{backend}: {count}" for backend, count in self.counts.most_common())
+        return f"{self.mode} ({used})"
+
+    def _reflink(self, source: str, target: str) -> None:
+        if fcntl is None:
+            raise OSError(errno.ENOSYS, "reflink not supported on this platform")
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                os.unlink(target)
+                raise
+        shutil.copystat(source, target)
+
+    def _copy_file_range(self, source: str, target: str) -> None:
+        if not hasattr(os, 'copy_file_range'):
+            raise OSError(errno.ENOSYS, "copy_file_range not supported on this platform")
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            try:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                dst.close()
+                os.unlink(target)
+                raise
+        if remaining > 0:
+            # EOF before st_size: the file shrank, or its size is not its content
+            # (procfs, sysfs); copy it again by reading to the real end
+            shutil.copy2(source, target)
+            return
+        shutil.copystat(source, target)
+
+    def _hardlink(self, source: str, target: str) -> None:
+        # copy2 overwrites an existing target, so a link has to as well
+        if os.path.lexists(target):
+            os.unlink(target)
+        os.link(source, target)
+
+    def _rename(self, source: str, target: str) -> None:
+        os.rename(source, target)
+
+    def _copy(self, source: str, target: str) -> None:
+        shutil.copy2(source, target)
+        if self.mode == 'rename':
+            # Cross-device fallback for rename mode: copy, then remove source
+            os.unlink(source)
+
+
+class CopyJob(NamedTuple):
+    """A single unit of work for the copy stage
+
+    Only 'copy' jobs touch the disk; other actions (e.g. 'skip' or
+    'duplicate') pass through the pool so results keep their order.
+    """
+    source: str
+    target: Optional[str]
+    info: Any = None
+    action: str = 'copy'
+
+
+class CopyResult(NamedTuple):
+    """Outcome of a CopyJob"""
+    job: CopyJob
+    error: Optional[Exception] = None
+
+    @property
+    def copied(self) -> bool:
+        return self.job.action == 'copy' and self.job.target is not None and self.error is None
+
+
+_DONE = object()
+
+
+class CopyEngine:
+    """Bounded thread pool that copies files fed by a producer iterable
+
+    Jobs are pulled from the producer on a feeder thread and handed to the
+    workers through a bounded queue, so classification and copying overlap
+    without buffering the whole source tree. Results are yielded in the
+    order the jobs were produced, regardless of which worker finished first.
+    The feeder never runs more than queue_size + workers jobs ahead of the
+    consumer, so memory stays bounded even behind one slow copy.
+
+    Jobs are CopyJob or any object with source, target and action fields.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 copy_func: Callable[[str, str], Any] = shutil.copy2):
+        self.workers = max(1, int(workers))
+        self.queue_size = max(1, int(queue_size))
+        self.copy_func = copy_func
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **kwargs) -> 'CopyEngine':
+        """Create an engine from the 'organize' section of the config"""
+        settings = config.get('organize', {}) or {}
+        kwargs.setdefault('workers', settings.get('workers', DEFAULT_WORKERS))
+        kwargs.setdefault('queue_size', settings.get('queue_size', DEFAULT_QUEUE_SIZE))
+        return cls(**kwargs)
+
+    def run(self, jobs: Iterable[CopyJob],
+            on_stop: Callable[[CopyResult], Any] = None) -> Iterator[CopyResult]:
+        """Execute jobs and yield their results in submission order
+
+        If the consumer stops early, on_stop is called with every result
+        that finished but was never yielded, once the workers are done.
+        """
+        job_queue = queue.Queue(maxsize=self.queue_size)
+        results = {}
+        condition = threading.Condition()
+        state = {'total': None, 'error': None}
+        stop = threading.Event()
+        window = threading.BoundedSemaphore(self.queue_size + self.workers)
+
+        def feed():
+            count = 0
+            try:
+                for job in jobs:
+                    # Wait until the consumer has taken older results
+                    while not window.acquire(timeout=0.1):
+                        if stop.is_set():
+                            break
+                    if stop.is_set():
+                        break
+                    job_queue.put((count, job))
+                    count += 1
+            except Exception as e:
+                state['error'] = e
+            finally:
+                for _ in range(self.workers):
+                    job_queue.put(_DONE)
+                with condition:
+                    state['total'] = count
+                    condition.notify_all()
+
+        def work():
+            while True:
+                item = job_queue.get()
+                if item is _DONE:
+                    return
+                seq, job = item
+                error = None
+                if job.action == 'copy' and job.target is not None:
+                    if stop.is_set():
+                        continue
+                    try:
+                        self.copy_func(job.source, job.target)
+                    except Exception as e:
+                        error = e
+                with condition:
+                    results[seq] = CopyResult(job, error)
+                    condition.notify_all()
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [threading.Thread(target=work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        next_seq = 0
+        try:
+            while True:
+                with condition:
+                    while next_seq not in results and (state['total'] is None or next_seq < state['total']):
+                        condition.wait()
+                    if next_seq not in results:
+                        break
+                    result = results.pop(next_seq)
+                next_seq += 1
+                window.release()
+                yield result
+        finally:
+            # If the consumer stopped early, let the threads wind down
+            # without copying anything else
+            stop.set()
+            if on_stop is not None:
+                for thread in threads[1:]:
+                    thread.join()
+                for seq in sorted(results):
+                    on_stop(results[seq])
+
+        if state['error'] is not None:
+            raise state['error']
+
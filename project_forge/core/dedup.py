@@ -0,0 +1,47 @@
+# project_forge/core/dedup.py
+import hashlib
+import os
+from typing import Dict, Optional
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ContentIndex:
+    """Detect identical files by size first and content hash second
+
+    Files are only hashed when their sizes collide, and every hash is
+    computed at most once per path.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[str, str] = {}
+        self.duplicates = 0
+        self.bytes_saved = 0
+
+    def file_hash(self, path: str) -> str:
+        """Return the (cached) BLAKE2 digest of a file's contents"""
+        digest = self._hashes.get(path)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+            digest = self._hashes[path] = hasher.hexdigest()
+        return digest
+
+    def is_duplicate(self, path: str, size: int, other_path: str, other_size: Optional[int] = None) -> bool:
+        """Check whether two files have identical contents"""
+        try:
+            if other_size is None:
+                other_size = os.stat(other_path).st_size
+            if size != other_size:
+                return False
+            return self.file_hash(path) == self.file_hash(other_path)
+        except OSError:
+            return False
+
+    def record_duplicate(self, size: int) -> None:
+        """Count a file that was not stored because its content already is"""
+        self.duplicates += 1
+        self.bytes_saved += size
+
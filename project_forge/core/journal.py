@@ -0,0 +1,153 @@
+# project_forge/core/journal.py
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from .copier import FileCopier
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Journal kept in a project reorganized in place, for rollback
+IN_PLACE_JOURNAL = '.forge_journal.jsonl'
+
+
+class Journal:
+    """Append-only JSON-lines log of filesystem operations
+
+    Every operation is recorded (and flushed) before it is performed, so
+    after a crash the journal lists everything that may have happened. A
+    final 'commit' record marks a run that finished cleanly.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a')
+
+    @classmethod
+    def open_locked(cls, path: str, blocking: bool = True) -> Optional['Journal']:
+        """Open a journal holding an exclusive lock until it is closed
+
+        Returns None when another process holds the lock and blocking is
+        off. A journal its previous holder removed while we waited is
+        opened afresh, so the lock is always on the file at path.
+        """
+        while True:
+            journal = cls(path)
+            if fcntl is None:
+                return journal
+            try:
+                fcntl.flock(journal._file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                journal.close()
+                return None
+            try:
+                if os.stat(path).st_ino == os.fstat(journal._file.fileno()).st_ino:
+                    return journal
+            except FileNotFoundError:
+                pass
+            journal.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, op: str, **fields: Any) -> None:
+        """Append one operation record"""
+        line = json.dumps({'op': op, **fields}) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def commit(self) -> None:
+        """Mark the journaled run as complete"""
+        self.record('commit')
+        with self._lock:
+            os.fsync(self._file.fileno())
+
+    def clear(self) -> None:
+        """Drop all records, e.g. once an earlier run's have been recovered"""
+        with self._lock:
+            self._file.truncate(0)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def makedirs(self, path: str) -> None:
+        """os.makedirs that journals every directory it actually creates"""
+        missing = []
+        while path and not os.path.isdir(path):
+            missing.append(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        for directory in reversed(missing):
+            self.record('mkdir', path=directory)
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def load(path: str) -> List[Dict[str, Any]]:
+        """Read all records, ignoring a torn last line"""
+        records = []
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    @staticmethod
+    def is_committed(records: List[Dict[str, Any]]) -> bool:
+        return bool(records) and records[-1].get('op') == 'commit'
+
+
+class JournaledMover(FileCopier):
+    """FileCopier in rename mode that journals every move before making it"""
+
+    def __init__(self, journal: Journal):
+        super().__init__('rename')
+        self.journal = journal
+
+    def copy(self, source: str, target: str) -> str:
+        self.journal.record('move', src=source, dst=target)
+        return super().copy(source, target)
+
+
+def rollback(records: List[Dict[str, Any]], reporter: Optional[Any] = None) -> int:
+    """Undo journaled operations in reverse order, return how many were undone
+
+    Moves are reversed only when the destination still exists and the
+    original path is free; created directories are removed only if empty.
+    """
+    undone = 0
+    for record in reversed(records):
+        op = record.get('op')
+        try:
+            if op == 'move':
+                source, target = record['src'], record['dst']
+                if os.path.lexists(target) and not os.path.lexists(source):
+                    os.makedirs(os.path.dirname(source), exist_ok=True)
+                    os.rename(target, source)
+                    undone += 1
+            elif op == 'mkdir':
+                if os.path.isdir(record['path']) and not os.listdir(record['path']):
+                    os.rmdir(record['path'])
+                    undone += 1
+            elif op == 'create':
+                if os.path.exists(record['path']):
+                    os.remove(record['path'])
+                    undone += 1
+        except OSError as e:
+            if reporter:
+                reporter.item('error', f"Could not undo {op} {record}: {e}")
+    return undone
@@ -0,0 +1,277 @@
+# project_forge/core/library_store.py
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .copier import FileCopier
+from .utils import format_size
+
+STORE_DIR = '.forge_libs'
+INDEX_NAME = 'index.json'
+INDEX_VERSION = 1
+LINK_MODES = ['hardlink', 'symlink']
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9._+-]+')
+
+
+def library_identity(path: str) -> Tuple[str, str]:
+    """(name, version) from library.json or library.properties, else the folder name"""
+    try:
+        with open(os.path.join(path, 'library.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get('name'):
+            return str(data['name']), str(data.get('version', 'unversioned'))
+    except (OSError, ValueError):
+        pass
+
+    properties = {}
+    try:
+        with open(os.path.join(path, 'library.properties'), 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                key, sep, value = line.partition('=')
+                if sep:
+                    properties[key.strip()] = value.strip()
+    except OSError:
+        pass
+    return properties.get('name', os.path.basename(path)), properties.get('version', 'unversioned')
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+class LibraryStore:
+    """Workspace-wide, content-addressed store of firmware libraries
+
+    Each library version is kept once under <name>/<version>-<hash>, where
+    the hash covers every file path and file content. Projects get the
+    library through hardlinks to the stored files (falling back to a copy
+    across filesystems) or a symlink to the stored folder. Stored files
+    are read-only, so an in-place edit through one project's link fails
+    instead of changing every project's copy and leaving the entry's hash
+    wrong. index.json remembers each source folder's file signature, so an
+    unchanged library is not hashed again, and which project folders use
+    which entry.
+    """
+
+    def __init__(self, root: str, link_mode: str = 'hardlink'):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode '{link_mode}' (choose from {', '.join(LINK_MODES)})")
+        self.root = root
+        self.link_mode = link_mode
+        self._linker = FileCopier('hardlink')
+        self._index = self._load_index()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_path: str) -> Optional['LibraryStore']:
+        """Store configured in the 'library_store' section (None if disabled)"""
+        settings = config.get('library_store', {}) or {}
+        if not settings.get('enabled', False):
+            return None
+        root = settings.get('path') or os.path.join(base_path, STORE_DIR)
+        return cls(os.path.expanduser(root), settings.get('link_mode', 'hardlink'))
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_NAME)
+
+    def add(self, library_path: str) -> str:
+        """Store a library folder (if not stored yet), return its entry path"""
+        library_path = os.path.abspath(library_path)
+        files = self._list_files(library_path)
+        signature = self._signature(files)
+
+        known = self._index['sources'].get(library_path)
+        if known and known[0] == signature and os.path.isdir(os.path.join(self.root, known[1])):
+            return os.path.join(self.root, known[1])
+
+        name, version = library_identity(library_path)
+        key = os.path.join(_UNSAFE_CHARS.sub('_', name),
+                           f"{_UNSAFE_CHARS.sub('_', version)}-{self._content_hash(library_path, files)}")
+        entry = os.path.join(self.root, key)
+        if not os.path.isdir(entry):
+            # Fill a temporary folder first so a half-copied entry is never used
+            temp_entry = entry + '.tmp'
+            if os.path.exists(temp_entry):
+                shutil.rmtree(temp_entry)
+            FileCopier().copytree(library_path, temp_entry, symlinks=True)
+            self._make_read_only(temp_entry)
+            os.replace(temp_entry, entry)
+
+        self._index['sources'][library_path] = [signature, key]
+        self._save_index()
+        return entry
+
+    def link(self, entry: str, target_dir: str) -> Counter:
+        """Make target_dir reference a stored library"""
+        key = os.path.relpath(entry, self.root)
+        refs = self._index['refs'].setdefault(key, [])
+        target_dir = os.path.abspath(target_dir)
+        if target_dir not in refs:
+            refs.append(target_dir)
+            self._save_index()
+
+        if self.link_mode == 'symlink':
+            if os.path.islink(target_dir) and os.readlink(target_dir) == entry:
+                return Counter(unchanged=1)
+            if os.path.lexists(target_dir):
+                _remove(target_dir)
+            os.makedirs(os.path.dirname(target_dir), exist_ok=True)
+            os.symlink(entry, target_dir, target_is_directory=True)
+            return Counter(linked=1)
+
+        # Hardlink every stored file; files already linked to the entry are kept
+        if os.path.islink(target_dir):
+            os.unlink(target_dir)
+        stats = Counter()
+        for root, dirs, files in os.walk(entry):
+            folder = os.path.normpath(os.path.join(target_dir, os.path.relpath(root, entry)))
+            if os.path.lexists(folder) and not os.path.isdir(folder):
+                _remove(folder)
+            os.makedirs(folder, exist_ok=True)
+            for name in files:
+                stored, linked = os.path.join(root, name), os.path.join(folder, name)
+                try:
+                    if os.path.samefile(stored, linked):
+                        stats['unchanged'] += 1
+                        continue
+                except OSError:
+                    pass
+                if os.path.isdir(linked) and not os.path.islink(linked):
+                    shutil.rmtree(linked)
+                self._linker.copy(stored, linked)
+                stats['linked'] += 1
+            for name in set(os.listdir(folder)) - set(dirs) - set(files):
+                _remove(os.path.join(folder, name))
+                stats['removed'] += 1
+        return stats
+
+    def gc(self, dry_run: bool = False) -> List[Tuple[str, int]]:
+        """Remove entries no project references any more, return (key, bytes) removed
+
+        An entry is still in use if a recorded project folder links to it:
+        a symlink pointing at it, or a file sharing an inode with it.
+        """
+        removed = []
+        for key in self._entries():
+            entry = os.path.join(self.root, key)
+            live_refs = [ref for ref in self._index['refs'].get(key, []) if self._references(ref, entry)]
+            if live_refs:
+                self._index['refs'][key] = live_refs
+                continue
+            removed.append((key, self._folder_size(entry)))
+            if not dry_run:
+                shutil.rmtree(entry)
+                self._index['refs'].pop(key, None)
+                self._index['sources'] = {src: value for src, value in self._index['sources'].items()
+                                          if value[1] != key}
+        if not dry_run:
+            self._save_index()
+        return removed
+
+    def summary(self, removed: List[Tuple[str, int]]) -> str:
+        return f"{len(removed)} unreferenced entries ({format_size(sum(size for _, size in removed))})"
+
+    def _entries(self) -> List[str]:
+        """Keys (name/version-hash) of every stored library"""
+        keys = []
+        try:
+            names = sorted(e.name for e in os.scandir(self.root) if e.is_dir())
+        except OSError:
+            return keys
+        for name in names:
+            for version in sorted(os.listdir(os.path.join(self.root, name))):
+                if not version.endswith('.tmp'):
+                    keys.append(os.path.join(name, version))
+        return keys
+
+    @staticmethod
+    def _make_read_only(path: str) -> None:
+        """Clear the write bits of every stored file; folders stay writable for gc"""
+        for root, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(root, name)
+                if not os.path.islink(file_path):
+                    os.chmod(file_path, os.stat(file_path).st_mode & ~0o222)
+
+    @staticmethod
+    def _references(ref: str, entry: str) -> bool:
+        if os.path.islink(ref):
+            return os.path.realpath(ref) == os.path.realpath(entry)
+        if not os.path.isdir(ref):
+            return False
+        for root, _, files in os.walk(entry):
+            for name in files:
+                stored = os.path.join(root, name)
+                linked = os.path.join(ref, os.path.relpath(stored, entry))
+                try:
+                    if os.path.samefile(stored, linked):
+                        return True
+                except OSError:
+                    continue
+        return False
+
+    @staticmethod
+    def _list_files(path: str) -> List[Tuple[str, int, int]]:
+        """(relative path, size, mtime_ns) of every file, sorted"""
+        files = []
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in names:
+                full_path = os.path.join(root, name)
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue
+                files.append((os.path.relpath(full_path, path).replace(os.sep, '/'), st.st_size, st.st_mtime_ns))
+        files.sort()
+        return files
+
+    @staticmethod
+    def _signature(files: List[Tuple[str, int, int]]) -> str:
+        return hashlib.blake2b(json.dumps(files).encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _content_hash(path: str, files: List[Tuple[str, int, int]]) -> str:
+        hasher = hashlib.blake2b(digest_size=8)
+        for relative_path, _, _ in files:
+            hasher.update(relative_path.encode() + b'\0')
+            with open(os.path.join(path, relative_path), 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _folder_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return {'sources': data.get('sources', {}), 'refs': data.get('refs', {})}
+        except (OSError, ValueError):
+            pass
+        return {'sources': {}, 'refs': {}}
+
+    def _save_index(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, **self._index}, f, separators=(',', ':'))
+        os.replace(temp_path, self.index_path)
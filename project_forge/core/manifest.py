@@ -0,0 +1,87 @@
+# project_forge/core/manifest.py
+import json
+import os
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = '.forge_manifest.json'
+MANIFEST_VERSION = 1
+
+
+class SourceManifest:
+    """Record of which source files were organized into a project
+
+    For every source root the manifest stores, per relative path, the
+    file's size, mtime_ns and inode at copy time, its destination
+    (relative to the project) and the action that put it there: 'copy'
+    for the file's own copy, 'duplicate' for another file's. A later run
+    compares those against a single stat of the source file to decide
+    whether it needs copying again.
+    """
+
+    def __init__(self, project_path: str, source_path: str, sources: Dict[str, Dict[str, List]] = None):
+        self.project_path = project_path
+        self.source_path = os.path.abspath(source_path)
+        self._sources = sources if sources is not None else {}
+        self.previous = self._sources.get(self.source_path, {})
+        self.current: Dict[str, List] = {}
+        # Destinations other files' records point at as duplicates
+        self._shared = {record[3] for record in self.previous.values() if record[4:5] == ['duplicate']}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.project_path, MANIFEST_NAME)
+
+    @classmethod
+    def load(cls, project_path: str, source_path: str) -> 'SourceManifest':
+        """Load the project's manifest (empty if missing or unreadable)"""
+        sources = {}
+        try:
+            with open(os.path.join(project_path, MANIFEST_NAME), 'r') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                sources = data.get('sources', {})
+        except (OSError, ValueError):
+            pass
+        return cls(project_path, source_path, sources)
+
+    def previous_target(self, relative_path: str) -> Optional[str]:
+        """Absolute destination the file was organized to last time"""
+        record = self.previous.get(relative_path)
+        return os.path.join(self.project_path, record[3]) if record else None
+
+    def owns_target(self, relative_path: str) -> bool:
+        """Check that the file's last destination is its own copy, shared with no duplicate
+
+        Records written before actions were stored never qualify.
+        """
+        record = self.previous.get(relative_path)
+        return record is not None and record[4:5] == ['copy'] and record[3] not in self._shared
+
+    def is_unchanged(self, relative_path: str, size: int, mtime_ns: int, inode: int) -> bool:
+        """Check a source file against its record from the last run"""
+        record = self.previous.get(relative_path)
+        return record is not None and record[:3] == [size, mtime_ns, inode]
+
+    def record(self, relative_path: str, size: int, mtime_ns: int, inode: int, target: str,
+               action: str = 'copy') -> None:
+        """Remember a file organized (or confirmed unchanged) in this run
+
+        An unchanged file keeps the action of its earlier record.
+        """
+        if action == 'unchanged':
+            previous = self.previous.get(relative_path) or []
+            action = previous[4] if len(previous) > 4 else None
+        self.current[relative_path] = [size, mtime_ns, inode, os.path.relpath(target, self.project_path), action]
+
+    def save(self, complete: bool = True) -> None:
+        """Write this run's records for this source
+
+        After a complete run they replace the earlier ones; an interrupted
+        run keeps the records of the files it did not reach.
+        """
+        self._sources[self.source_path] = self.current if complete else {**self.previous, **self.current}
+        os.makedirs(self.project_path, exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'sources': self._sources}, f, separators=(',', ':'))
+        os.replace(temp_path, self.path)
@@ -0,0 +1,238 @@
+# project_forge/core/moves.py
+import errno
+import json
+import os
+import re
+import shutil
+from typing import Any, Iterator, List, Optional, Tuple
+
+import yaml
+
+from .copier import CopyEngine, CopyJob, FileCopier
+from .journal import Journal
+from .scanner import DirectoryScanner
+
+# Journal of an unfinished batch of moves, kept in the workspace root
+MOVE_JOURNAL = '.forge_moves.jsonl'
+
+# New project.yaml written next to the old one before a project moves
+STAGED_YAML = 'project.yaml.forge-new'
+
+_STATUS_LINE = re.compile(r'^status:.*$', re.MULTILINE)
+
+
+def with_status(text: str, status: str) -> str:
+    """project.yaml text with its top-level status replaced
+
+    The status line is rewritten in place, so the rest of the file keeps
+    its formatting; files without one go through a YAML round trip.
+    """
+    if _STATUS_LINE.search(text):
+        return _STATUS_LINE.sub(lambda _: f"status: {json.dumps(status)}", text, count=1)
+    data = yaml.safe_load(text) or {}
+    data['status'] = status
+    return yaml.dump(data, default_flow_style=False)
+
+
+class ProjectMover:
+    """Move project folders between statuses as one journaled batch
+
+    For each project the updated project.yaml is staged inside the folder
+    first, then the folder is renamed into its new status and the staged
+    file replaces the old one. Moves across filesystems copy the folders
+    in parallel into hidden partial folders, rename those into place and
+    only then delete the sources. Every step is journaled, so recover()
+    can finish or undo an interrupted batch: a project is never left in
+    its new status with its old metadata.
+    """
+
+    def __init__(self, base_path: str, copier: FileCopier = None,
+                 engine: CopyEngine = None, reporter: Any = None):
+        self.base_path = base_path
+        self.journal_path = os.path.join(base_path, MOVE_JOURNAL)
+        self.copier = copier or FileCopier()
+        self.engine = engine or CopyEngine()
+        self.reporter = reporter
+
+    def move(self, moves: List[Tuple[str, str, str]]) -> List[str]:
+        """Move (name, from_status, to_status) projects, return their new paths
+
+        The journal stays locked until the batch is done, so recover() in
+        another process never undoes it half way; a second batch waits.
+        """
+        moved, cross_device, claimed = [], [], set()
+        with Journal.open_locked(self.journal_path) as journal:
+            # Settle a batch a crash left behind before starting this one
+            self._recover(Journal.load(self.journal_path))
+            journal.clear()
+            for name, from_status, to_status in moves:
+                source = os.path.join(self.base_path, from_status, name)
+                target = os.path.join(self.base_path, to_status, name)
+                error = self._check(name, source, target, from_status, to_status, claimed)
+                if error:
+                    self._report('error', error)
+                    continue
+                claimed.add(target)
+
+                journal.record('project_move', src=source, dst=target, status=to_status)
+                self._stage_yaml(source, to_status)
+                try:
+                    os.rename(source, target)
+                except OSError as e:
+                    if e.errno == errno.EXDEV:
+                        cross_device.append((name, source, target))
+                        continue
+                    self._unstage_yaml(source)
+                    journal.record('project_abort', dst=target)
+                    self._report('error', f"Error moving {from_status}/{name}: {e}")
+                    continue
+                self._finish(source, target)
+                journal.record('project_done', dst=target)
+                moved.append(target)
+                self._report('success', f"✓ Moved {name}: {from_status} -> {to_status}", project=name)
+
+            if cross_device:
+                moved.extend(self._move_across_devices(cross_device, journal))
+            journal.commit()
+            os.remove(self.journal_path)
+        return moved
+
+    def recover(self) -> int:
+        """Finish or undo the moves of an interrupted batch, return how many
+
+        A journal locked by a batch still running is left alone.
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+        journal = Journal.open_locked(self.journal_path, blocking=False)
+        if journal is None:
+            return 0
+        with journal:
+            recovered = self._recover(Journal.load(self.journal_path))
+            os.remove(self.journal_path)
+        return recovered
+
+    def _recover(self, records: List[dict]) -> int:
+        """Finish or undo the unsettled moves among records"""
+        settled = {r['dst'] for r in records if r.get('op') in ('project_done', 'project_abort')}
+        recovered = 0
+        if not Journal.is_committed(records):
+            for record in records:
+                if record.get('op') != 'project_move' or record['dst'] in settled:
+                    continue
+                source, target = record['src'], record['dst']
+                if os.path.isdir(target):
+                    # The folder reached its new status: finish the move
+                    self._finish(source, target, record['status'])
+                    self._report('info', f"Finished interrupted move to {target}")
+                else:
+                    partial = self._partial_path(target)
+                    if os.path.isdir(partial):
+                        shutil.rmtree(partial)
+                    self._unstage_yaml(source)
+                    self._report('info', f"Undid interrupted move of {source}")
+                recovered += 1
+        return recovered
+
+    def _check(self, name: str, source: str, target: str, from_status: str, to_status: str,
+               claimed: set) -> Optional[str]:
+        """Reason a move cannot be made, or None"""
+        if not name or name in ('.', '..') or '/' in name or os.sep in name:
+            return f"Invalid project name '{name}'"
+        if from_status == to_status:
+            return f"'{name}' is already in {to_status}"
+        if not os.path.isdir(source):
+            return f"No project '{name}' in {from_status}"
+        if target in claimed or os.path.lexists(target):
+            return f"A project named '{name}' already exists in {to_status}"
+        if not os.path.isdir(os.path.dirname(target)):
+            return f"Unknown status '{to_status}'"
+        return None
+
+    def _move_across_devices(self, projects: List[Tuple[str, str, str]], journal: Journal) -> List[str]:
+        """Copy projects to another filesystem in parallel, then delete the sources"""
+        failed = set()
+        for result in self.engine.run(self._copy_jobs(projects, failed)):
+            if result.error:
+                failed.add(result.job.info)
+                self._report('error', f"Error copying {result.job.source}: {result.error}")
+
+        moved = []
+        for name, source, target in projects:
+            partial = self._partial_path(target)
+            if target in failed:
+                shutil.rmtree(partial, ignore_errors=True)
+                self._unstage_yaml(source)
+                journal.record('project_abort', dst=target)
+                continue
+            os.rename(partial, target)
+            self._finish(source, target)
+            journal.record('project_done', dst=target)
+            moved.append(target)
+            self._report('success', f"✓ Moved {name} to {os.path.dirname(target)} (copied across filesystems)",
+                         project=name)
+        return moved
+
+    def _copy_jobs(self, projects: List[Tuple[str, str, str]], failed: set) -> Iterator[CopyJob]:
+        """Create each partial folder tree and yield its file copies
+
+        Folders are yielded by the scanner before anything below them, so
+        they exist before any copy into them is queued. A project with a
+        folder that cannot be read is added to failed, so its source is
+        kept.
+        """
+        for _, source, target in projects:
+            def unreadable(error: OSError, target: str = target) -> None:
+                failed.add(target)
+                self._report('error', f"Error reading {error.filename}: {error}")
+            scanner = DirectoryScanner(on_error=unreadable)
+            partial = self._partial_path(target)
+            if os.path.isdir(partial):
+                shutil.rmtree(partial)
+            os.mkdir(partial)
+            for entry, relative_path in scanner.scan(source, include_dirs=True):
+                destination = os.path.join(partial, relative_path)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), destination)
+                elif entry.is_dir():
+                    os.mkdir(destination)
+                else:
+                    yield CopyJob(entry.path, destination, info=target)
+
+    def _finish(self, source: str, target: str, status: str = None) -> None:
+        """Put the staged project.yaml in place and remove a copied source"""
+        staged = os.path.join(target, STAGED_YAML)
+        if os.path.exists(staged):
+            os.replace(staged, os.path.join(target, 'project.yaml'))
+        elif status is not None and os.path.exists(os.path.join(target, 'project.yaml')):
+            self._stage_yaml(target, status)
+            os.replace(staged, os.path.join(target, 'project.yaml'))
+        if os.path.isdir(source):
+            shutil.rmtree(source)
+
+    @staticmethod
+    def _stage_yaml(project_path: str, status: str) -> None:
+        yaml_path = os.path.join(project_path, 'project.yaml')
+        if not os.path.exists(yaml_path):
+            return
+        with open(yaml_path, 'r') as f:
+            text = f.read()
+        with open(os.path.join(project_path, STAGED_YAML), 'w') as f:
+            f.write(with_status(text, status))
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _unstage_yaml(project_path: str) -> None:
+        staged = os.path.join(project_path, STAGED_YAML)
+        if os.path.exists(staged):
+            os.remove(staged)
+
+    @staticmethod
+    def _partial_path(target: str) -> str:
+        """Hidden folder a cross-device copy is built in"""
+        return os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.forge-partial")
+
+    def _report(self, status: str, message: str, **data: Any) -> None:
+        if self.reporter:
+            self.reporter.item(status, message, **data)
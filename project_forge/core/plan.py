@@ -0,0 +1,180 @@
+# project_forge/core/plan.py
+import errno
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .copier import CopyEngine, CopyResult, FileCopier
+
+PLAN_VERSION = 1
+
+# Reason of a copy that replaces the file's own copy from an earlier run,
+# the only kind of copy allowed to overwrite its target
+REPLACE_REASON = "changed since last run"
+
+
+class PlanEntry(NamedTuple):
+    """One planned file operation
+
+    action is 'copy', 'duplicate' (content already stored at target),
+    'unchanged' (copied by an earlier run) or 'skip' (no category, target
+    is None). mtime_ns and inode are kept for the source manifest.
+    """
+    source: str
+    target: Optional[str]
+    size: int
+    action: str
+    reason: str
+    mtime_ns: int = 0
+    inode: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PlanEntry':
+        return cls(data['source'], data.get('target'), data.get('size', 0),
+                   data.get('action', 'copy'), data.get('reason', ''),
+                   data.get('mtime_ns', 0), data.get('inode', 0))
+
+
+# Result status for each plan action that completed without an error
+RESULT_STATUS = {
+    'copy': 'copied',
+    'duplicate': 'duplicate',
+    'unchanged': 'unchanged',
+    'skip': 'skipped'
+}
+
+
+class OrganizeResult(NamedTuple):
+    """Outcome for one source file
+
+    status is 'copied', 'duplicate', 'unchanged', 'skipped' or 'failed'
+    (with error set).
+    """
+    relative_path: str
+    source: str
+    target: Optional[str]
+    status: str
+    size: int
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class OrganizePlan:
+    """A serializable list of planned operations for one organize run"""
+
+    def __init__(self, source_path: str, target_path: str, entries: List[PlanEntry] = None,
+                 metadata: Dict[str, Any] = None):
+        self.source_path = source_path
+        self.target_path = target_path
+        self.entries = entries if entries is not None else []
+        self.metadata = metadata or {}
+
+    def header(self) -> Dict[str, Any]:
+        """Plan-level fields stored alongside the entries"""
+        return {
+            'version': PLAN_VERSION,
+            'source_path': self.source_path,
+            'target_path': self.target_path,
+            'created': self.metadata.get('created', datetime.now().isoformat(timespec='seconds')),
+            **{k: v for k, v in self.metadata.items() if k != 'created'}
+        }
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Count entries and bytes per action"""
+        counts, sizes = Counter(), Counter()
+        for entry in self.entries:
+            counts[entry.action] += 1
+            sizes[entry.action] += entry.size
+        return {action: {'files': counts[action], 'bytes': sizes[action]} for action in counts}
+
+    def target_dirs(self) -> List[str]:
+        """Every directory the plan copies into, sorted"""
+        return sorted({os.path.dirname(e.target) for e in self.entries if e.action == 'copy'})
+
+    def write(self, path: str) -> None:
+        """Write the plan as JSON (.json) or JSON lines (anything else)"""
+        with open(path, 'w') as f:
+            if path.endswith('.json'):
+                json.dump({**self.header(), 'entries': [e.to_dict() for e in self.entries]}, f, indent=1)
+            else:
+                f.write(json.dumps({'plan': self.header()}) + '\n')
+                for entry in self.entries:
+                    f.write(json.dumps(entry.to_dict()) + '\n')
+
+    @classmethod
+    def load(cls, path: str) -> 'OrganizePlan':
+        """Read a plan written by write()"""
+        with open(path, 'r') as f:
+            if path.endswith('.json'):
+                data = json.load(f)
+                entries = data.pop('entries', [])
+            else:
+                data = json.loads(f.readline()).get('plan', {})
+                entries = (json.loads(line) for line in f if line.strip())
+            entries = [PlanEntry.from_dict(e) for e in entries]
+
+        if data.get('version', PLAN_VERSION) > PLAN_VERSION:
+            raise ValueError(f"Plan {path} was written by a newer version of Project Forge")
+        source_path = data.pop('source_path')
+        target_path = data.pop('target_path')
+        data.pop('version', None)
+        return cls(source_path, target_path, entries, data)
+
+
+class PlanExecutor:
+    """Run planned copies on the worker pool, creating directories in batches
+
+    Targets were free when the plan was made, but a saved plan may be
+    replayed or run after the target changed: a copy whose target exists
+    by then fails with FileExistsError instead of overwriting it, unless
+    it replaces the file's own earlier copy.
+    """
+
+    def __init__(self, copier: FileCopier, engine: CopyEngine):
+        self.copier = copier
+        self.engine = engine
+        self.engine.copy_func = self._copy
+        self._replaceable = set()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], copier: FileCopier = None) -> 'PlanExecutor':
+        copier = copier or FileCopier.from_config(config)
+        return cls(copier, CopyEngine.from_config(config, copy_func=copier.copy))
+
+    def execute(self, entries: Iterable[PlanEntry], target_dirs: Iterable[str] = None,
+                on_stop: Callable[[CopyResult], Any] = None) -> Iterator[CopyResult]:
+        """Copy the entries, yielding results in plan order
+
+        When the plan is known up front, pass target_dirs to create every
+        directory before the first copy; otherwise each directory is created
+        the first time an entry needs it. on_stop is passed to
+        CopyEngine.run().
+        """
+        created = set()
+        for directory in target_dirs or []:
+            os.makedirs(directory, exist_ok=True)
+            created.add(directory)
+        return self.engine.run(self._prepare(entries, created), on_stop)
+
+    def _prepare(self, entries: Iterable[PlanEntry], created: set) -> Iterator[PlanEntry]:
+        for entry in entries:
+            if entry.action == 'copy':
+                directory = os.path.dirname(entry.target)
+                if directory not in created:
+                    os.makedirs(directory, exist_ok=True)
+                    created.add(directory)
+                if entry.reason == REPLACE_REASON:
+                    self._replaceable.add(entry.target)
+            yield entry
+
+    def _copy(self, source: str, target: str) -> Any:
+        if target not in self._replaceable and os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, "Target already exists; plan the run again", target)
+        return self.copier.copy(source, target)
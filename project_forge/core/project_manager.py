@@ -1,16 +1,50 @@
 # project_forge/core/project_manager.py
 import os
 import yaml
-import shutil
+import sqlite3
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from pathlib import Path
 
+from .backup import (BACKUP_DIR, BACKUP_PREFIX, BackupGC, IncrementalBackup, RetentionPolicy,
+                     list_backups, migrate_legacy_backups)
+from .bulk import read_project_list
+from .catalog import ProjectCatalog
 from .config import ConfigManager
+from .copier import CopyEngine, CopyJob, FileCopier
+from .journal import IN_PLACE_JOURNAL, Journal, JournaledMover, rollback
+from .library_store import LibraryStore
+from .manifest import SourceManifest
+from .moves import ProjectMover
+from .plan import OrganizePlan
+from .reset import StructureReset
+from .scanner import DirectoryScanner
+from .snapshot import ScanSnapshot
+from .structure import ProjectSkeleton, make_folders
+from .utils import format_size
+from ..handlers.arduino import CACHE_NAME as ARDUINO_CACHE_NAME
 from ..handlers.file_handler import FileHandler
 from ..handlers.software_handler import SoftwareHandler
 from ..handlers.snippet_handler import SnippetHandler
 from ..cli.colors import Colors
+from ..cli.reporter import Reporter
+
+# New project metadata; FORGE_* placeholders are filled by ProjectSkeleton.render()
+PROJECT_YAML_TEMPLATE = yaml.dump({
+    'name': 'FORGE_NAME',
+    'status': 'FORGE_STATUS',
+    'created_date': 'FORGE_DATE',
+    'description': 'FORGE_DESCRIPTION',
+    'version': '0.1.0',
+    'metadata': {
+        'type': 'project',
+        'category': '',
+        'tags': 'FORGE_TAGS'
+    }
+}, default_flow_style=False)
+
+# Workspace internals (backups, trash, library store, catalog, journals)
+INTERNAL_PREFIX = '.forge_'
 
 class ProjectManager:
     def __init__(self, config_path: str = 'project_config.yaml', test_mode: bool = False):
@@ -20,6 +54,9 @@ class ProjectManager:
 
         # Initialize paths and folders
         self.base_path = self.configure_base_path()
+        # Put back the folders of an interrupted reinitialization before looking for them
+        reset = StructureReset(self.base_path)
+        reset_undone = reset.recover()
         self.master_folders = self.get_or_configure_master_folders()
         
         # Get configurations
@@ -36,6 +73,27 @@ class ProjectManager:
         self.file_handler = FileHandler(self.config)
         self.software_handler = SoftwareHandler(self.config)
         self.snippet_handler = SnippetHandler(self.config)
+        self._skeleton: Optional[ProjectSkeleton] = None
+        self.software_handler.library_store = LibraryStore.from_config(self.config, self.base_path)
+        if not self.software_handler.library_cache:
+            self.software_handler.library_cache = os.path.join(self.base_path, ARDUINO_CACHE_NAME)
+        self.catalog = ProjectCatalog.from_config(self.config, self.base_path)
+        self.set_reporter(Reporter())
+
+        # Finish or undo project moves a crash interrupted
+        if ProjectMover(self.base_path, reporter=self.reporter).recover():
+            self.reporter.note('warning', "Recovered an interrupted project move")
+        if reset_undone:
+            self.reporter.note('warning', "Restored the folders of an interrupted reinitialization")
+        if reset.unrestored:
+            self.reporter.note('error', "Some folders of an interrupted reinitialization could not be "
+                                        f"restored; they are kept in {reset.unrestored}")
+
+    def set_reporter(self, reporter: Reporter) -> None:
+        """Route per-file/per-folder output of the manager and its handlers"""
+        self.reporter = reporter
+        for handler in (self.file_handler, self.software_handler, self.snippet_handler):
+            handler.reporter = reporter
 
     def check_master_folders_exist(self, path: str = None) -> bool:
         """Check if master folders exist in given path or base path"""
@@ -50,23 +108,30 @@ class ProjectManager:
         return True
 
     def backup_folder_structure(self):
-        """Create a backup of the current folder structure"""
+        """Snapshot the current folder structure, hardlinking files unchanged since the last one"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = os.path.join(self.base_path, f"structure_backup_{timestamp}")
+        backup_root = self._backup_root()
+        backup_path = os.path.join(backup_root, f"{BACKUP_PREFIX}{timestamp}")
+        backups = list_backups(backup_root)
+        previous = backups[-1] if backups else None
         
         print(Colors.info(f"\nCreating backup at: {backup_path}"))
-        
-        # Create backup directory
-        os.makedirs(backup_path)
-        
-        # Copy all folders and their contents
-        for folder in os.listdir(self.base_path):
-            folder_path = os.path.join(self.base_path, folder)
-            if os.path.isdir(folder_path) and not folder.startswith("structure_backup_"):
-                backup_folder = os.path.join(backup_path, folder)
-                shutil.copytree(folder_path, backup_folder)
-        
-        print(Colors.success("✓ Backup created successfully"))
+        if previous:
+            print(Colors.info(f"Unchanged files are linked to: {previous}"))
+        
+        # Back up every folder except the backups themselves and the workspace's
+        # internals (trash being purged, library store)
+        folders = [folder for folder in sorted(os.listdir(self.base_path))
+                   if os.path.isdir(os.path.join(self.base_path, folder))
+                   and not folder.startswith(INTERNAL_PREFIX)
+                   and os.path.join(self.base_path, folder) != backup_root]
+        # Never hardlink or move live files into a backup
+        copier = FileCopier('auto')
+        backup = IncrementalBackup(copier, CopyEngine.from_config(self.config, copy_func=copier.copy))
+        stats = backup.snapshot(self.base_path, folders, backup_path, previous)
+        
+        print(Colors.success(f"✓ Backup created successfully ({stats['linked']} files linked, "
+                             f"{stats['copied']} copied, {format_size(stats['copied_bytes'])} new)"))
         return backup_path
 
     def add_custom_folders(self):
@@ -104,21 +169,22 @@ These will be created alongside the existing folders.
         print(Colors.success("\nCustom folders added successfully!"))
 
     def reinitialize_folder_structure(self):
-        """Reinitialize folder structure with backup"""
+        """Reinitialize folder structure with backup
+
+        The old folders are renamed into a trash folder and purged in the
+        background once the new structure is in place; see StructureReset.
+        """
         # First create a backup
         backup_path = self.backup_folder_structure()
-        
+
         print(Colors.info("\nReinitializing folder structure..."))
-        
-        # Remove all existing folders except backup
-        for folder in os.listdir(self.base_path):
-            folder_path = os.path.join(self.base_path, folder)
-            if os.path.isdir(folder_path) and not folder.startswith("structure_backup_"):
-                shutil.rmtree(folder_path)
-        
-        # Create new folder structure
-        self.master_folders = self.configure_master_folders()
-        
+
+        # Swap in the new folder structure; the old one is restored on failure
+        backup_root = os.path.dirname(backup_path)
+        keep = [os.path.basename(backup_root)] if os.path.dirname(backup_root) == self.base_path else []
+        self.master_folders = StructureReset(self.base_path, self.reporter).reset(
+            self.configure_master_folders, keep)
+
         print(Colors.success("\nFolder structure reinitialized successfully!"))
         print(Colors.info(f"Your previous structure is backed up at: {backup_path}"))
 
@@ -325,168 +391,388 @@ This will be your project's organization structure.
         """Create new project with basic structure"""
         status = status or self.defaults['status']
         project_path = os.path.join(self.base_path, status, project_name)
-        
-        # Create project directory
-        os.makedirs(project_path, exist_ok=True)
-        
-        # Create project structure from config
-        print(Colors.header(f"\nCreating project structure for '{project_name}'..."))
-        for folder_name, folder_info in self.project_structure.items():
-            folder_path = os.path.join(project_path, folder_name)
-            os.makedirs(folder_path, exist_ok=True)
-            print(Colors.success(f"✓ Created {folder_name}"))
-            
-            # Create subfolders if defined
-            if 'subfolders' in folder_info:
-                if isinstance(folder_info['subfolders'], list):
-                    # Simple list of subfolder names
-                    for subfolder in folder_info['subfolders']:
-                        subfolder_path = os.path.join(folder_path, subfolder)
-                        os.makedirs(subfolder_path, exist_ok=True)
-                        print(Colors.success(f"  ✓ Created {folder_name}/{subfolder}"))
-                else:
-                    # Dictionary with nested structure
-                    for subfolder, sub_items in folder_info['subfolders'].items():
-                        subfolder_path = os.path.join(folder_path, subfolder)
-                        os.makedirs(subfolder_path, exist_ok=True)
-                        print(Colors.success(f"  ✓ Created {folder_name}/{subfolder}"))
-                        
-                        # Create any deeper nested folders
-                        if isinstance(sub_items, list) and sub_items:
-                            for item in sub_items:
-                                item_path = os.path.join(subfolder_path, item)
-                                os.makedirs(item_path, exist_ok=True)
-                                print(Colors.success(f"    ✓ Created {folder_name}/{subfolder}/{item}"))
-        
-        # Create project metadata
-        self._create_project_yaml(project_path, project_name, status)
-        print(Colors.success("✓ Created project.yaml"))
-        
-        # Create README if enabled
-        if self.defaults.get('create_readme', True):
-            self._create_readme(project_path, project_name, status)
-            print(Colors.success("✓ Created README.md"))
-        
-        print(Colors.success(f"\nProject '{project_name}' created successfully!"))
+
+        # Create project structure and metadata from the compiled skeleton
+        self.reporter.note('header', f"\nCreating project structure for '{project_name}'...")
+        skeleton = self.skeleton
+        created, written = skeleton.materialize(project_path, project_name, status)
+        self.reporter.item('success', f"✓ Created {created} of {len(skeleton.folders)} folders")
+        for file_name in written:
+            self.reporter.item('success', f"✓ Created {file_name}")
+        
+        self._update_catalog(project_path)
+        self.reporter.note('success', f"\nProject '{project_name}' created successfully!")
         return project_path
 
+    def create_projects(self, rows: List[Dict], workers: int = None, status: str = None) -> List[str]:
+        """Create many projects at once, e.g. from read_project_list()
+
+        Metadata is rendered from the compiled skeleton up front, then the
+        projects are built on the organize worker pool. Rows without a status use status (or the
+        default status). Existing projects are left untouched.
+        """
+        skeleton = self.skeleton
+        statuses = {folder['name'] for folder in self.master_folders}
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        contents = {}
+        skipped = 0
+        for row in rows:
+            name = row.get('name', '')
+            project_status = row.get('status') or status or self.defaults['status']
+            if not name or name in ('.', '..') or '/' in name or os.sep in name:
+                self.reporter.item('error', f"Invalid project name '{name}'")
+                skipped += 1
+                continue
+            if project_status not in statuses:
+                self.reporter.item('error', f"Unknown status '{project_status}' for project '{name}'")
+                skipped += 1
+                continue
+            project_path = os.path.join(self.base_path, project_status, name)
+            if project_path in contents or os.path.exists(os.path.join(project_path, "project.yaml")):
+                self.reporter.item('warning', f"Project '{project_status}/{name}' already exists, skipped")
+                skipped += 1
+                continue
+            contents[project_path] = skeleton.render(name, project_status, row.get('description', ''),
+                                                     row.get('tags', []), today)
+
+        def build(name: str, project_path: str) -> None:
+            make_folders(project_path, skeleton.folders)
+            skeleton.write_metadata(project_path, *contents[project_path])
+
+        engine = CopyEngine.from_config(self.config, copy_func=build,
+                                        **({'workers': workers} if workers else {}))
+        jobs = (CopyJob(os.path.basename(path), path) for path in contents)
+        created = []
+        for result in engine.run(jobs):
+            relative_path = os.path.relpath(result.job.target, self.base_path)
+            if result.error:
+                self.reporter.item('error', f"Error creating {relative_path}: {result.error}")
+            else:
+                created.append(result.job.target)
+                self.reporter.item('success', f"✓ Created {relative_path}")
+
+        self.reporter.note('success', f"\nCreated {len(created)} projects "
+                                      f"({len(skeleton.folders)} folders each, {skipped} skipped)",
+                           created=len(created), skipped=skipped)
+        return created
+
+    def create_projects_from_file(self, path: str, workers: int = None, status: str = None) -> List[str]:
+        """Create every project listed in a .csv or .yaml file"""
+        return self.create_projects(read_project_list(path), workers, status)
+
     def organize_existing_project(self, source_path: str, project_name: str, 
-                                status: str, naming_pattern: str = None) -> str:
+                                status: str, naming_pattern: str = None,
+                                copy_mode: str = None, allow_hardlinks: bool = None,
+                                dedup: bool = None, incremental: bool = None,
+                                delete_removed: bool = None) -> str:
         """Organize existing project files by copying to new location"""
-        # Create new project
-        project_path = self.create_project(project_name, status)
-        
+        # One copier per run so the summary covers every copied file
+        copier = FileCopier.from_config(self.config, copy_mode, allow_hardlinks)
+
+        # Create new project, or reuse it when re-organizing the same source
+        project_path = self._ensure_project(project_name, status)
+
+        # One walk of the source serves detection, software copy and organize
+        snapshot = self._scan_source(source_path)
+        software_paths = []
+
         # Check if it's a software project
-        if self.software_handler.detect_project_type(source_path):
-            self.software_handler.copy_project(source_path, project_path)
+        if self.software_handler.detect_project_type(source_path, snapshot):
+            software_paths = self.software_handler.software_layout(source_path, snapshot)
+            self.software_handler.copy_project(source_path, project_path, copier, snapshot, software_paths,
+                                               delete_removed)
             
         # Organize other files
-        self.file_handler.organize_files(source_path, project_path, naming_pattern)
+        self.file_handler.organize_files(source_path, project_path, naming_pattern, copier,
+                                         dedup, incremental, snapshot,
+                                         exclude=[source for source, _ in software_paths])
         
+        self._update_catalog(project_path)
         return project_path
 
+    def plan_existing_project(self, source_path: str, project_name: str,
+                              status: str, naming_pattern: str = None,
+                              dedup: bool = None, incremental: bool = None) -> OrganizePlan:
+        """Plan an organize run without creating or copying anything"""
+        # Absolute paths keep the plan valid when executed from elsewhere
+        source_path = os.path.abspath(source_path)
+        project_path = os.path.abspath(os.path.join(self.base_path, status, project_name))
+        snapshot = self._scan_source(source_path)
+        software_paths = []
+
+        software_type = None
+        if self.software_handler.detect_project_type(source_path, snapshot):
+            software_type = self.software_handler.project_type
+            software_paths = self.software_handler.software_layout(source_path, snapshot)
+
+        plan = self.file_handler.plan_files(source_path, project_path, naming_pattern, dedup, incremental,
+                                            snapshot, exclude=[source for source, _ in software_paths])
+        plan.metadata.update({'project_name': project_name, 'status': status})
+        if software_type:
+            plan.metadata['software_type'] = software_type
+            plan.metadata['software_markers'] = dict(self.software_handler.markers_found)
+
+        return plan
+
+    def _scan_source(self, source_path: str) -> ScanSnapshot:
+        """List a source tree once for every handler of an operation"""
+        return ScanSnapshot.build(source_path, DirectoryScanner(self.config.get('ignore_patterns', [])))
+
+    def execute_plan(self, plan: OrganizePlan, copy_mode: str = None,
+                     allow_hardlinks: bool = None, delete_removed: bool = None) -> str:
+        """Carry out a plan made by plan_existing_project (possibly loaded from disk)"""
+        if plan.metadata.get('in_place'):
+            self.reporter.note('error', "In-place plans are not executed; run organize --in-place instead")
+            return None
+        copier = FileCopier.from_config(self.config, copy_mode, allow_hardlinks)
+        project_path = plan.target_path
+
+        if not os.path.exists(os.path.join(project_path, "project.yaml")):
+            self.create_project(plan.metadata.get('project_name', os.path.basename(project_path)),
+                                plan.metadata.get('status', self.defaults['status']))
+
+        software_type = plan.metadata.get('software_type')
+        if software_type:
+            self.software_handler.project_type = software_type
+            # Plans saved before markers were recorded are detected again
+            self.software_handler.markers_found = dict(plan.metadata.get('software_markers') or {})
+            self.software_handler.copy_project(plan.source_path, project_path, copier,
+                                               delete_removed=delete_removed)
+
+        manifest = None
+        if plan.metadata.get('incremental'):
+            manifest = SourceManifest.load(project_path, plan.source_path)
+
+        # All target folders are known up front, so create them in one batch
+        self.file_handler.execute_plan(plan.entries, plan.source_path, copier, plan.target_dirs(),
+                                       manifest=manifest)
+        self._update_catalog(project_path)
+        return project_path
+
+    def _ensure_project(self, project_name: str, status: str) -> str:
+        """Create the project unless it already exists"""
+        project_path = os.path.join(self.base_path, status, project_name)
+        if os.path.exists(os.path.join(project_path, "project.yaml")):
+            self.reporter.note('info', f"\nUpdating existing project '{project_name}'")
+            return project_path
+        return self.create_project(project_name, status)
+
+    def print_plan_summary(self, plan: OrganizePlan) -> None:
+        """Print what a plan would do"""
+        summary = plan.summary()
+        self.reporter.note('header', f"\nPlan for '{plan.source_path}' -> '{plan.target_path}':")
+        if plan.metadata.get('software_type'):
+            self.reporter.note('info', f"Software project: {plan.metadata['software_type']} "
+                                       "(copied with its structure)")
+        labels = [('copy', 'Files to move' if plan.metadata.get('in_place') else 'Files to copy', 'success'),
+                  ('unchanged', 'Unchanged since last run', 'info'),
+                  ('duplicate', 'Duplicates to skip', 'info'),
+                  ('skip', 'Files without category', 'warning')]
+        for action, label, status in labels:
+            info = summary.get(action, {'files': 0, 'bytes': 0})
+            self.reporter.note(status, f"{label}: {info['files']} ({format_size(info['bytes'])})",
+                               action=action, **info)
+
+    def plan_in_place(self, source_path: str, project_name: str, status: str,
+                      naming_pattern: str = None) -> OrganizePlan:
+        """Plan the moves of an in-place organization without touching the source"""
+        source_path = os.path.abspath(source_path)
+        plan = self.file_handler.plan_files(source_path, source_path, naming_pattern,
+                                            dedup=False, incremental=False)
+        # The project's own metadata files stay at the root
+        metadata_files = {os.path.join(source_path, name) for name in ('project.yaml', 'README.md')}
+        plan.entries = [e for e in plan.entries if e.source not in metadata_files]
+        plan.metadata.update({'project_name': project_name, 'status': status, 'in_place': True})
+        return plan
+
     def organize_project_in_place(self, source_path: str, project_name: str,
                                 status: str, naming_pattern: str = None) -> str:
-        """Organize existing project files in their current location"""
-        print(Colors.header(f"\nOrganizing project '{project_name}' in current location..."))
-        
-        # Create project structure in current location
-        for folder_name, folder_info in self.project_structure.items():
-            folder_path = os.path.join(source_path, folder_name)
-            os.makedirs(folder_path, exist_ok=True)
-            print(Colors.success(f"✓ Created {folder_name}"))
-            
-            # Create subfolders if defined
-            if 'subfolders' in folder_info:
-                if isinstance(folder_info['subfolders'], list):
-                    # Simple list of subfolder names
-                    for subfolder in folder_info['subfolders']:
-                        subfolder_path = os.path.join(folder_path, subfolder)
-                        os.makedirs(subfolder_path, exist_ok=True)
-                        print(Colors.success(f"  ✓ Created {folder_name}/{subfolder}"))
-                else:
-                    # Dictionary with nested structure
-                    for subfolder, sub_items in folder_info['subfolders'].items():
-                        subfolder_path = os.path.join(folder_path, subfolder)
-                        os.makedirs(subfolder_path, exist_ok=True)
-                        print(Colors.success(f"  ✓ Created {folder_name}/{subfolder}"))
-                        
-                        # Create any deeper nested folders
-                        if isinstance(sub_items, list) and sub_items:
-                            for item in sub_items:
-                                item_path = os.path.join(subfolder_path, item)
-                                os.makedirs(item_path, exist_ok=True)
-                                print(Colors.success(f"    ✓ Created {folder_name}/{subfolder}/{item}"))
-        
-        # Create project metadata
-        self._create_project_yaml(source_path, project_name, status)
-        print(Colors.success("✓ Created project.yaml"))
-        
-        # Create README if enabled
-        if self.defaults.get('create_readme', True):
-            self._create_readme(source_path, project_name, status)
-            print(Colors.success("✓ Created README.md"))
-        
-        # Organize files in place
-        self.file_handler.organize_files(source_path, source_path, naming_pattern)
-        
-        print(Colors.success(f"\nProject '{project_name}' organized successfully in current location!"))
+        """Organize existing project files in their current location
+
+        Files are moved with renames rather than copied, planned from a
+        listing taken before anything is created. Every folder, move and
+        metadata file is journaled first, so rollback_in_place() can undo
+        the run even if it was interrupted.
+        """
+        source_path = os.path.abspath(source_path)
+        journal_path = os.path.join(source_path, IN_PLACE_JOURNAL)
+        if os.path.exists(journal_path) and not Journal.is_committed(Journal.load(journal_path)):
+            self.reporter.note('error', f"A previous in-place run in '{source_path}' did not finish; "
+                                        "roll it back first")
+            return None
+
+        self.reporter.note('header', f"\nOrganizing project '{project_name}' in current location...")
+
+        # Snapshot the tree before any folder or file is added to it
+        plan = self.plan_in_place(source_path, project_name, status, naming_pattern)
+
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        with Journal(journal_path) as journal:
+            journal.record('begin', source=source_path, project_name=project_name, status=status)
+
+            # Create project structure in current location
+            skeleton = self.skeleton
+            for folder in skeleton.folders:
+                journal.makedirs(os.path.join(source_path, folder))
+            self.reporter.item('success', f"✓ Created {len(skeleton.folders)} folders")
+
+            # Move files into place
+            for directory in plan.target_dirs():
+                journal.makedirs(directory)
+            self.file_handler.execute_plan(plan.entries, source_path, JournaledMover(journal),
+                                           plan.target_dirs())
+
+            # Create project metadata, keeping any the project already has
+            project_yaml, readme = skeleton.render(project_name, status)
+            for file_name, content in (('project.yaml', project_yaml), ('README.md', readme)):
+                file_path = os.path.join(source_path, file_name)
+                if content is not None and not os.path.exists(file_path):
+                    journal.record('create', path=file_path)
+                    with open(file_path, 'w') as f:
+                        f.write(content)
+                    self.reporter.item('success', f"✓ Created {file_name}")
+
+            journal.commit()
+
+        self.reporter.note('success', f"\nProject '{project_name}' organized successfully in current location!")
         return source_path
 
-    def _create_project_yaml(self, project_path: str, project_name: str, status: str):
-        """Create project metadata YAML file"""
-        yaml_content = {
-            'name': project_name,
-            'status': status,
-            'created_date': datetime.now().strftime("%Y-%m-%d"),
-            'description': '',
-            'version': '0.1.0',
-            'metadata': {
-                'type': 'project',
-                'category': '',
-                'tags': []
-            }
-        }
-        
-        yaml_path = os.path.join(project_path, "project.yaml")
-        with open(yaml_path, 'w') as f:
-            yaml.dump(yaml_content, f, default_flow_style=False)
-
-    def _create_readme(self, project_path: str, project_name: str, status: str):
-        """Create README.md from template"""
-        template = self.defaults.get('readme_template', "# {project_name}\n")
-        content = template.format(
-            project_name=project_name,
-            date=datetime.now().strftime("%Y-%m-%d"),
-            status=status
-        )
-        
-        readme_path = os.path.join(project_path, "README.md")
-        with open(readme_path, 'w') as f:
-            f.write(content)
+    def rollback_in_place(self, source_path: str) -> bool:
+        """Undo the last in-place organization of source_path
+
+        The journal is kept if a move or created file could not be undone,
+        so the rollback can be retried (and organize refuses to run again).
+        """
+        journal_path = os.path.join(source_path, IN_PLACE_JOURNAL)
+        if not os.path.exists(journal_path):
+            self.reporter.note('warning', f"No in-place journal found in '{source_path}'")
+            return False
+
+        self.reporter.note('header', f"\nRolling back in-place organization of '{source_path}'...")
+        records = Journal.load(journal_path)
+        undone = rollback(records, self.reporter)
+        left = [r for r in records if (r.get('op') == 'move' and os.path.lexists(r['dst']))
+                or (r.get('op') == 'create' and os.path.exists(r['path']))]
+        if left:
+            with Journal(journal_path) as journal:
+                journal.record('rollback', left=len(left))
+            self.reporter.note('error', f"Undid {undone} operations, {len(left)} could not be undone; "
+                                        f"the journal is kept to run rollback again")
+            return False
+        os.remove(journal_path)
+        self.reporter.note('success', f"Undid {undone} operations")
+        return True
+
+    def gc_libraries(self, dry_run: bool = False) -> int:
+        """Remove library store entries no project links to any more"""
+        store = self.software_handler.library_store
+        if store is None:
+            self.reporter.note('warning', "The library store is disabled (library_store.enabled)")
+            return 0
+
+        removed = store.gc(dry_run)
+        for key, size in removed:
+            self.reporter.item('info' if dry_run else 'success',
+                               f"{'Would remove' if dry_run else 'Removed'}: {key} ({format_size(size)})",
+                               entry=key, bytes=size)
+        self.reporter.note('header', f"\nLibrary store: {store.summary(removed)} "
+                                     f"{'found' if dry_run else 'removed'}")
+        return len(removed)
+
+    def gc_backups(self, dry_run: bool = False, pack: bool = True) -> int:
+        """Apply the backups retention policy: remove old backups and pack older ones"""
+        backup_gc = BackupGC(self._backup_root(), RetentionPolicy.from_config(self.config),
+                             self.config.get('organize', {}).get('workers', 8))
+        actions = backup_gc.run(dry_run, pack)
+        labels = {'remove': ('Would remove', 'Removed'), 'pack': ('Would pack', 'Packed')}
+        for action, name, size in actions:
+            label = labels[action][0 if dry_run else 1]
+            freed = '' if dry_run and action == 'pack' else f" ({format_size(size)} freed)"
+            self.reporter.item('info' if dry_run else 'success', f"{label}: {name}{freed}",
+                               action=action, backup=name, bytes=size)
+        self.reporter.note('header', f"\nBackups: {len(actions)} {'planned' if dry_run else 'done'}, "
+                                     f"{format_size(sum(size for _, _, size in actions))} "
+                                     f"{'to free' if dry_run else 'freed'}")
+        return len(actions)
+
+    def _backup_root(self) -> str:
+        """Folder holding structure backups, with legacy ones moved into it"""
+        settings = self.config.get('backups', {}) or {}
+        backup_root = os.path.expanduser(settings.get('path') or os.path.join(self.base_path, BACKUP_DIR))
+        migrate_legacy_backups(self.base_path, backup_root)
+        return backup_root
+
+    @property
+    def skeleton(self) -> ProjectSkeleton:
+        """Compiled project structure and templates, rebuilt when the config changes"""
+        readme_template = None
+        if self.defaults.get('create_readme', True):
+            readme_template = self.defaults.get('readme_template', "# {project_name}\n")
+        version = ProjectSkeleton.version_of(self.project_structure, PROJECT_YAML_TEMPLATE, readme_template)
+        if self._skeleton is None or self._skeleton.version != version:
+            self._skeleton = ProjectSkeleton.compile(self.project_structure, PROJECT_YAML_TEMPLATE,
+                                                     readme_template)
+        return self._skeleton
+
+    def move_projects(self, moves: List[Tuple[str, str, str]], workers: int = None) -> List[str]:
+        """Move (name, from_status, to_status) projects in one journaled batch
+
+        Projects are renamed when the statuses share a filesystem and
+        copied in parallel otherwise; see ProjectMover.
+        """
+        # Sources are deleted only once every copy succeeded; never move live files
+        copier = FileCopier('auto')
+        engine = CopyEngine.from_config(self.config, copy_func=copier.copy,
+                                        **({'workers': workers} if workers else {}))
+        mover = ProjectMover(self.base_path, copier, engine, self.reporter)
+        moved = mover.move(moves)
+        self.reporter.note('success' if len(moved) == len(moves) else 'warning',
+                           f"\nMoved {len(moved)} of {len(moves)} projects",
+                           moved=len(moved), requested=len(moves))
+        return moved
+
+    def query_projects(self, status: Union[str, List[str]] = None, tags: List[str] = (),
+                       software_type: str = None, created_after: str = None,
+                       name_glob: str = None, sort: str = 'name', descending: bool = False,
+                       limit: int = None, offset: int = 0, deep: bool = False) -> List[Dict]:
+        """Find projects in the catalog without opening their project.yaml"""
+        self.catalog.refresh(deep=deep)
+        return self.catalog.query(status, tags, software_type, created_after, name_glob,
+                                  sort, descending, limit, offset)
+
+    def list_projects(self, status: Union[str, List[str]] = None, tags: List[str] = (),
+                      software_type: str = None, created_after: str = None,
+                      name_glob: str = None, sort: str = 'name', descending: bool = False,
+                      limit: int = None, offset: int = 0, deep: bool = False) -> List[Dict]:
+        """Report the projects matching a query, one line (or JSON object) each"""
+        projects = self.query_projects(status, tags, software_type, created_after, name_glob,
+                                       sort, descending, limit, offset, deep)
+        for project in projects:
+            details = [project['created_date'] or '-', project['software_type'] or '-',
+                       f"{project['file_count']} files", format_size(project['size'])]
+            if project['tags']:
+                details.append(', '.join(project['tags']))
+            self.reporter.item('plain', f"{project['status']}/{project['name']}  ({'; '.join(details)})",
+                               project=project)
+        total = self.catalog.count(status, tags, software_type, created_after, name_glob)
+        self.reporter.note('info', f"\nShowing {len(projects)} of {total} matching projects",
+                           shown=len(projects), total=total, offset=offset)
+        return projects
+
+    def _update_catalog(self, project_path: str) -> None:
+        """Refresh the catalog row of a project this manager just wrote"""
+        try:
+            self.catalog.update_project(project_path)
+        except sqlite3.Error as e:
+            self.reporter.note('warning', f"Could not update the project catalog: {e}")
 
     def _get_all_projects(self) -> Dict[str, List[str]]:
-        """Get all projects organized by status"""
-        projects = {}
-        
+        """Get all projects organized by status, from the project catalog"""
         try:
-            # Get all directories that aren't hidden
-            status_dirs = [d for d in os.listdir(self.base_path) 
-                         if os.path.isdir(os.path.join(self.base_path, d)) 
-                         and not d.startswith('.')]
-            
-            # Get projects for each status directory
-            for status in status_dirs:
-                status_path = os.path.join(self.base_path, status)
-                if os.path.exists(status_path):
-                    projects[status] = sorted([
-                        d for d in os.listdir(status_path)
-                        if os.path.isdir(os.path.join(status_path, d)) 
-                        and not d.startswith('.')
-                    ])
-                    
-            return projects
-            
+            self.catalog.refresh()
+            return self.catalog.projects_by_status()
         except Exception as e:
             print(Colors.error(f"Error reading projects: {e}"))
             return {}
@@ -0,0 +1,167 @@
+# project_forge/core/reset.py
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .journal import Journal, rollback
+
+# Journal of an unfinished reinitialization, kept in the workspace root
+RESET_JOURNAL = '.forge_reset.jsonl'
+
+# Replaced folders wait here until they are purged
+TRASH_DIR = '.forge_trash'
+
+# Trash of committed resets is renamed with this prefix, then deleted
+PURGE_PREFIX = 'purge_'
+
+
+class StructureReset:
+    """Replace the workspace folders as one journaled transaction
+
+    The current folders are renamed into this run's folder of the trash
+    (one rename each, whatever their size), then the new structure is
+    built. Only once that is committed is the run's trash deleted, in a
+    background thread. If the build fails, or the run is interrupted and
+    recover() runs on the next start, the new folders are removed and the
+    old ones renamed back; nothing is ever copied. Trash that could not be
+    restored is kept, along with its journal, until a later recovery can.
+
+    The journal is locked for the whole run, so recovery in another
+    process leaves a reset that is still running alone. Hidden folders
+    (backups, library store, trash) are left in place.
+    """
+
+    def __init__(self, base_path: str, reporter: Any = None):
+        self.base_path = base_path
+        self.journal_path = os.path.join(base_path, RESET_JOURNAL)
+        self.trash_root = os.path.join(base_path, TRASH_DIR)
+        self.reporter = reporter
+        # Trash folder still holding folders a recovery could not put back
+        self.unrestored: Optional[str] = None
+
+    def folders(self, keep: Iterable[str] = ()) -> List[str]:
+        """Names of the workspace folders a reset replaces, apart from keep"""
+        return sorted(name for name in os.listdir(self.base_path)
+                      if not name.startswith('.') and name not in keep
+                      and os.path.isdir(os.path.join(self.base_path, name)))
+
+    def reset(self, build: Callable[[], Any], keep: Iterable[str] = ()) -> Any:
+        """Move the current folders but keep to the trash, call build() and return its result"""
+        journal = Journal.open_locked(self.journal_path, blocking=False)
+        if journal is None:
+            raise RuntimeError("Another reinitialization of this workspace is in progress")
+        with journal:
+            if not self._settle(journal, Journal.load(self.journal_path)):
+                raise RuntimeError(f"Folders of an earlier reinitialization are still in {self.unrestored}")
+            journal.clear()
+
+            trash = os.path.join(self.trash_root, f"reset_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}")
+            journal.record('reset', folders=self.folders(), trash=trash)
+            os.makedirs(trash)
+            try:
+                for name in self.folders(keep):
+                    source = os.path.join(self.base_path, name)
+                    target = os.path.join(trash, name)
+                    journal.record('move', src=source, dst=target)
+                    os.rename(source, target)
+                result = build()
+            except BaseException:
+                # Includes KeyboardInterrupt at a prompt of build()
+                if self._settle(journal, Journal.load(self.journal_path)):
+                    os.remove(self.journal_path)
+                raise
+            journal.commit()
+            self._discard(trash)
+            os.remove(self.journal_path)
+        self.purge()
+        return result
+
+    def recover(self) -> bool:
+        """Undo an interrupted reset and purge committed trash, return whether one was undone
+
+        A journal locked by a reset still running is left alone.
+        """
+        undone = False
+        if os.path.exists(self.journal_path):
+            journal = Journal.open_locked(self.journal_path, blocking=False)
+            if journal is not None:
+                with journal:
+                    records = Journal.load(self.journal_path)
+                    restored = self._settle(journal, records)
+                    undone = restored and any(r.get('op') == 'move' for r in records) \
+                        and not Journal.is_committed(records)
+                    if restored:
+                        os.remove(self.journal_path)
+        self.purge()
+        return undone
+
+    def purge(self, wait: bool = False) -> Optional[threading.Thread]:
+        """Delete the trash of committed resets in a background thread
+
+        The thread does not keep the process alive; whatever it has not
+        deleted by exit is purged on the next start.
+        """
+        try:
+            paths = [entry.path for entry in os.scandir(self.trash_root) if entry.name.startswith(PURGE_PREFIX)]
+        except OSError:
+            return None
+        if not paths:
+            return None
+        thread = threading.Thread(target=self._delete, args=(paths,), daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return thread
+
+    @staticmethod
+    def _delete(paths: List[str]) -> None:
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _discard(self, trash: str) -> None:
+        """Mark a committed run's trash for purging"""
+        if os.path.isdir(trash):
+            os.rename(trash, os.path.join(self.trash_root, PURGE_PREFIX + os.path.basename(trash)))
+
+    def _settle(self, journal: Journal, records: List[Dict[str, Any]]) -> bool:
+        """Finish a committed run or undo an unfinished one, return False if trash is left"""
+        start = next((r for r in records if r.get('op') == 'reset'), None)
+        if start is None:
+            return True
+        if Journal.is_committed(records):
+            self._discard(start['trash'])
+            return True
+        return self._undo(journal, records, start)
+
+    def _undo(self, journal: Journal, records: List[Dict[str, Any]], start: Dict[str, Any]) -> bool:
+        """Remove folders built by the reset and move the trashed ones back"""
+        moved = [r for r in records if r.get('op') == 'move' and os.path.lexists(r['dst'])]
+        # New folders are removed by the first undo only; a later retry just renames
+        if not any(r.get('op') == 'undone' for r in records):
+            for name in self.folders():
+                path = os.path.join(self.base_path, name)
+                if name in start['folders'] and not any(r['src'] == path for r in moved):
+                    continue
+                # A freshly built folder holds nothing but empty folders
+                if any(files for _, _, files in os.walk(path)):
+                    self._report('error', f"Kept new folder {path}: it is not empty")
+                    continue
+                for root, _, _ in os.walk(path, topdown=False):
+                    os.rmdir(root)
+        rollback(moved, self.reporter)
+
+        trash = start['trash']
+        if os.path.isdir(trash) and os.listdir(trash):
+            journal.record('undone')
+            self.unrestored = trash
+            self._report('error', f"Could not restore every folder; the rest are kept in {trash}")
+            return False
+        if os.path.isdir(trash):
+            os.rmdir(trash)
+        return True
+
+    def _report(self, status: str, message: str) -> None:
+        if self.reporter:
+            self.reporter.item(status, message)
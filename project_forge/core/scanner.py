@@ -0,0 +1,75 @@
+# project_forge/core/scanner.py
+import os
+import re
+from typing import Callable, Iterable, Iterator, Optional, Pattern, Tuple
+
+
+def compile_ignore_patterns(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Combine ignore patterns into a single regex (None if there are none)"""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    # re.match anchors every alternative at the start, same as matching
+    # each pattern on its own
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+class DirectoryScanner:
+    """os.scandir based walker that prunes ignored directories before descending"""
+
+    def __init__(self, ignore_patterns: Iterable[str] = (), prune_dirs: Iterable[str] = (),
+                 on_error: Optional[Callable[[OSError], None]] = None):
+        self.ignore_regex = compile_ignore_patterns(ignore_patterns)
+        self.prune_dirs = set(prune_dirs)
+        self.on_error = on_error
+
+    def is_ignored(self, name: str) -> bool:
+        """Check if a file or directory name matches any ignore pattern"""
+        return bool(self.ignore_regex and self.ignore_regex.match(name))
+
+    def scan(self, root: str, include_dirs: bool = False,
+             max_depth: Optional[int] = None) -> Iterator[Tuple[os.DirEntry, str]]:
+        """Yield (DirEntry, relative_path) for every file below root
+
+        Directories that match an ignore pattern or are listed in prune_dirs
+        are never opened. The yielded DirEntry objects carry the file type
+        from the directory listing and cache their stat() result, so callers
+        should use them instead of stat-ing the path again.
+
+        With include_dirs, directories are yielded too (pruned ones
+        included, before anything below them). max_depth limits how many
+        directory levels below root are opened; 0 lists root only.
+        """
+        stack = [(root, '', 0)]
+        while stack:
+            directory, relative_dir, depth = stack.pop()
+            descend = max_depth is None or depth < max_depth
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if self.is_ignored(name):
+                            continue
+
+                        relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+
+                        if is_dir:
+                            if include_dirs:
+                                yield entry, relative_path
+                            # Like os.walk, never follow directory symlinks
+                            if descend and name not in self.prune_dirs and not entry.is_symlink():
+                                subdirs.append((entry.path, relative_path, depth + 1))
+                        else:
+                            yield entry, relative_path
+            except OSError as e:
+                if self.on_error:
+                    self.on_error(e)
+                continue
+
+            # Reverse so subdirectories are visited in listing order
+            stack.extend(reversed(subdirs))
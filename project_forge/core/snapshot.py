@@ -0,0 +1,149 @@
+# project_forge/core/snapshot.py
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .scanner import DirectoryScanner
+
+# Entry kinds; symlinks to files count as files, linked directories are
+# recorded but (like os.walk) never descended into
+FILE, DIRECTORY, LINKED_DIR = 0, 1, 2
+
+
+class SnapshotEntry(NamedTuple):
+    """One file or directory of a ScanSnapshot"""
+    relative_path: str
+    name: str
+    kind: int
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @property
+    def is_dir(self) -> bool:
+        return self.kind != FILE
+
+
+class ScanSnapshot:
+    """Listing of a source tree taken by one walk and shared by every handler
+
+    Entries keep scan order (the order DirectoryScanner yields them) and
+    are stored column-wise: names in a list, parent directory indexes,
+    kinds, sizes, mtimes and inodes in typed arrays. Directories are
+    interned once, so a path string is only built when an entry is read.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._dirs: List[str] = ['']
+        self._dir_index: Dict[str, int] = {'': 0}
+        self._names: List[str] = []
+        self._parents = array('l')
+        self._kinds = bytearray()
+        self._sizes = array('q')
+        self._mtimes = array('q')
+        self._inodes = array('Q')
+        self._lookup = None
+
+    @classmethod
+    def build(cls, root: str, scanner: DirectoryScanner) -> 'ScanSnapshot':
+        """Walk root once, stat-ing each file a single time"""
+        snapshot = cls(root)
+        for entry, relative_path in scanner.scan(root, include_dirs=True):
+            size = mtime_ns = inode = 0
+            try:
+                if entry.is_dir():
+                    kind = LINKED_DIR if entry.is_symlink() else DIRECTORY
+                else:
+                    kind = FILE
+                    st = entry.stat()
+                    size, mtime_ns, inode = st.st_size, st.st_mtime_ns, st.st_ino or entry.inode()
+            except OSError:
+                kind = FILE
+            snapshot.add(relative_path, kind, size, mtime_ns, inode)
+        return snapshot
+
+    def add(self, relative_path: str, kind: int, size: int = 0, mtime_ns: int = 0, inode: int = 0) -> None:
+        """Append an entry; its parent directory must already be present (or be root)"""
+        parent, _, name = relative_path.rpartition(os.sep)
+        self._names.append(name)
+        self._parents.append(self._dir_index[parent])
+        self._kinds.append(kind)
+        self._sizes.append(size)
+        self._mtimes.append(mtime_ns)
+        self._inodes.append(inode)
+        self._lookup = None
+        if kind == DIRECTORY:
+            self._dir_index[relative_path] = len(self._dirs)
+            self._dirs.append(relative_path)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[SnapshotEntry]:
+        dirs, names = self._dirs, self._names
+        for i in range(len(names)):
+            parent = dirs[self._parents[i]]
+            name = names[i]
+            yield SnapshotEntry(os.path.join(parent, name) if parent else name, name,
+                                self._kinds[i], self._sizes[i], self._mtimes[i], self._inodes[i])
+
+    def has_dir(self, relative_path: str) -> bool:
+        return relative_path in self._dir_index
+
+    def contains(self, relative_path: str) -> bool:
+        """Check whether a file or directory was seen by the scan"""
+        if relative_path in self._dir_index:
+            return True
+        if self._lookup is None:
+            self._lookup = set(zip(self._parents, self._names))
+        parent, _, name = relative_path.rpartition(os.sep)
+        index = self._dir_index.get(parent)
+        return index is not None and (index, name) in self._lookup
+
+    def walk(self, max_depth: Optional[int] = None) -> Iterator[SnapshotEntry]:
+        """Entries no more than max_depth directory levels below root"""
+        for entry in self:
+            if max_depth is None or entry.relative_path.count(os.sep) <= max_depth:
+                yield entry
+
+    def root_entries(self) -> Iterator[SnapshotEntry]:
+        """Entries directly in root (listed before anything below it)"""
+        for entry in self:
+            if os.sep in entry.relative_path:
+                break
+            yield entry
+
+    def files(self, prune_dirs: Iterable[str] = (), exclude: Iterable[str] = (),
+              under: str = '', kinds: Iterable[int] = (FILE,)) -> Iterator[SnapshotEntry]:
+        """Files in scan order, skipping pruned directory names and excluded paths
+
+        exclude holds relative paths of files or whole directories ('' for
+        everything); under restricts the result to one directory. Pass
+        kinds to get directories as well.
+        """
+        prune_dirs, exclude, kinds = set(prune_dirs), set(exclude), set(kinds)
+        if '' in exclude:
+            return
+        # Directory index -> whether its contents are wanted, filled on demand
+        wanted = {0: under == ''}
+        dirs = self._dirs
+
+        def is_wanted(index: int) -> bool:
+            state = wanted.get(index)
+            if state is None:
+                path = dirs[index]
+                parent, _, name = path.rpartition(os.sep)
+                if path in exclude or name in prune_dirs:
+                    state = False
+                elif path == under:
+                    state = True
+                else:
+                    state = is_wanted(self._dir_index[parent])
+                wanted[index] = state
+            return state
+
+        for entry_index, entry in enumerate(self):
+            if entry.kind in kinds and is_wanted(self._parents[entry_index]) \
+                    and entry.relative_path not in exclude:
+                yield entry
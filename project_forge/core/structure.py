@@ -0,0 +1,117 @@
+# project_forge/core/structure.py
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Per-project values in a ProjectSkeleton's project.yaml template
+YAML_PLACEHOLDER = re.compile(r'FORGE_(NAME|STATUS|DATE|DESCRIPTION|TAGS)')
+
+
+def compile_structure(project_structure: Dict[str, Any]) -> List[str]:
+    """Flatten a project_structure config into relative folder paths
+
+    Folders come before their subfolders, in config order. A folder's
+    'subfolders' may be a list of names or a dict whose values are either
+    a list of names or another folder entry with its own 'subfolders'.
+    """
+    folders = []
+
+    def add(parent: str, subfolders: Any) -> None:
+        if isinstance(subfolders, dict):
+            for name, info in subfolders.items():
+                path = os.path.join(parent, name) if parent else name
+                folders.append(path)
+                add(path, info.get('subfolders') if isinstance(info, dict) else info)
+        elif isinstance(subfolders, list):
+            folders.extend(os.path.join(parent, name) for name in subfolders)
+
+    add('', project_structure)
+    return folders
+
+
+def make_folders(root: str, folders: List[str]) -> int:
+    """Create root and compiled folders below it, return how many were new"""
+    os.makedirs(root, exist_ok=True)
+    created = 0
+    for folder in folders:
+        try:
+            # Parents precede children, so a plain mkdir is enough
+            os.mkdir(os.path.join(root, folder))
+            created += 1
+        except FileExistsError:
+            pass
+    return created
+
+
+class ProjectSkeleton:
+    """Compiled project structure plus the project.yaml and README templates
+
+    Compiling walks the nested structure config once; every project is
+    then materialized with one mkdir per folder and two template fills.
+    version identifies the inputs, so callers can keep a skeleton until
+    the config changes.
+    """
+
+    def __init__(self, folders: List[str], yaml_template: str, readme_template: Optional[str], version: str):
+        self.folders = folders
+        self.yaml_template = yaml_template
+        self.readme_template = readme_template
+        self.version = version
+
+    @staticmethod
+    def version_of(project_structure: Dict[str, Any], yaml_template: str,
+                   readme_template: Optional[str]) -> str:
+        data = json.dumps([project_structure, yaml_template, readme_template], sort_keys=True, default=str)
+        return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+    @classmethod
+    def compile(cls, project_structure: Dict[str, Any], yaml_template: str,
+                readme_template: Optional[str]) -> 'ProjectSkeleton':
+        """yaml_template holds FORGE_* placeholders; readme_template is a str.format template"""
+        return cls(compile_structure(project_structure), yaml_template, readme_template,
+                   cls.version_of(project_structure, yaml_template, readme_template))
+
+    def render(self, name: str, status: str, description: str = '',
+               tags: Iterable[str] = (), date: str = None) -> Tuple[str, Optional[str]]:
+        """project.yaml and README.md (None if disabled) text for one project
+
+        Placeholders are replaced with JSON strings and lists, which YAML
+        reads back as the same values.
+        """
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        values = {'NAME': name, 'STATUS': status, 'DATE': date, 'DESCRIPTION': description,
+                  'TAGS': list(tags)}
+        project_yaml = YAML_PLACEHOLDER.sub(lambda m: json.dumps(values[m.group(1)]), self.yaml_template)
+        readme = None
+        if self.readme_template is not None:
+            readme = self.readme_template.format(project_name=name, date=date, status=status)
+        return project_yaml, readme
+
+    def materialize(self, project_path: str, name: str, status: str, description: str = '',
+                    tags: Iterable[str] = (), date: str = None) -> Tuple[int, List[str]]:
+        """Create a project's folders and metadata files
+
+        Existing project.yaml and README.md files are kept. Returns the
+        number of new folders and the names of the files written.
+        """
+        created = make_folders(project_path, self.folders)
+        project_yaml, readme = self.render(name, status, description, tags, date)
+        return created, self.write_metadata(project_path, project_yaml, readme)
+
+    @staticmethod
+    def write_metadata(project_path: str, project_yaml: Optional[str], readme: Optional[str]) -> List[str]:
+        """Write rendered metadata files that do not exist yet, return their names"""
+        written = []
+        for file_name, content in (('project.yaml', project_yaml), ('README.md', readme)):
+            if content is None:
+                continue
+            try:
+                with open(os.path.join(project_path, file_name), 'x') as f:
+                    f.write(content)
+                written.append(file_name)
+            except FileExistsError:
+                pass
+        return written
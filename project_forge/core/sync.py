@@ -0,0 +1,141 @@
+# project_forge/core/sync.py
+import os
+import shutil
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Iterable, List, Tuple
+
+from .copier import FileCopier
+from .snapshot import DIRECTORY, FILE, LINKED_DIR
+
+# (name, kind, size, mtime_ns) of the entries of one directory
+Listing = List[Tuple[str, int, int, int]]
+
+# Kind of a symlink to a file (or a broken one) in a listing;
+# snapshots count those as files
+LINKED_FILE = 3
+
+
+class TreeSync:
+    """rsync-style mirror of one folder into another
+
+    Files are copied only when missing from the target or different in
+    size or mtime (the copier preserves mtimes, so an unchanged file
+    compares equal on the next run). Target entries no longer in the
+    source are kept unless delete is on. Paths matching an exclude
+    pattern ('/'-separated, relative to the source folder, fnmatch
+    syntax) are neither copied nor removed. Symlinks in a source listed
+    from disk are recreated rather than followed.
+    """
+
+    def __init__(self, copier: FileCopier, exclude: Iterable[str] = (), delete: bool = False):
+        self.copier = copier
+        self.exclude = [pattern.strip('/') for pattern in exclude]
+        self.delete = delete
+
+    def is_excluded(self, relative_path: str) -> bool:
+        if not self.exclude:
+            return False
+        path = relative_path.replace(os.sep, '/')
+        return any(fnmatchcase(path, pattern) for pattern in self.exclude)
+
+    def sync_file(self, source: str, target: str) -> bool:
+        """Copy one file unless the target matches it, return whether it copied"""
+        st = os.stat(source)
+        try:
+            current = os.stat(target)
+            if (current.st_size, current.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+                return False
+        except FileNotFoundError:
+            pass
+        self.copier.copy(source, target)
+        return True
+
+    def run(self, source_dir: str, target_dir: str, prefix: str = '') -> Counter:
+        """Mirror source_dir into target_dir, return counts per outcome
+
+        Both sides are listed from disk: a snapshot leaves out ignored
+        files and does not tell file symlinks apart. prefix is
+        source_dir's own path relative to where the exclude patterns are
+        rooted.
+        """
+        stats = Counter()
+        stack = ['']
+        while stack:
+            relative_dir = stack.pop()
+            source = os.path.join(source_dir, relative_dir)
+            target = os.path.join(target_dir, relative_dir)
+            entries = self.list_dir(source)
+            existing = {name: (kind, size, mtime_ns) for name, kind, size, mtime_ns in self.list_dir(target)}
+            os.makedirs(target, exist_ok=True)
+
+            seen = set()
+            for name, kind, size, mtime_ns in entries:
+                seen.add(name)
+                relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                if self.is_excluded(os.path.join(prefix, relative_path)):
+                    stats['excluded'] += 1
+                    continue
+
+                source_item = os.path.join(source, name)
+                target_item = os.path.join(target, name)
+                current = existing.get(name)
+
+                if kind == DIRECTORY:
+                    if current and current[0] != DIRECTORY:
+                        self._remove(target_item)
+                    stack.append(relative_path)
+                elif kind in (LINKED_DIR, LINKED_FILE):
+                    link = os.readlink(source_item)
+                    if current and (current[0] != kind or os.readlink(target_item) != link):
+                        self._remove(target_item)
+                        current = None
+                    if not current:
+                        os.symlink(link, target_item)
+                        stats['copied'] += 1
+                    else:
+                        stats['unchanged'] += 1
+                elif current == (FILE, size, mtime_ns):
+                    stats['unchanged'] += 1
+                else:
+                    if current and current[0] != FILE:
+                        self._remove(target_item)
+                    self.copier.copy(source_item, target_item)
+                    stats['copied'] += 1
+
+            if self.delete:
+                for name in existing.keys() - seen:
+                    relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                    if not self.is_excluded(os.path.join(prefix, relative_path)):
+                        self._remove(os.path.join(target, name))
+                        stats['removed'] += 1
+        return stats
+
+    @staticmethod
+    def list_dir(path: str) -> Listing:
+        """Listing of one directory from disk (empty if it doesn't exist)"""
+        listing = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            kind = LINKED_DIR if entry.is_symlink() else DIRECTORY
+                            listing.append((entry.name, kind, 0, 0))
+                        elif entry.is_symlink():
+                            listing.append((entry.name, LINKED_FILE, 0, 0))
+                        else:
+                            st = entry.stat()
+                            listing.append((entry.name, FILE, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        listing.append((entry.name, FILE, -1, -1))
+        except FileNotFoundError:
+            pass
+        return listing
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.unlink(path)
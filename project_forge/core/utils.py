@@ -1,8 +1,12 @@
 # project_forge/core/utils.py
 import os
 import re
+import tempfile
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Device -> whether its filesystem folds case, probed once per process
+_device_folds: Dict[int, bool] = {}
 
 class PathUtils:
     """Utility functions for path handling"""
@@ -24,15 +28,11 @@ class PathUtils:
         return clean.strip('_')
 
     @staticmethod
-    def ensure_unique_path(path: str) -> str:
+    def ensure_unique_path(path: str, registry: 'NameRegistry' = None) -> str:
         """Ensure path is unique by adding counter if needed"""
-        counter = 1
-        original = path
-        while os.path.exists(path):
-            base, ext = os.path.splitext(original)
-            path = f"{base}_{counter}{ext}"
-            counter += 1
-        return path
+        registry = registry or NameRegistry()
+        directory, name = os.path.split(path)
+        return os.path.join(directory, registry.claim(directory, name))
 
     @staticmethod
     def split_path_components(path: str) -> Tuple[str, str, str]:
@@ -41,3 +41,117 @@ class PathUtils:
         name = os.path.basename(path)
         base, ext = os.path.splitext(name)
         return directory, base, ext
+
+
+class NameRegistry:
+    """Hand out unique names per directory without stat-ing every attempt
+
+    Each directory is listed once, the first time it is used; after that,
+    taken names (on disk or claimed earlier in the same run) are tracked in
+    memory and the next free "_N" suffix for a name is remembered, so
+    claiming N copies of the same name costs O(N) total instead of O(N^2)
+    stat calls.
+
+    Names only collide regardless of case where the filesystem says so
+    (Windows drives mounted in WSL, macOS): unless case_sensitive is
+    given, each filesystem is probed once per process, at the nearest
+    existing folder, and the result is shared by every registry.
+    """
+
+    def __init__(self, case_sensitive: Optional[bool] = None):
+        self.case_sensitive = case_sensitive
+        self._taken: Dict[str, Set[str]] = {}
+        self._folds: Dict[str, bool] = {}
+        self._next_counter: Dict[Tuple[str, str], int] = {}
+
+    def _names(self, directory: str) -> Set[str]:
+        names = self._taken.get(directory)
+        if names is None:
+            try:
+                names = {self._key(directory, name) for name in os.listdir(directory)}
+            except OSError:
+                names = set()
+            self._taken[directory] = names
+        return names
+
+    def _key(self, directory: str, name: str) -> str:
+        """name as the filesystem of directory compares it"""
+        folds = self._folds.get(directory)
+        if folds is None:
+            folds = self._folds[directory] = self._probe(directory)
+        return name.casefold() if folds else name
+
+    def _probe(self, directory: str) -> bool:
+        if self.case_sensitive is not None:
+            return not self.case_sensitive
+        existing = directory
+        while not os.path.isdir(existing):
+            parent = os.path.dirname(existing)
+            if parent == existing:
+                return True
+            existing = parent
+        device = os.stat(existing).st_dev
+        if device not in _device_folds:
+            _device_folds[device] = is_case_insensitive(existing)
+        return _device_folds[device]
+
+    @staticmethod
+    def _variant(name: str, counter: int, split_ext: bool) -> str:
+        base, ext = os.path.splitext(name) if split_ext else (name, '')
+        return f"{base}_{counter}{ext}"
+
+    def is_taken(self, directory: str, name: str) -> bool:
+        """Check if a name exists in directory or was claimed this run"""
+        return self._key(directory, name) in self._names(directory)
+
+    def reserve(self, directory: str, name: str) -> None:
+        """Mark a name as taken without checking it"""
+        self._names(directory).add(self._key(directory, name))
+
+    def iter_taken(self, directory: str, name: str, split_ext: bool = True) -> Iterator[str]:
+        """Yield name and its suffixed variants for as long as they are taken"""
+        candidate, counter = name, 1
+        while self.is_taken(directory, candidate):
+            yield candidate
+            candidate = self._variant(name, counter, split_ext)
+            counter += 1
+
+    def claim(self, directory: str, name: str, split_ext: bool = True) -> str:
+        """Reserve and return name, or the first free name_N variant of it"""
+        names = self._names(directory)
+        folded = self._key(directory, name)
+        if folded not in names:
+            names.add(folded)
+            return name
+
+        key = (directory, folded)
+        counter = self._next_counter.get(key, 1)
+        candidate = self._variant(name, counter, split_ext)
+        while self._key(directory, candidate) in names:
+            counter += 1
+            candidate = self._variant(name, counter, split_ext)
+        names.add(self._key(directory, candidate))
+        self._next_counter[key] = counter + 1
+        return candidate
+
+
+def is_case_insensitive(directory: str) -> bool:
+    """Whether names in an existing folder match regardless of case
+
+    Creates a short-lived probe file; a folder that cannot be written to
+    is assumed to be case-insensitive, which only costs extra suffixes.
+    """
+    try:
+        with tempfile.NamedTemporaryFile(prefix='.forge_Case_', dir=directory) as probe:
+            return os.path.exists(os.path.join(directory, os.path.basename(probe.name).swapcase()))
+    except OSError:
+        return True
+
+
+def format_size(num_bytes: float) -> str:
+    """Format a byte count for humans (e.g. '12.3 MB')"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
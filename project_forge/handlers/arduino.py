@@ -0,0 +1,185 @@
+# project_forge/handlers/arduino.py
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# Files whose #include lines are followed
+SOURCE_EXTENSIONS = ('.ino', '.pde', '.c', '.cc', '.cpp', '.cxx', '.h', '.hh', '.hpp', '.S')
+
+# Library folders that never take part in a build
+SKIPPED_LIBRARY_DIRS = {'examples', 'extras', 'test', 'tests', 'docs'}
+
+INCLUDE_REGEX = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*[<"]([^>"\r\n]+)[>"]', re.MULTILINE)
+
+CACHE_VERSION = 1
+# Default include cache, kept in the workspace root
+CACHE_NAME = '.forge_arduino_libraries.json'
+
+
+class ArduinoLibrary:
+    """One folder of a libraries/ directory"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.folder = os.path.basename(path)
+        self.properties = self._read_properties(os.path.join(path, 'library.properties'))
+        self.name = self.properties.get('name', self.folder)
+        # 1.5 format libraries keep their code in src/, legacy ones at the top
+        src = os.path.join(path, 'src')
+        self.source_root = src if self.properties and os.path.isdir(src) else path
+
+    @property
+    def version(self) -> str:
+        """library.properties version, or the folder mtime for legacy libraries"""
+        if 'version' in self.properties:
+            return self.properties['version']
+        return f"mtime:{os.stat(self.path).st_mtime_ns}"
+
+    @property
+    def depends(self) -> List[str]:
+        """Library names from the depends= field (version constraints dropped)"""
+        names = []
+        for item in self.properties.get('depends', '').split(','):
+            name = item.split('(')[0].strip()
+            if name:
+                names.append(name)
+        return names
+
+    def headers(self) -> List[str]:
+        """Headers a sketch can include to use this library"""
+        try:
+            with os.scandir(self.source_root) as entries:
+                return [e.name for e in entries if e.name.endswith(('.h', '.hh', '.hpp')) and e.is_file()]
+        except OSError:
+            return []
+
+    def source_files(self) -> Iterable[str]:
+        """Every file of the library that may contain #include lines"""
+        for root, dirs, files in os.walk(self.path):
+            if root == self.path:
+                dirs[:] = [d for d in dirs if d not in SKIPPED_LIBRARY_DIRS and not d.startswith('.')]
+            for name in files:
+                if name.endswith(SOURCE_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+    @staticmethod
+    def _read_properties(path: str) -> Dict[str, str]:
+        properties = {}
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    key, sep, value = line.partition('=')
+                    if sep and not key.startswith('#'):
+                        properties[key.strip()] = value.strip()
+        except OSError:
+            pass
+        return properties
+
+
+def parse_includes(paths: Iterable[str]) -> Set[str]:
+    """Header names included by any of the files"""
+    includes = set()
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        for match in INCLUDE_REGEX.finditer(data):
+            includes.add(match.group(1).decode('utf-8', 'replace').strip())
+    return includes
+
+
+class LibraryResolver:
+    """Find the libraries a sketch actually uses
+
+    Libraries are looked up in the given libraries/ folders (earlier ones
+    win, as in the Arduino IDE) by the headers they provide. Starting from
+    the sketch's #include lines, the resolver follows each used library's
+    own includes and depends= entries until the set is closed. The includes
+    found in a library are cached per library version in cache_path, so a
+    library is only parsed again when its version changes.
+    """
+
+    def __init__(self, library_dirs: Iterable[str], cache_path: Optional[str] = None):
+        self.libraries: Dict[str, ArduinoLibrary] = {}
+        self._by_header: Dict[str, ArduinoLibrary] = {}
+        for library_dir in library_dirs:
+            self._index(library_dir)
+        self.cache_path = cache_path
+        self._cache = self._load_cache()
+        self._cache_dirty = False
+
+    def _index(self, library_dir: str) -> None:
+        try:
+            entries = sorted(e.path for e in os.scandir(library_dir) if e.is_dir() and not e.name.startswith('.'))
+        except OSError:
+            return
+        for path in entries:
+            library = ArduinoLibrary(path)
+            if library.name in self.libraries:
+                continue
+            self.libraries[library.name] = library
+            for header in library.headers():
+                self._by_header.setdefault(header, library)
+
+    def resolve(self, sketch_files: Iterable[str]) -> List[ArduinoLibrary]:
+        """Libraries needed by the sketch, in discovery order"""
+        used: Dict[str, ArduinoLibrary] = {}
+        pending = [self._lookup(header) for header in sorted(parse_includes(sketch_files))]
+
+        while pending:
+            library = pending.pop(0)
+            if library is None or library.name in used:
+                continue
+            used[library.name] = library
+            for header in self._library_includes(library):
+                pending.append(self._lookup(header))
+            pending.extend(self.libraries.get(name) for name in library.depends)
+
+        self._save_cache()
+        return list(used.values())
+
+    def _lookup(self, header: str) -> Optional[ArduinoLibrary]:
+        library = self._by_header.get(header)
+        if library is None and '/' in header:
+            # <Lib/sub.h> style includes name the library folder
+            library = self._by_header.get(header.split('/')[0] + '.h')
+        return library
+
+    def _library_includes(self, library: ArduinoLibrary) -> List[str]:
+        key = os.path.abspath(library.path)
+        version = library.version
+        cached = self._cache.get(key)
+        if cached and cached.get('version') == version:
+            return cached['includes']
+        includes = sorted(parse_includes(library.source_files()))
+        self._cache[key] = {'version': version, 'includes': includes}
+        self._cache_dirty = True
+        return includes
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data.get('libraries', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_cache(self) -> None:
+        if not (self.cache_path and self._cache_dirty):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = self.cache_path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'libraries': self._cache}, f, separators=(',', ':'))
+            os.replace(temp_path, self.cache_path)
+            self._cache_dirty = False
+        except OSError:
+            pass
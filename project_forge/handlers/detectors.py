@@ -0,0 +1,211 @@
+# project_forge/handlers/detectors.py
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.scanner import DirectoryScanner
+from ..core.snapshot import ScanSnapshot
+
+
+class ProjectDetector:
+    """Marker rules and preserved layout for one kind of software project
+
+    root_files only count directly in the source folder; files (exact
+    names), suffixes and directories count at any depth. When several
+    detectors match, the highest priority wins. special_dirs and
+    special_files (relative to the source) are copied as-is into
+    destination by SoftwareHandler.copy_project, along with every root
+    file ending in one of special_suffixes.
+
+    A detector that is not exclusive (CAD and PCB design files) only
+    sets the project type when no exclusive one matches; otherwise its
+    files are preserved next to the winning type's layout.
+    """
+
+    def __init__(self, name: str, priority: int, root_files: Sequence[str] = (),
+                 files: Sequence[str] = (), suffixes: Sequence[str] = (),
+                 directories: Sequence[str] = (), special_dirs: Sequence[str] = (),
+                 special_files: Sequence[str] = (), special_suffixes: Sequence[str] = (),
+                 destination: str = 'software', exclusive: bool = True):
+        self.name = name
+        self.priority = priority
+        self.root_files = tuple(root_files)
+        self.files = tuple(files)
+        self.suffixes = tuple(suffixes)
+        self.directories = tuple(directories)
+        self.special_dirs = list(special_dirs)
+        self.special_files = list(special_files)
+        self.special_suffixes = tuple(special_suffixes)
+        self.destination = destination
+        self.exclusive = exclusive
+
+    @property
+    def root_only(self) -> bool:
+        """True if nothing below the source folder can match"""
+        return not (self.files or self.suffixes or self.directories)
+
+    def __repr__(self) -> str:
+        return f"ProjectDetector({self.name!r}, priority={self.priority})"
+
+
+# Built-in project types, most specific first
+BUILTIN_DETECTORS = [
+    ProjectDetector(
+        'platformio', 100,
+        root_files=['platformio.ini'],
+        special_dirs=['.pio', '.vscode', 'include', 'lib', 'src', 'test', 'boards', 'scripts', 'data'],
+        special_files=['platformio.ini', '.gitignore', 'README.md', 'library.json', 'library.properties']),
+    ProjectDetector(
+        'esp-idf', 90,
+        root_files=['sdkconfig', 'sdkconfig.defaults'],
+        special_dirs=['main', 'components', 'include', 'test', 'build', '.vscode'],
+        special_files=['CMakeLists.txt', 'sdkconfig', 'sdkconfig.defaults', 'partitions.csv',
+                       'idf_component.yml', 'dependencies.lock', '.gitignore', 'README.md']),
+    ProjectDetector(
+        'zephyr', 85,
+        root_files=['prj.conf'],
+        files=['west.yml'],
+        special_dirs=['src', 'include', 'boards', 'dts', 'tests', 'build', '.vscode'],
+        special_files=['CMakeLists.txt', 'prj.conf', 'west.yml', 'Kconfig', 'sample.yaml',
+                       '.gitignore', 'README.md']),
+    ProjectDetector(
+        'arduino', 80,
+        suffixes=['.ino'],
+        special_dirs=['libraries', '.vscode', 'build', 'data'],
+        special_files=['arduino.json', 'c_cpp_properties.json', '.gitignore', 'README.md']),
+    ProjectDetector(
+        'cmake', 50,
+        root_files=['CMakeLists.txt'],
+        special_dirs=['src', 'include', 'lib', 'test', 'tests', 'cmake', 'docs', 'build', '.vscode'],
+        special_files=['CMakeLists.txt', 'CMakePresets.json', 'Makefile', 'README.md', '.gitignore']),
+    ProjectDetector(
+        'kicad', 40,
+        suffixes=['.kicad_pro', '.kicad_pcb', '.kicad_sch'],
+        special_dirs=['libraries', 'footprints', 'symbols', '3dmodels'],
+        special_files=['fp-lib-table', 'sym-lib-table'],
+        special_suffixes=['.kicad_pro', '.kicad_pcb', '.kicad_sch', '.kicad_prl', '.kicad_dru'],
+        destination='hardware/pcb/design', exclusive=False),
+    ProjectDetector(
+        'freecad', 30,
+        suffixes=['.FCStd'],
+        special_suffixes=['.FCStd', '.FCMacro'],
+        destination='cad/models/source', exclusive=False),
+]
+
+# Preserved layout for projects found only through software_project_markers
+GENERAL_SPECIAL_DIRS = ['src', 'include', 'lib', 'test', 'docs', 'build', '.vscode']
+GENERAL_SPECIAL_FILES = ['CMakeLists.txt', 'Makefile', 'README.md', '.gitignore']
+
+
+class DetectorRegistry:
+    """Project detectors evaluated together over a single scan of the source"""
+
+    def __init__(self, detectors: Iterable[ProjectDetector] = ()):
+        self._detectors: Dict[str, ProjectDetector] = {}
+        for detector in detectors:
+            self.register(detector)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'DetectorRegistry':
+        """Built-in detectors plus a 'general' one from software_project_markers"""
+        markers = config.get('software_project_markers', {})
+        general = ProjectDetector('general', 0,
+                                  suffixes=markers.get('files', []),
+                                  directories=markers.get('directories', []),
+                                  special_dirs=GENERAL_SPECIAL_DIRS,
+                                  special_files=GENERAL_SPECIAL_FILES)
+        return cls(BUILTIN_DETECTORS + [general])
+
+    def register(self, detector: ProjectDetector) -> None:
+        """Add a detector, replacing any registered under the same name"""
+        self._detectors[detector.name] = detector
+        self._build_index()
+
+    def get(self, name: str) -> Optional[ProjectDetector]:
+        return self._detectors.get(name)
+
+    def __iter__(self):
+        return iter(sorted(self._detectors.values(), key=lambda d: -d.priority))
+
+    def _build_index(self) -> None:
+        """Map marker names and suffixes to the detectors that want them"""
+        self._root_names: Dict[str, List[ProjectDetector]] = {}
+        self._file_names: Dict[str, List[ProjectDetector]] = {}
+        self._dir_names: Dict[str, List[ProjectDetector]] = {}
+        self._suffixes: List[Tuple[str, ProjectDetector]] = []
+        for detector in self._detectors.values():
+            for name in detector.root_files:
+                self._root_names.setdefault(name, []).append(detector)
+            for name in detector.files:
+                self._file_names.setdefault(name, []).append(detector)
+            for name in detector.directories:
+                self._dir_names.setdefault(name, []).append(detector)
+            for suffix in detector.suffixes:
+                self._suffixes.append((suffix, detector))
+        self._suffix_tuple = tuple(suffix for suffix, _ in self._suffixes)
+        # Only exclusive matches end the scan early
+        exclusive = [d for d in self._detectors.values() if d.exclusive]
+        self._top_priority = max((d.priority for d in exclusive), default=0)
+        self._deep_priority = max((d.priority for d in exclusive if not d.root_only), default=0)
+
+    def detect(self, scanner: DirectoryScanner, source_path: str,
+               max_depth: Optional[int] = None) -> Dict[str, str]:
+        """Run every detector over one walk of source_path"""
+        return self.detect_entries(
+            (entry.name, relative_path, self._is_dir(entry))
+            for entry, relative_path in scanner.scan(source_path, include_dirs=True, max_depth=max_depth))
+
+    def detect_snapshot(self, snapshot: ScanSnapshot, max_depth: Optional[int] = None) -> Dict[str, str]:
+        """Run every detector over an existing scan"""
+        return self.detect_entries((entry.name, entry.relative_path, entry.is_dir)
+                                   for entry in snapshot.walk(max_depth))
+
+    def detect_entries(self, entries: Iterable[Tuple[str, str, bool]]) -> Dict[str, str]:
+        """Match (name, relative_path, is_dir) entries given in scan order
+
+        Returns {detector name: relative path of its first marker}. Entries
+        stop being consumed as soon as no exclusive detector that could
+        still match outranks the best exclusive match so far.
+        """
+        matches: Dict[str, str] = {}
+        best = -1
+
+        for name, relative_path, is_dir in entries:
+            at_root = os.sep not in relative_path
+            if not at_root and best >= self._deep_priority:
+                break
+
+            if is_dir:
+                candidates = self._dir_names.get(name, [])
+            else:
+                candidates = list(self._file_names.get(name, []))
+                if at_root:
+                    candidates += self._root_names.get(name, [])
+                if self._suffix_tuple and name.endswith(self._suffix_tuple):
+                    candidates += [d for suffix, d in self._suffixes if name.endswith(suffix)]
+
+            for detector in candidates:
+                if detector.name not in matches:
+                    matches[detector.name] = relative_path
+                    if detector.exclusive:
+                        best = max(best, detector.priority)
+
+            if best >= self._top_priority:
+                break
+
+        return matches
+
+    @staticmethod
+    def _is_dir(entry: os.DirEntry) -> bool:
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
+
+    def best_match(self, matches: Dict[str, str]) -> Optional[ProjectDetector]:
+        """Highest priority detector among matches, exclusive ones first"""
+        found = [self._detectors[name] for name in matches if name in self._detectors]
+        return max(found, key=lambda d: (d.exclusive, d.priority)) if found else None
+
+    def companions(self, matches: Dict[str, str], primary: ProjectDetector) -> List[ProjectDetector]:
+        """Matched detectors that are not exclusive, apart from primary"""
+        return [d for d in self if d.name in matches and not d.exclusive and d is not primary]
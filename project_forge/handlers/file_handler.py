@@ -2,8 +2,45 @@ import os
 import re
 import shutil
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
-from ..cli.colors import Colors
+from typing import Dict, Iterable, Iterator, List, Tuple, Set, Optional, Pattern
+from ..cli.reporter import Reporter
+from ..core.copier import CopyResult, FileCopier
+from ..core.dedup import ContentIndex
+from ..core.manifest import SourceManifest
+from ..core.plan import REPLACE_REASON, RESULT_STATUS, OrganizePlan, OrganizeResult, PlanEntry, PlanExecutor
+from ..core.scanner import DirectoryScanner
+from ..core.snapshot import ScanSnapshot
+from ..core.utils import NameRegistry, format_size
+
+# Destination folders for nested file categories. A string maps every
+# subcategory to the same folder, a dict maps individual subcategories.
+NESTED_CATEGORY_DESTINATIONS = {
+    'code': {
+        'programming': 'software/src'
+    },
+    'documents': {
+        'notes': '_docs/notes',
+        'office_docs': '_docs/references',
+        'technical': '_docs/datasheets'
+    },
+    'images': '_docs/images',
+    'data': {
+        'structured': '_docs/data',
+        'tabular': '_docs/data',
+        'database': 'software/db'
+    },
+    'media': '_docs/media',
+    'design': {
+        'cad': 'cad/models',
+        'design_tools': '_docs/design'
+    }
+}
+
+# Destination folders for flat (list-valued) file categories
+FLAT_CATEGORY_DESTINATIONS = {
+    'archives': 'builds',
+    'config': 'software/config'
+}
 
 class FileHandler:
     """Handler for file organization and management"""
@@ -13,119 +50,321 @@ class FileHandler:
         self.file_categories = config.get('file_categories', {})
         self.naming_patterns = config.get('naming_patterns', {})
         self.ignore_patterns = config.get('ignore_patterns', [])
+        self.preserved_structure = config.get('preserved_software_structure', [])
+
+        # Compile the category tree once instead of walking it per file; origins
+        # name the config category of each extension, for plan reasons
+        self._extension_index, self._extension_origins = self._build_extension_index()
+        self._multi_suffix_regex = self._build_multi_suffix_regex()
+
+        # Ignored and preserved software directories are pruned, not walked
+        self.scanner = DirectoryScanner(self.ignore_patterns, self.preserved_structure)
+        self.reporter = Reporter()
+
+    def organize_files(self, source_path: str, target_path: str, naming_pattern: str = None,
+                       copier: FileCopier = None, dedup: bool = None, incremental: bool = None,
+                       snapshot: ScanSnapshot = None,
+                       exclude: Iterable[str] = ()) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """Organize files from source to target
+
+        With dedup enabled, a file whose name collides with an identical
+        file is not copied again; it is reported as organized to the
+        existing copy instead of getting a numbered suffix. With
+        incremental enabled, files recorded in the target's source manifest
+        are only copied again if they changed since the last run.
+
+        snapshot reuses an existing scan of source_path; exclude lists
+        relative files or folders that are copied some other way.
+        """
+        content_index, manifest = self._run_state(source_path, target_path, dedup, incremental)
+        entries = self._classify_files(source_path, target_path, naming_pattern, content_index, manifest,
+                                       snapshot, exclude)
+        return self.execute_plan(entries, source_path, copier, content_index=content_index,
+                                 manifest=manifest)
+
+    def iter_organize(self, source_path: str, target_path: str, naming_pattern: str = None,
+                      copier: FileCopier = None, dedup: bool = None,
+                      incremental: bool = None) -> Iterator[OrganizeResult]:
+        """Organize files from source to target, yielding a result per file
+
+        Nothing is printed and no result list is kept; memory still grows
+        with the number of files, since the incremental manifest, the
+        names taken and the claimed targets hold an entry for each.
+        Results arrive in scan order.
+        """
+        content_index, manifest = self._run_state(source_path, target_path, dedup, incremental)
+        entries = self._classify_files(source_path, target_path, naming_pattern, content_index, manifest)
+        return self.iter_execute(entries, source_path, copier, manifest=manifest)
+
+    def plan_files(self, source_path: str, target_path: str, naming_pattern: str = None,
+                   dedup: bool = None, incremental: bool = None, snapshot: ScanSnapshot = None,
+                   exclude: Iterable[str] = ()) -> OrganizePlan:
+        """Decide where every file goes without touching the target"""
+        content_index, manifest = self._run_state(source_path, target_path, dedup, incremental)
+        entries = list(self._classify_files(source_path, target_path, naming_pattern,
+                                            content_index, manifest, snapshot, exclude))
+        return OrganizePlan(source_path, target_path, entries,
+                            {'naming_pattern': naming_pattern, 'dedup': content_index is not None,
+                             'incremental': manifest is not None})
+
+    def iter_execute(self, entries: Iterable[PlanEntry], source_path: str, copier: FileCopier = None,
+                     target_dirs: Iterable[str] = None,
+                     manifest: SourceManifest = None) -> Iterator[OrganizeResult]:
+        """Carry out planned entries, yielding a result per entry"""
+        copier = copier or FileCopier.from_config(self.config)
+        executor = PlanExecutor.from_config(self.config, copier)
+        prefix_length = len(os.path.join(source_path, ''))
+
+        def record(result: CopyResult) -> None:
+            entry = result.job
+            if manifest and result.error is None and entry.action != 'skip':
+                manifest.record(entry.source[prefix_length:], entry.size, entry.mtime_ns, entry.inode,
+                                entry.target, entry.action)
 
-    def organize_files(self, source_path: str, target_path: str, naming_pattern: str = None) -> Tuple[List[Tuple[str, str]], List[str]]:
-        """Organize files from source to target"""
+        # Copies that finished after an interruption are recorded too
+        results = executor.execute(entries, target_dirs, on_stop=record)
+        complete = False
+        try:
+            for result in results:
+                entry = result.job
+                relative_path = entry.source[prefix_length:]
+                if result.error is not None:
+                    yield OrganizeResult(relative_path, entry.source, None, 'failed', entry.size, str(result.error))
+                    continue
+
+                record(result)
+                yield OrganizeResult(relative_path, entry.source, entry.target, RESULT_STATUS[entry.action],
+                                     entry.size)
+            complete = True
+        finally:
+            # Also keeps the progress of an interrupted run
+            results.close()
+            if manifest:
+                manifest.save(complete)
+
+    def execute_plan(self, entries: Iterable[PlanEntry], source_path: str, copier: FileCopier = None,
+                     target_dirs: Iterable[str] = None, content_index: ContentIndex = None,
+                     manifest: SourceManifest = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """Carry out planned entries and print the organization summary"""
         organized_files = []
         skipped_files = []
+        copier = copier or FileCopier.from_config(self.config)
+        duplicates = 0
+        bytes_saved = 0
+        unchanged = 0
         
         try:
-            for root, _, files in os.walk(source_path):
-                for file in files:
-                    if self._should_ignore(file):
-                        continue
-                        
-                    source_file = os.path.join(root, file)
-                    relative_path = os.path.relpath(source_file, source_path)
-                    
-                    # Skip files that are part of the software structure
-                    if any(part in self.config.get('preserved_software_structure', []) 
-                          for part in Path(relative_path).parts):
-                        continue
-                    
-                    ext = os.path.splitext(file)[1].lower()
-                    category = self._get_file_category(file)
-                    
-                    if category:
-                        target_dir = os.path.join(target_path, category)
-                        os.makedirs(target_dir, exist_ok=True)
-                        
-                        # Generate new filename if pattern specified
-                        if naming_pattern:
-                            base_name = os.path.splitext(file)[0]
-                            new_name = self._generate_new_filename(base_name, naming_pattern) + ext
-                        else:
-                            new_name = file
-                            
-                        target_file = os.path.join(target_dir, new_name)
-                        
-                        # Handle duplicates
-                        counter = 1
-                        while os.path.exists(target_file):
-                            base, ext = os.path.splitext(new_name)
-                            target_file = os.path.join(target_dir, f"{base}_{counter}{ext}")
-                            counter += 1
-                        
-                        try:
-                            shutil.copy2(source_file, target_file)
-                            organized_files.append((source_file, target_file))
-                            print(Colors.success(f"Organized: {relative_path}"))
-                        except Exception as e:
-                            print(Colors.error(f"Error copying {relative_path}: {e}"))
-                            skipped_files.append(source_file)
-                    else:
-                        skipped_files.append(source_file)
-        
+            for result in self.iter_execute(entries, source_path, copier, target_dirs, manifest):
+                if result.status == 'skipped':
+                    skipped_files.append(result.source)
+                elif result.status == 'unchanged':
+                    unchanged += 1
+                elif result.status == 'duplicate':
+                    organized_files.append((result.source, result.target))
+                    duplicates += 1
+                    bytes_saved += result.size
+                    self.reporter.item('info', f"Duplicate: {result.relative_path} -> {os.path.basename(result.target)}",
+                                       result=result.to_dict())
+                elif result.status == 'copied':
+                    organized_files.append((result.source, result.target))
+                    self.reporter.item('success', f"Organized: {result.relative_path}", result=result.to_dict())
+                else:
+                    self.reporter.item('error', f"Error copying {result.relative_path}: {result.error}",
+                                       result=result.to_dict())
+                    skipped_files.append(result.source)
+    
         except Exception as e:
-            print(Colors.error(f"Error in organization: {e}"))
+            self.reporter.note('error', f"Error in organization: {e}")
             return [], []
 
         # Print summary
-        print(Colors.header("\nOrganization Summary:"))
-        print(Colors.success(f"Files organized: {len(organized_files)}"))
-        print(Colors.warning(f"Files skipped: {len(skipped_files)}"))
+        self.reporter.note('header', "\nOrganization Summary:")
+        self.reporter.note('success', f"Files organized: {len(organized_files)}")
+        self.reporter.note('warning', f"Files skipped: {len(skipped_files)}")
+        if manifest:
+            self.reporter.note('info', f"Unchanged since last run: {unchanged}")
+        if duplicates or content_index:
+            self.reporter.note('info', f"Duplicates not copied: {duplicates} ({format_size(bytes_saved)} saved)")
+        self.reporter.note('info', f"Copy strategy: {copier.summary()}")
 
         return organized_files, skipped_files
 
+    def _run_state(self, source_path: str, target_path: str, dedup: bool = None,
+                   incremental: bool = None) -> Tuple[Optional[ContentIndex], Optional[SourceManifest]]:
+        """Dedup index and source manifest for a run, per the options or config"""
+        settings = self.config.get('organize', {})
+        if dedup is None:
+            dedup = settings.get('dedup', False)
+        if incremental is None:
+            incremental = settings.get('incremental', True)
+        content_index = ContentIndex() if dedup else None
+        manifest = SourceManifest.load(target_path, source_path) if incremental else None
+        return content_index, manifest
+
+    def _classify_files(self, source_path: str, target_path: str, naming_pattern: str = None,
+                        content_index: ContentIndex = None, manifest: SourceManifest = None,
+                        snapshot: ScanSnapshot = None, exclude: Iterable[str] = ()) -> Iterator[PlanEntry]:
+        """Yield a plan entry for every source file, without writing anything"""
+        names = NameRegistry(self.config.get('organize', {}).get('case_sensitive_names'))
+        # Targets handed out this run -> (source file, size) of their content
+        claimed_targets = {}
+        # Targets that files of this run are duplicates of
+        shared_targets = set()
+
+        for relative_path, file, size, mtime_ns, inode in self._source_files(source_path, snapshot, exclude):
+            source_file = os.path.join(source_path, relative_path)
+
+            # Files named like a preserved software folder stay with it
+            if file in self.preserved_structure:
+                continue
+
+            # Files copied by an earlier run are skipped if they haven't changed
+            # and their copy is still there
+            previous_target = manifest.previous_target(relative_path) if manifest else None
+            if previous_target and manifest.is_unchanged(relative_path, size, mtime_ns, inode) \
+                    and names.is_taken(*os.path.split(previous_target)):
+                yield PlanEntry(source_file, previous_target, size, 'unchanged',
+                                "unchanged since last run", mtime_ns, inode)
+                continue
+
+            matched_ext = self._match_extension(file)
+            category = self._extension_index.get(matched_ext)
+            
+            if not category:
+                ext = os.path.splitext(file)[1].lower()
+                yield PlanEntry(source_file, None, size, 'skip', f"no category for '{ext}'", mtime_ns, inode)
+                continue
+
+            reason = f"'{matched_ext}' is {self._extension_origins[matched_ext]}"
+            target_dir = os.path.join(target_path, category)
+            
+            # Generate new filename if pattern specified
+            if naming_pattern:
+                base_name, ext = os.path.splitext(file)
+                new_name = self._generate_new_filename(base_name, naming_pattern) + ext.lower()
+            else:
+                new_name = file
+
+            # Reorganizing in place: a file already where it belongs stays put
+            if new_name == file and os.path.dirname(source_file) == target_dir:
+                yield PlanEntry(source_file, source_file, size, 'unchanged', "already in place", mtime_ns, inode)
+                continue
+
+            # With dedup, compare against every file already using this name
+            # (on disk or claimed earlier in this run) before picking a new one
+            duplicate_of = None
+            if content_index:
+                for taken_name in names.iter_taken(target_dir, new_name):
+                    candidate = os.path.join(target_dir, taken_name)
+                    if self._is_duplicate(content_index, source_file, size, candidate, claimed_targets):
+                        duplicate_of = candidate
+                        break
+
+            if duplicate_of:
+                shared_targets.add(duplicate_of)
+                content_index.record_duplicate(size)
+                yield PlanEntry(source_file, duplicate_of, size, 'duplicate',
+                                f"identical to {os.path.basename(duplicate_of)}", mtime_ns, inode)
+                continue
+
+            if previous_target and os.path.dirname(previous_target) == target_dir \
+                    and manifest.owns_target(relative_path) and previous_target not in shared_targets:
+                # A changed file replaces its own earlier copy, unless other files share it
+                target_file = previous_target
+                reason = REPLACE_REASON
+            else:
+                target_file = os.path.join(target_dir, names.claim(target_dir, new_name))
+            if content_index:
+                claimed_targets[target_file] = (source_file, size)
+            yield PlanEntry(source_file, target_file, size, 'copy', reason, mtime_ns, inode)
+
+    def _source_files(self, source_path: str, snapshot: ScanSnapshot = None,
+                      exclude: Iterable[str] = ()) -> Iterator[Tuple[str, str, int, int, int]]:
+        """(relative path, name, size, mtime_ns, inode) of every file to organize"""
+        if snapshot is not None:
+            for entry in snapshot.files(self.preserved_structure, exclude):
+                yield entry.relative_path, entry.name, entry.size, entry.mtime_ns, entry.inode
+            return
+
+        exclude = list(exclude)
+        for entry, relative_path in self.scanner.scan(source_path):
+            if exclude and any(path == '' or relative_path == path or relative_path.startswith(path + os.sep)
+                               for path in exclude):
+                continue
+            try:
+                st = entry.stat()
+                size, mtime_ns, inode = st.st_size, st.st_mtime_ns, st.st_ino or entry.inode()
+            except OSError:
+                size = mtime_ns = inode = 0
+            yield relative_path, entry.name, size, mtime_ns, inode
+
+    def _is_duplicate(self, content_index: ContentIndex, source_file: str, size: int,
+                      target_file: str, claimed_targets: Dict[str, Tuple[str, int]]) -> bool:
+        """Check if target_file already holds (or will hold) source_file's content"""
+        if target_file in claimed_targets:
+            # Not copied yet, so compare against the file it will be copied from
+            other_file, other_size = claimed_targets[target_file]
+            return content_index.is_duplicate(source_file, size, other_file, other_size)
+        return content_index.is_duplicate(source_file, size, target_file)
+
     def _should_ignore(self, filename: str) -> bool:
         """Check if file should be ignored"""
-        return any(re.match(pattern, filename) for pattern in self.ignore_patterns)
+        return self.scanner.is_ignored(filename)
 
     def _get_file_category(self, filename: str) -> str:
         """Determine file category based on extension"""
-        ext = os.path.splitext(filename)[1].lower()
-        
-        # Traverse nested file categories
+        return self._extension_index.get(self._match_extension(filename))
+
+    def _match_extension(self, filename: str) -> str:
+        """Return the extension key used to categorize filename"""
+        if self._multi_suffix_regex:
+            match = self._multi_suffix_regex.search(filename.lower())
+            # Like splitext, a suffix needs a name in front of it
+            if match and match.start() > 0:
+                return match.group(1)
+        return os.path.splitext(filename)[1].lower()
+
+    def _build_extension_index(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Flatten file_categories into extension -> destination and -> config category tables"""
+        index = {}
+        origins = {}
+
+        # Walk categories in config order; the first match wins, as before
         for category, content in self.file_categories.items():
-            # Handle nested categories
             if isinstance(content, dict):
+                destinations = NESTED_CATEGORY_DESTINATIONS.get(category)
+                if destinations is None:
+                    continue
                 for subcategory, extensions in content.items():
-                    if isinstance(extensions, list) and ext in extensions:
-                        # Map categories to project structure
-                        if category == 'code':
-                            if subcategory == 'programming':
-                                return 'software/src'
-                        elif category == 'documents':
-                            if subcategory == 'notes':
-                                return '_docs/notes'
-                            elif subcategory == 'office_docs':
-                                return '_docs/references'
-                            elif subcategory == 'technical':
-                                return '_docs/datasheets'
-                        elif category == 'images':
-                            return '_docs/images'
-                        elif category == 'data':
-                            if subcategory == 'structured':
-                                return '_docs/data'
-                            elif subcategory == 'tabular':
-                                return '_docs/data'
-                            elif subcategory == 'database':
-                                return 'software/db'
-                        elif category == 'media':
-                            return '_docs/media'
-                        elif category == 'design':
-                            if subcategory == 'cad':
-                                return 'cad/models'
-                            elif subcategory == 'design_tools':
-                                return '_docs/design'
-            # Handle flat categories
-            elif isinstance(content, list) and ext in content:
-                if category == 'archives':
-                    return 'builds'
-                elif category == 'config':
-                    return 'software/config'
-        
-        return None
+                    if not isinstance(extensions, list):
+                        continue
+                    if isinstance(destinations, str):
+                        destination = destinations
+                    else:
+                        destination = destinations.get(subcategory)
+                    if destination:
+                        for ext in extensions:
+                            if ext not in index:
+                                index[ext] = destination
+                                origins[ext] = f"{category}/{subcategory}"
+            elif isinstance(content, list):
+                destination = FLAT_CATEGORY_DESTINATIONS.get(category)
+                if destination:
+                    for ext in content:
+                        if ext not in index:
+                            index[ext] = destination
+                            origins[ext] = category
+
+        return index, origins
+
+    def _build_multi_suffix_regex(self) -> Optional[Pattern]:
+        """Compile multi-dot suffixes (e.g. '.tar.gz') into one regex"""
+        suffixes = [ext for ext in self._extension_index if ext.count('.') > 1]
+        if not suffixes:
+            return None
+        # Longest suffixes first so '.tar.gz' beats a shorter '.gz' alternative
+        suffixes.sort(key=len, reverse=True)
+        return re.compile('(' + '|'.join(re.escape(s) for s in suffixes) + ')$')
 
     def _generate_new_filename(self, filename: str, pattern: str) -> str:
         """Generate new filename based on pattern"""
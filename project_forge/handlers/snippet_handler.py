@@ -2,7 +2,9 @@ import os
 import re
 import shutil
 from typing import Set, Tuple, List
-from ..cli.colors import Colors
+from ..cli.reporter import Reporter
+from ..core.copier import FileCopier
+from ..core.utils import NameRegistry
 
 class SnippetHandler:
     """Handler for organizing code snippets"""
@@ -11,13 +13,16 @@ class SnippetHandler:
         self.config = config
         self.base_path = config.get('base_path', '')
         self.code_extensions = ['.cpp', '.ino', '.py', '.js', '.html', '.css']  # Common code file extensions
+        self.reporter = Reporter()
 
-    def organize_snippets(self, source_path: str):
+    def organize_snippets(self, source_path: str, copier: FileCopier = None):
         """Organize code snippets into Code_Archives with folders"""
+        copier = copier or FileCopier.from_config(self.config)
         target_path = os.path.join(self.base_path, "Code_Archives")
         os.makedirs(target_path, exist_ok=True)
         
         organized_files = set()  # Use set to avoid duplicates
+        names = NameRegistry(self.config.get('organize', {}).get('case_sensitive_names'))
         skipped_files = []
         
         try:
@@ -31,18 +36,18 @@ class SnippetHandler:
                     if ext in self.code_extensions:
                         # Create folder and copy file
                         base_name = self._clean_name(os.path.splitext(item)[0])
-                        snippet_dir = self._ensure_unique_path(os.path.join(target_path, base_name))
+                        snippet_dir = self._ensure_unique_path(os.path.join(target_path, base_name), names)
                         os.makedirs(snippet_dir)
                         
                         new_file_name = f"{base_name}{ext}"
                         target_file = os.path.join(snippet_dir, new_file_name)
                         
                         try:
-                            shutil.copy2(item_path, target_file)
+                            copier.copy(item_path, target_file)
                             organized_files.add((item_path, target_file))
-                            print(Colors.success(f"Created {base_name}/{new_file_name} (standalone file)"))
+                            self.reporter.item('success', f"Created {base_name}/{new_file_name} (standalone file)")
                         except Exception as e:
-                            print(Colors.error(f"Error copying {item}: {e}"))
+                            self.reporter.item('error', f"Error copying {item}: {e}")
                             skipped_files.append(item_path)
 
             # Then handle directories
@@ -65,7 +70,7 @@ class SnippetHandler:
                     
                     if has_code_files:
                         # Create snippet folder
-                        snippet_dir = self._ensure_unique_path(os.path.join(target_path, folder_name))
+                        snippet_dir = self._ensure_unique_path(os.path.join(target_path, folder_name), names)
                         os.makedirs(snippet_dir)
                         
                         # Copy unique code files
@@ -79,31 +84,32 @@ class SnippetHandler:
                                     continue
                                 
                                 try:
-                                    shutil.copy2(source_file, target_file)
+                                    copier.copy(source_file, target_file)
                                     organized_files.add((source_file, target_file))
-                                    print(Colors.success(f"Created {folder_name}/{new_file_name}"))
+                                    self.reporter.item('success', f"Created {folder_name}/{new_file_name}")
                                 except Exception as e:
-                                    print(Colors.error(f"Error copying {os.path.basename(source_file)}: {e}"))
+                                    self.reporter.item('error', f"Error copying {os.path.basename(source_file)}: {e}")
                                     skipped_files.append(source_file)
         
         except Exception as e:
-            print(Colors.error(f"Error accessing directory: {e}"))
+            self.reporter.note('error', f"Error accessing directory: {e}")
             return
         
         # Print summary
-        print(Colors.header("\nCode Snippets Organization Summary:"))
+        self.reporter.note('header', "\nCode Snippets Organization Summary:")
         if organized_files:
             for folder in sorted(os.listdir(target_path)):
                 folder_path = os.path.join(target_path, folder)
                 if os.path.isdir(folder_path):
                     files = os.listdir(folder_path)
-                    print(Colors.info(f"\n{folder}:"))
+                    self.reporter.item('info', f"\n{folder}:")
                     for file in sorted(files):
-                        print(f"  - {file}")
+                        self.reporter.item('plain', f"  - {file}")
         
-        print(Colors.success(f"\nTotal folders created: {len(os.listdir(target_path))}"))
-        print(Colors.success(f"Total files organized: {len(organized_files)}"))
-        print(Colors.warning(f"Files skipped: {len(skipped_files)}"))
+        self.reporter.note('success', f"\nTotal folders created: {len(os.listdir(target_path))}")
+        self.reporter.note('success', f"Total files organized: {len(organized_files)}")
+        self.reporter.note('warning', f"Files skipped: {len(skipped_files)}")
+        self.reporter.note('info', f"Copy strategy: {copier.summary()}")
 
     def _clean_name(self, name: str) -> str:
         """Clean name for folder/file use"""
@@ -111,11 +117,8 @@ class SnippetHandler:
         clean = re.sub(r'_+', '_', clean)
         return clean.strip('_')
 
-    def _ensure_unique_path(self, path: str) -> str:
+    def _ensure_unique_path(self, path: str, registry: NameRegistry = None) -> str:
         """Ensure path is unique by adding counter if needed"""
-        counter = 1
-        original = path
-        while os.path.exists(path):
-            path = f"{original}_{counter}"
-            counter += 1
-        return path
+        registry = registry or NameRegistry()
+        directory, name = os.path.split(path)
+        return os.path.join(directory, registry.claim(directory, name, split_ext=False))
@@ -1,9 +1,19 @@
 import os
 import shutil
 import yaml
-from pathlib import Path
-from typing import Optional
-from ..cli.colors import Colors
+from typing import List, Optional, Tuple
+from ..cli.reporter import Reporter
+from ..core.copier import FileCopier
+from ..core.library_store import LibraryStore
+from ..core.scanner import DirectoryScanner
+from ..core.snapshot import FILE, ScanSnapshot
+from ..core.sync import TreeSync
+from .arduino import SOURCE_EXTENSIONS, LibraryResolver
+from .detectors import DetectorRegistry, ProjectDetector
+
+# Folders holding one library per subfolder, shared through the library store.
+# PlatformIO's lib/ is left out: it holds the project's own, edited code
+LIBRARY_FOLDERS = ('libraries',)
 
 class SoftwareHandler:
     """Handler for software project detection and organization"""
@@ -16,159 +26,178 @@ class SoftwareHandler:
             'directories': []
         })
         self.preserved_structure = config.get('preserved_software_structure', [])
+        self.max_depth = config.get('software_detection', {}).get('max_depth', 8)
+        copy_settings = config.get('software_copy', {})
+        self.copy_exclude = copy_settings.get('exclude', ['.pio/build', '.pio/libdeps'])
+        self.delta_sync = copy_settings.get('delta_sync', True)
+        self.delete_removed = copy_settings.get('delete_removed', False)
+        library_settings = config.get('arduino_libraries', {})
+        self.resolve_includes = library_settings.get('resolve_includes', True)
+        # Without a path nothing is cached between copies; ProjectManager
+        # defaults it to the workspace
+        cache_path = library_settings.get('cache_path')
+        self.library_cache = os.path.expanduser(cache_path) if cache_path else None
+
+        # Markers may sit inside preserved folders, so only ignored ones are pruned
+        self.scanner = DirectoryScanner(config.get('ignore_patterns', []))
+        self.detectors = DetectorRegistry.from_config(config)
+        # Detector name -> relative path of the first marker it matched
+        self.markers_found = {}
+        # Shared workspace library store, set by ProjectManager when enabled
+        self.library_store: Optional[LibraryStore] = None
+        self.reporter = Reporter()
 
-    def detect_project_type(self, source_path: str) -> bool:
+    def detect_project_type(self, source_path: str, snapshot: ScanSnapshot = None) -> bool:
         """Detect if the source directory is a software project"""
         try:
-            # Check for PlatformIO project
-            if os.path.exists(os.path.join(source_path, 'platformio.ini')):
-                self.project_type = 'platformio'
+            if snapshot is not None:
+                self.markers_found = self.detectors.detect_snapshot(snapshot, self.max_depth)
+            else:
+                self.markers_found = self.detectors.detect(self.scanner, source_path, self.max_depth)
+            detector = self.detectors.best_match(self.markers_found)
+            if detector:
+                self.project_type = detector.name
                 return True
-                
-            # Check for Arduino project
-            arduino_markers = ['.ino']
-            for marker in arduino_markers:
-                if any(Path(source_path).glob(f"**/*{marker}")):
-                    self.project_type = 'arduino'
-                    return True
-                    
-            # Check for other software project markers
-            for file in self.markers.get('files', []):
-                if list(Path(source_path).glob(f"**/*{file}")):
-                    self.project_type = 'general'
-                    return True
-            
-            for directory in self.markers.get('directories', []):
-                if list(Path(source_path).glob(f"**/{directory}")):
-                    self.project_type = 'general'
-                    return True
-            
             return False
         except Exception as e:
-            print(Colors.error(f"Error detecting software project: {e}"))
+            self.reporter.note('error', f"Error detecting software project: {e}")
             return False
 
-    def copy_project(self, source_path: str, target_path: str) -> None:
-        """Copy software project preserving its structure"""
+    def software_layout(self, source_path: str, snapshot: ScanSnapshot = None) -> List[Tuple[str, str]]:
+        """Paths copy_project preserves for the detected project type
+
+        Returns (source, target) pairs relative to the source folder and
+        the project folder. Design files of matched CAD and PCB detectors
+        follow the type's own paths, each under its detector's destination.
+        Paths already covered by an earlier pair are left out, so every
+        source file has one copy path.
+        """
+        detector = self._detector()
+        candidates = []
+
+        if self.project_type == 'arduino':
+            # For Arduino projects, the folder holding the first .ino file is the sketch
+            sketch_file = self.markers_found.get('arduino')
+            if sketch_file is None:
+                # Kept for copy_project, which resolves the sketch's libraries from it
+                self.markers_found = self.detectors.detect(self.scanner, source_path, self.max_depth)
+                sketch_file = self.markers_found.get('arduino')
+            if sketch_file is not None:
+                sketch_dir = os.path.dirname(sketch_file)
+                sketch_name = os.path.basename(os.path.normpath(os.path.join(source_path, sketch_dir)))
+                if sketch_dir:
+                    candidates.append((sketch_dir, sketch_name))
+                else:
+                    # A sketch at the source root: keep its sources and src/ together,
+                    # everything else next to them is still organized by category
+                    candidates.extend((name, os.path.join(sketch_name, name))
+                                      for name in self._root_files(source_path, snapshot)
+                                      if name.endswith(SOURCE_EXTENSIONS))
+                    if (snapshot is not None and snapshot.has_dir('src')) \
+                            or os.path.isdir(os.path.join(source_path, 'src')):
+                        candidates.append(('src', os.path.join(sketch_name, 'src')))
+            else:
+                self.reporter.note('warning', "No .ino file found in Arduino project")
+        candidates = [(source, os.path.join(detector.destination, target)) for source, target in candidates]
+
+        for preserving in [detector] + self.detectors.companions(self.markers_found, detector):
+            if preserving.special_suffixes:
+                suffix_files = [n for n in self._root_files(source_path, snapshot)
+                                if n.endswith(preserving.special_suffixes)]
+            else:
+                suffix_files = []
+
+            for name in preserving.special_dirs + preserving.special_files + suffix_files:
+                if (snapshot is not None and snapshot.contains(name)) \
+                        or os.path.exists(os.path.join(source_path, name)):
+                    candidates.append((name, os.path.join(preserving.destination, name)))
+
+        layout = []
+        for source, target in candidates:
+            if not any(c == '' or source == c or source.startswith(c + os.sep) for c, _ in layout):
+                layout.append((source, target))
+        return layout
+
+    @staticmethod
+    def _root_files(source_path: str, snapshot: ScanSnapshot = None) -> List[str]:
+        """Sorted names of the files directly in the source folder"""
+        if snapshot is not None:
+            names = [e.name for e in snapshot.root_entries() if e.kind == FILE]
+        else:
+            with os.scandir(source_path) as entries:
+                names = [e.name for e in entries if e.is_file()]
+        return sorted(names)
+
+    def copy_project(self, source_path: str, target_path: str, copier: FileCopier = None,
+                     snapshot: ScanSnapshot = None, layout: List[Tuple[str, str]] = None,
+                     delete_removed: bool = None) -> None:
+        """Copy software project preserving its structure
+
+        Preserved folders are listed from disk rather than from the
+        snapshot, which leaves out ignored files; like copytree with
+        symlinks=True, they keep every file and symlink. Files of an
+        existing copy that are not in the source are kept unless
+        delete_removed (default: software_copy.delete_removed) is on.
+        """
+        copier = copier or FileCopier.from_config(self.config)
         try:
-            software_path = os.path.join(target_path, 'software')
-            project_type = getattr(self, 'project_type', 'general')
-            
+            project_type = self.project_type or 'general'
+            software_path = os.path.join(target_path, self._detector().destination)
+            if layout is None:
+                layout = self.software_layout(source_path, snapshot)
+
             # Create software directory if it doesn't exist
             os.makedirs(software_path, exist_ok=True)
 
-            if project_type == 'platformio':
-                special_dirs = [
-                    '.pio',          # PlatformIO build and library cache
-                    '.vscode',       # VSCode configuration
-                    'include',       # Header files
-                    'lib',          # Project libraries
-                    'src',          # Source code
-                    'test',         # Test files
-                    'boards',       # Custom board definitions
-                    'scripts',      # Build scripts
-                    'data'          # Data files
-                ]
-                special_files = [
-                    'platformio.ini',    # PlatformIO configuration
-                    '.gitignore',        # Git ignore file
-                    'README.md',         # Project documentation
-                    'library.json',      # Library manifest
-                    'library.properties' # Arduino library properties
-                ]
-            elif project_type == 'arduino':
-                # For Arduino projects, look for the main .ino file directory
-                ino_files = list(Path(source_path).glob('**/*.ino'))
-                if not ino_files:
-                    raise Exception("No .ino file found in Arduino project")
-                    
-                # Use the directory containing the first .ino file as main sketch directory
-                main_sketch_dir = ino_files[0].parent
-                sketch_name = main_sketch_dir.name
-                
-                # Create sketch directory
-                sketch_path = os.path.join(software_path, sketch_name)
-                os.makedirs(sketch_path, exist_ok=True)
-                
-                # Copy entire sketch directory
-                for item in os.listdir(main_sketch_dir):
-                    source_item = os.path.join(main_sketch_dir, item)
-                    target_item = os.path.join(sketch_path, item)
-                    
-                    if os.path.isfile(source_item):
-                        shutil.copy2(source_item, target_item)
-                        print(Colors.success(f"Copied sketch file: {item}"))
-                    elif os.path.isdir(source_item):
-                        shutil.copytree(source_item, target_item, dirs_exist_ok=True)
-                        print(Colors.success(f"Copied sketch directory: {item}"))
-                
-                # For Arduino projects, also preserve these directories
-                special_dirs = [
-                    'libraries',     # Local libraries
-                    '.vscode',       # VSCode configuration
-                    'build',         # Build output
-                    'data'          # Data files
-                ]
-                special_files = [
-                    'arduino.json',      # Arduino VSCode configuration
-                    'c_cpp_properties.json', # C/C++ VSCode configuration
-                    '.gitignore',        # Git ignore file
-                    'README.md'          # Project documentation
-                ]
-            else:
-                # General software project
-                special_dirs = [
-                    'src',          # Source code
-                    'include',      # Headers
-                    'lib',          # Libraries
-                    'test',         # Tests
-                    'docs',         # Documentation
-                    'build',        # Build output
-                    '.vscode'       # VSCode configuration
-                ]
-                special_files = [
-                    'CMakeLists.txt',   # CMake configuration
-                    'Makefile',         # Make configuration
-                    'README.md',        # Documentation
-                    '.gitignore'        # Git ignore
-                ]
-
-            # Copy special directories
-            for dir_name in special_dirs:
-                source_dir = os.path.join(source_path, dir_name)
-                if os.path.exists(source_dir):
-                    target_dir = os.path.join(software_path, dir_name)
-                    try:
-                        if os.path.exists(target_dir):
-                            shutil.rmtree(target_dir)
-                        shutil.copytree(source_dir, target_dir, symlinks=True)
-                        print(Colors.success(f"Copied directory: {dir_name}"))
-                    except Exception as e:
-                        print(Colors.error(f"Error copying directory {dir_name}: {e}"))
+            # Copy preserved directories and files; an existing copy is only
+            # updated where the source changed, leaving regenerable caches out.
+            # With include resolution, libraries/ is copied per used library below
+            resolve_libraries = project_type == 'arduino' and self.resolve_includes
+            if delete_removed is None:
+                delete_removed = self.delete_removed
+            sync = TreeSync(copier, self.copy_exclude + (['libraries'] if resolve_libraries else []),
+                            delete=delete_removed)
+            for source, target in layout:
+                if resolve_libraries and source == 'libraries':
+                    continue
+                source_item = os.path.join(source_path, source)
+                target_item = os.path.join(target_path, target)
+                try:
+                    if self.library_store and source in LIBRARY_FOLDERS and os.path.isdir(source_item):
+                        self._store_library_folder(source_item, target_item, sync, source)
+                        self.reporter.item('success', f"Linked libraries: {source}")
+                    elif (snapshot is not None and snapshot.has_dir(source)) or os.path.isdir(source_item):
+                        if not self.delta_sync and os.path.exists(target_item):
+                            shutil.rmtree(target_item)
+                        stats = sync.run(source_item, target_item, prefix=source)
+                        self.reporter.item('success', f"Copied directory: {source or os.path.basename(target)} "
+                                                      f"({stats['copied']} copied, {stats['unchanged']} unchanged)")
+                    else:
+                        # Sources of a root sketch go into a folder of their own
+                        os.makedirs(os.path.dirname(target_item), exist_ok=True)
+                        if sync.sync_file(source_item, target_item):
+                            self.reporter.item('success', f"Copied file: {source}")
+                        else:
+                            self.reporter.item('info', f"Unchanged file: {source}")
+                except Exception as e:
+                    self.reporter.item('error', f"Error copying {source or target}: {e}")
 
-            # Copy special files
-            for file_name in special_files:
-                source_file = os.path.join(source_path, file_name)
-                if os.path.exists(source_file):
-                    target_file = os.path.join(software_path, file_name)
-                    try:
-                        shutil.copy2(source_file, target_file)
-                        print(Colors.success(f"Copied file: {file_name}"))
-                    except Exception as e:
-                        print(Colors.error(f"Error copying file {file_name}: {e}"))
+            if resolve_libraries:
+                self._copy_used_libraries(source_path, software_path, sync, snapshot)
 
             # For Arduino projects, also look for libraries in parent directories
-            if project_type == 'arduino':
+            elif project_type == 'arduino':
                 parent_libraries = os.path.join(os.path.dirname(source_path), 'libraries')
                 if os.path.exists(parent_libraries):
                     target_libraries = os.path.join(software_path, 'libraries')
                     try:
-                        shutil.copytree(parent_libraries, target_libraries, dirs_exist_ok=True)
-                        print(Colors.success("Copied parent libraries directory"))
+                        copier.copytree(parent_libraries, target_libraries, dirs_exist_ok=True)
+                        self.reporter.item('success', "Copied parent libraries directory")
                     except Exception as e:
-                        print(Colors.error(f"Error copying parent libraries: {e}"))
+                        self.reporter.item('error', f"Error copying parent libraries: {e}")
 
-            print(Colors.success(f"Preserved {project_type} project structure in {software_path}"))
+            self.reporter.note('success', f"Preserved {project_type} project structure in {software_path}")
+            self.reporter.note('info', f"Copy strategy: {copier.summary()}")
             
             # Update project.yaml with project type
             yaml_path = os.path.join(target_path, "project.yaml")
@@ -180,4 +209,65 @@ class SoftwareHandler:
                     yaml.dump(data, f, default_flow_style=False)
                 
         except Exception as e:
-            print(Colors.error(f"Error copying software project: {e}"))
+            self.reporter.note('error', f"Error copying software project: {e}")
+
+    def _detector(self) -> ProjectDetector:
+        """Detector of the current project type ('general' if unknown)"""
+        return self.detectors.get(self.project_type or 'general') or self.detectors.get('general')
+
+    def _copy_used_libraries(self, source_path: str, software_path: str, sync: TreeSync,
+                             snapshot: ScanSnapshot = None) -> None:
+        """Copy only the libraries the sketch includes, directly or through other libraries
+
+        Libraries are looked up in the project's libraries/ folder first and
+        the parent (sketchbook) libraries/ folder second.
+        """
+        sketch_file = self.markers_found.get('arduino')
+        if sketch_file is None:
+            return
+        sketch_dir = os.path.dirname(sketch_file)
+        libraries_dir = os.path.join(sketch_dir, 'libraries')
+
+        if snapshot is not None and snapshot.has_dir(sketch_dir):
+            sketch_files = [os.path.join(source_path, e.relative_path)
+                            for e in snapshot.files(under=sketch_dir, exclude=[libraries_dir])
+                            if e.name.endswith(SOURCE_EXTENSIONS)]
+        else:
+            sketch_files = []
+            sketch_root = os.path.join(source_path, sketch_dir)
+            for root, dirs, files in os.walk(sketch_root):
+                if root == sketch_root:
+                    dirs[:] = [d for d in dirs if d != 'libraries']
+                sketch_files.extend(os.path.join(root, f) for f in files if f.endswith(SOURCE_EXTENSIONS))
+
+        resolver = LibraryResolver([os.path.join(source_path, 'libraries'),
+                                    os.path.join(os.path.dirname(source_path), 'libraries')],
+                                   self.library_cache)
+        used = resolver.resolve(sketch_files)
+        for library in used:
+            try:
+                self._place_library(library.path, os.path.join(software_path, 'libraries', library.folder), sync)
+                self.reporter.item('success', f"Copied library: {library.name} {library.properties.get('version', '')}".rstrip())
+            except Exception as e:
+                self.reporter.item('error', f"Error copying library {library.name}: {e}")
+        self.reporter.note('info', f"Libraries used by the sketch: {len(used)} of {len(resolver.libraries)} available")
+
+    def _place_library(self, library_path: str, target_dir: str, sync: TreeSync) -> None:
+        """Copy one library, or link it from the library store when there is one"""
+        if self.library_store:
+            self.library_store.link(self.library_store.add(library_path), target_dir)
+        else:
+            sync.run(library_path, target_dir)
+
+    def _store_library_folder(self, source_dir: str, target_dir: str, sync: TreeSync, prefix: str) -> None:
+        """Link every library of a lib/ or libraries/ folder; loose files are copied"""
+        os.makedirs(target_dir, exist_ok=True)
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                if sync.is_excluded(os.path.join(prefix, entry.name)):
+                    continue
+                target = os.path.join(target_dir, entry.name)
+                if entry.is_dir():
+                    self._place_library(entry.path, target, sync)
+                else:
+                    sync.sync_file(entry.path, target)
@@ -0,0 +1,90 @@
+import json
+import pytest
+import yaml
+from project_forge.cli.reporter import QuietReporter
+from project_forge.core.plan import OrganizePlan
+from project_forge.core.project_manager import ProjectManager
+from project_forge.handlers.arduino import CACHE_NAME, LibraryResolver
+from project_forge.handlers.software_handler import SoftwareHandler
+
+def make_library(root, folder, headers, includes=(), properties=None):
+    """Create a library folder with headers that include other headers"""
+    library = root / folder
+    src = library / "src" if properties else library
+    src.mkdir(parents=True)
+    if properties:
+        (library / "library.properties").write_text(
+            "\n".join(f"{k}={v}" for k, v in properties.items()))
+    for header in headers:
+        (src / header).write_text("".join(f"#include <{inc}>\n" for inc in includes))
+    return library
+
+@pytest.fixture
+def sketchbook(tmp_path):
+    """Create a sketchbook with a sketch and a shared libraries folder"""
+    libraries = tmp_path / "libraries"
+    make_library(libraries, "Adafruit_BME280", ["Adafruit_BME280.h"], ["Adafruit_Sensor.h", "Wire.h"],
+                 {"name": "Adafruit BME280 Library", "version": "2.2.2"})
+    make_library(libraries, "Adafruit_Sensor", ["Adafruit_Sensor.h"],
+                 properties={"name": "Adafruit Unified Sensor", "version": "1.1.9"})
+    make_library(libraries, "FastLED", ["FastLED.h"], properties={"name": "FastLED", "version": "3.6.0"})
+    make_library(libraries, "OldLib", ["OldLib.h"])
+    sketch = tmp_path / "weather"
+    sketch.mkdir()
+    (sketch / "weather.ino").write_text('#include <Adafruit_BME280.h>\n  # include "OldLib.h"\n')
+    return tmp_path
+
+class TestLibraryResolver:
+    def test_resolves_include_closure(self, sketchbook, tmp_path):
+        """Test that only included libraries and their dependencies are used"""
+        cache = tmp_path / "cache.json"
+        resolver = LibraryResolver([str(sketchbook / "libraries")], str(cache))
+        used = resolver.resolve([str(sketchbook / "weather" / "weather.ino")])
+        assert sorted(lib.folder for lib in used) == ["Adafruit_BME280", "Adafruit_Sensor", "OldLib"]
+
+        data = json.loads(cache.read_text())
+        cached = {k.rsplit("/", 1)[-1]: v for k, v in data["libraries"].items()}
+        assert cached["Adafruit_BME280"] == {"version": "2.2.2", "includes": ["Adafruit_Sensor.h", "Wire.h"]}
+
+    def test_copy_project_copies_used_libraries(self, sketchbook, tmp_path):
+        """Test that copy_project skips unrelated sketchbook libraries"""
+        handler = SoftwareHandler({'arduino_libraries': {'cache_path': str(tmp_path / "cache.json")}})
+        source = sketchbook / "weather"
+        assert handler.detect_project_type(str(source))
+        handler.copy_project(str(source), str(tmp_path / "target"))
+        copied = tmp_path / "target" / "software" / "libraries"
+        assert sorted(p.name for p in copied.iterdir()) == ["Adafruit_BME280", "Adafruit_Sensor", "OldLib"]
+        assert (tmp_path / "target" / "software" / "weather" / "weather.ino").exists()
+
+    def test_cache_stays_in_workspace(self, tmp_path, monkeypatch):
+        """Test that the include cache defaults to the workspace, and to none without one"""
+        assert SoftwareHandler({}).library_cache is None
+        monkeypatch.setattr(ProjectManager, 'configure_base_path', lambda self: str(tmp_path / "workspace"))
+        manager = ProjectManager(str(tmp_path / "config.yaml"), test_mode=True)
+        assert manager.software_handler.library_cache == str(tmp_path / "workspace" / CACHE_NAME)
+
+class TestExecutePlan:
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        """Create a test-mode ProjectManager with its workspace under tmp_path"""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, 'w') as f:
+            yaml.dump({'arduino_libraries': {'cache_path': str(tmp_path / "cache.json")}}, f)
+        monkeypatch.setattr(ProjectManager, 'configure_base_path', lambda self: str(tmp_path / "workspace"))
+        manager = ProjectManager(str(config_path), test_mode=True)
+        manager.set_reporter(QuietReporter())
+        return manager
+
+    @pytest.mark.parametrize("saved", [True, False])
+    def test_executed_plan_copies_used_libraries(self, manager, sketchbook, tmp_path, saved):
+        """Test that executing a saved plan, with or without recorded markers, copies the sketch's libraries"""
+        plan = manager.plan_existing_project(str(sketchbook / "weather"), "weather", "ONGOING")
+        if not saved:
+            del plan.metadata['software_markers']
+        plan.write(str(tmp_path / "plan.json"))
+        manager.software_handler.markers_found = {}
+
+        project = manager.execute_plan(OrganizePlan.load(str(tmp_path / "plan.json")))
+        libraries = tmp_path / "workspace" / "ONGOING" / "weather" / "software" / "libraries"
+        assert project == str(tmp_path / "workspace" / "ONGOING" / "weather")
+        assert sorted(p.name for p in libraries.iterdir()) == ["Adafruit_BME280", "Adafruit_Sensor", "OldLib"]
@@ -0,0 +1,139 @@
+import errno
+import os
+import tarfile
+import pytest
+from datetime import datetime, timedelta
+from project_forge.core.backup import (BackupGC, IncrementalBackup, RetentionPolicy, list_backups,
+                                       migrate_legacy_backups)
+from project_forge.core.project_manager import ProjectManager
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a workspace with two status folders"""
+    base = tmp_path / "workspace"
+    (base / "ONGOING" / "robot").mkdir(parents=True)
+    (base / "ONGOING" / "robot" / "main.c").write_text("int main;")
+    (base / "ONGOING" / "robot" / "notes.md").write_text("v1")
+    (base / "DONE").mkdir()
+    os.symlink("main.c", base / "ONGOING" / "robot" / "link.c")
+    return base
+
+class TestIncrementalBackup:
+    def test_second_snapshot_links_unchanged_files(self, workspace, tmp_path):
+        """Test that unchanged files share inodes with the previous snapshot"""
+        first, second = tmp_path / "structure_backup_20240101_000000", tmp_path / "structure_backup_20240102_000000"
+        stats = IncrementalBackup().snapshot(str(workspace), ["ONGOING", "DONE"], str(first))
+        assert (stats['copied'], stats['linked']) == (2, 0)
+        assert os.readlink(first / "ONGOING" / "robot" / "link.c") == "main.c"
+
+        notes = workspace / "ONGOING" / "robot" / "notes.md"
+        notes.write_text("version 2")
+        stats = IncrementalBackup().snapshot(str(workspace), ["ONGOING", "DONE"], str(second), str(first))
+        assert (stats['copied'], stats['linked']) == (1, 1)
+        assert os.path.samefile(first / "ONGOING" / "robot" / "main.c", second / "ONGOING" / "robot" / "main.c")
+        assert (second / "ONGOING" / "robot" / "notes.md").read_text() == "version 2"
+        assert (first / "ONGOING" / "robot" / "notes.md").read_text() == "v1"
+        assert (second / "DONE").is_dir()
+
+    def test_unreadable_folder_fails_snapshot(self, workspace, tmp_path, monkeypatch):
+        """Test that a folder that cannot be read raises instead of giving an incomplete backup"""
+        scandir = os.scandir
+        def unreadable_robot(path):
+            if str(path).endswith("robot"):
+                raise PermissionError(errno.EACCES, "Permission denied", str(path))
+            return scandir(path)
+        monkeypatch.setattr(os, 'scandir', unreadable_robot)
+        target = tmp_path / "structure_backup_20240101_000000"
+        with pytest.raises(PermissionError):
+            IncrementalBackup().snapshot(str(workspace), ["ONGOING", "DONE"], str(target))
+        assert not target.exists()
+
+    def test_list_backups_skips_partial_snapshots(self, tmp_path):
+        """Test that only finished, well-named backups are listed, oldest first"""
+        for name in ("structure_backup_20240102_000000", "structure_backup_20240101_000000",
+                     ".structure_backup_20240103_000000.partial", "ONGOING"):
+            (tmp_path / name).mkdir()
+        assert [os.path.basename(p) for p in list_backups(str(tmp_path))] == [
+            "structure_backup_20240101_000000", "structure_backup_20240102_000000"]
+
+def make_backup(root, when, content):
+    """Create a snapshot folder named for its timestamp"""
+    path = root / f"structure_backup_{when:%Y%m%d_%H%M%S}"
+    (path / "ONGOING").mkdir(parents=True)
+    (path / "ONGOING" / "data.bin").write_bytes(content)
+    return str(path)
+
+class TestRetention:
+    def test_select_keeps_last_daily_and_weekly(self, tmp_path):
+        """Test that thinning keeps the newest per day and per week"""
+        start = datetime(2024, 1, 1, 12)
+        backups = [make_backup(tmp_path, start + timedelta(hours=6 * i), b"x") for i in range(40)]
+        keep = RetentionPolicy(keep_last=2, keep_daily=3, keep_weekly=2).select(backups)
+        names = sorted(os.path.basename(path)[len("structure_backup_"):] for path in keep)
+        # Newest two (Jan 11), the newest of Jan 10 and 9, and the newest of ISO week 1
+        assert names == ["20240107_180000", "20240109_180000", "20240110_180000",
+                         "20240111_000000", "20240111_060000"]
+
+    def test_gc_budget_and_pack(self, tmp_path):
+        """Test that the size budget drops the oldest backups and old ones get packed"""
+        old = datetime.now() - timedelta(days=60)
+        backups = [make_backup(tmp_path, old + timedelta(days=i), bytes(1000)) for i in range(4)]
+        policy = RetentionPolicy(keep_last=4, keep_daily=0, keep_weekly=0, max_bytes=2500, pack_after_days=30)
+        planned = BackupGC(str(tmp_path), policy).run(dry_run=True)
+        assert [action for action, _, _ in planned] == ['remove', 'remove', 'pack']
+        assert len(list_backups(str(tmp_path))) == 4
+
+        actions = BackupGC(str(tmp_path), policy, workers=2).run()
+        assert [(action, size) for action, _, size in actions][:2] == [('remove', 1000), ('remove', 1000)]
+        assert [os.path.basename(p) for p in list_backups(str(tmp_path), archives=True)] == [
+            os.path.basename(backups[2]) + ".tar.gz", os.path.basename(backups[3])]
+        with tarfile.open(backups[2] + ".tar.gz") as tar:
+            assert os.path.basename(backups[2]) + "/ONGOING/data.bin" in tar.getnames()
+
+    def test_migrate_legacy_backups(self, tmp_path):
+        """Test that backups in the workspace root move into the backup folder"""
+        make_backup(tmp_path, datetime(2024, 1, 1), b"x")
+        assert migrate_legacy_backups(str(tmp_path), str(tmp_path / ".forge_backups")) == 1
+        assert len(list_backups(str(tmp_path / ".forge_backups"))) == 1
+        assert list_backups(str(tmp_path)) == []
+
+    def test_migrate_legacy_backups_across_devices(self, tmp_path, monkeypatch):
+        """Test that a backup folder on another filesystem gets a copy of each legacy backup"""
+        make_backup(tmp_path, datetime(2024, 1, 1), b"x")
+        rename = os.rename
+
+        def cross_device(src, dst):
+            if os.path.basename(src).startswith("structure_backup_"):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            rename(src, dst)
+        monkeypatch.setattr(os, "rename", cross_device)
+
+        assert migrate_legacy_backups(str(tmp_path), str(tmp_path / ".forge_backups")) == 1
+        assert list_backups(str(tmp_path)) == []
+        moved = tmp_path / ".forge_backups" / "structure_backup_20240101_000000"
+        assert (moved / "ONGOING" / "data.bin").read_bytes() == b"x"
+
+    def test_gc_removes_partial_leftovers(self, tmp_path):
+        """Test that interrupted snapshots and archives are cleaned up"""
+        make_backup(tmp_path, datetime.now(), b"x")
+        (tmp_path / ".structure_backup_20240101_000000.partial").mkdir()
+        (tmp_path / ".structure_backup_20240102_000000.tar.gz.partial").write_bytes(bytes(10))
+        policy = RetentionPolicy(keep_last=1)
+        assert BackupGC(str(tmp_path), policy).run(dry_run=True) == [
+            ('remove', ".structure_backup_20240101_000000.partial", 0),
+            ('remove', ".structure_backup_20240102_000000.tar.gz.partial", 10)]
+        assert len(BackupGC(str(tmp_path), policy).run()) == 2
+        assert sorted(os.listdir(tmp_path)) == [os.path.basename(p) for p in list_backups(str(tmp_path))]
+
+class TestWorkspaceBackup:
+    def test_internal_folders_are_not_backed_up(self, tmp_path, monkeypatch):
+        """Test that the trash and other .forge_ folders stay out of structure backups"""
+        monkeypatch.setattr(ProjectManager, 'configure_base_path', lambda self: str(tmp_path / "workspace"))
+        manager = ProjectManager(str(tmp_path / "config.yaml"), test_mode=True)
+        for folder in ("ONGOING", ".forge_trash/purge_reset_1/ONGOING", ".forge_libs"):
+            (tmp_path / "workspace" / folder).mkdir(parents=True, exist_ok=True)
+        (tmp_path / "workspace" / ".forge_trash" / "purge_reset_1" / "ONGOING" / "old.txt").write_text("")
+
+        backup = manager.backup_folder_structure()
+        assert "ONGOING" in os.listdir(backup)
+        assert not [name for name in os.listdir(backup) if name.startswith(".forge_")]
@@ -0,0 +1,62 @@
+import os
+import pytest
+import yaml
+from project_forge.cli.reporter import QuietReporter
+from project_forge.core.bulk import read_project_list
+from project_forge.core.project_manager import ProjectManager
+
+class TestReadProjectList:
+    def test_csv(self, tmp_path):
+        """Test that CSV rows are read with optional columns and split tags"""
+        path = tmp_path / "projects.csv"
+        path.write_text('name,status,tags\nrobot_arm,DONE,"servo; arm"\nline_follower,,\n')
+        rows = read_project_list(str(path))
+        assert rows[0] == {'name': 'robot_arm', 'status': 'DONE', 'description': '', 'tags': ['servo', 'arm']}
+        assert rows[1]['status'] is None and rows[1]['tags'] == []
+
+    def test_yaml(self, tmp_path):
+        """Test that YAML lists are read at the top level or under 'projects'"""
+        path = tmp_path / "projects.yaml"
+        path.write_text(yaml.dump({'projects': [{'name': 'clock', 'tags': ['rtc']}]}))
+        assert read_project_list(str(path))[0]['tags'] == ['rtc']
+        with pytest.raises(ValueError):
+            read_project_list(str(tmp_path / "projects.txt"))
+
+class TestCreateProjects:
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        """Create a test-mode ProjectManager with its workspace under tmp_path"""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, 'w') as f:
+            yaml.dump({
+                'project_structure': {'_docs': {'subfolders': ['notes']}, 'software': {}},
+                'defaults': {'status': 'ONGOING', 'create_readme': True,
+                             'readme_template': "# {project_name}\nStatus: {status}\n"}
+            }, f)
+        monkeypatch.setattr(ProjectManager, 'configure_base_path', lambda self: str(tmp_path / "workspace"))
+        manager = ProjectManager(str(config_path), test_mode=True)
+        manager.set_reporter(QuietReporter())
+        return manager
+
+    def test_creates_projects_from_rows(self, manager, tmp_path):
+        """Test that projects get folders, metadata and README, and bad rows are skipped"""
+        rows = [{'name': 'robot: "arm"', 'status': 'DONE', 'description': 'x', 'tags': ['servo']},
+                {'name': 'clock'},
+                {'name': 'clock'},
+                {'name': 'lamp', 'status': 'LOST'},
+                {'name': '../escape'}]
+        created = manager.create_projects(rows, workers=4)
+        workspace = tmp_path / "workspace"
+        assert sorted(created) == sorted([str(workspace / "DONE" / 'robot: "arm"'),
+                                          str(workspace / "ONGOING" / "clock")])
+
+        robot = workspace / "DONE" / 'robot: "arm"'
+        assert (robot / "_docs" / "notes").is_dir() and (robot / "software").is_dir()
+        data = yaml.safe_load((robot / "project.yaml").read_text())
+        assert data['name'] == 'robot: "arm"'
+        assert data['status'] == 'DONE'
+        assert data['metadata']['tags'] == ['servo']
+        assert data['description'] == 'x'
+        assert (robot / "README.md").read_text() == '# robot: "arm"\nStatus: DONE\n'
+
+        assert manager.create_projects([{'name': 'clock'}]) == []
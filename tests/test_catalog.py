@@ -0,0 +1,112 @@
+import json
+import os
+import pytest
+import yaml
+from project_forge.core.catalog import ProjectCatalog
+
+def make_project(base, status, name, tags=(), software_type=None):
+    """Create a project folder with a project.yaml"""
+    project = base / status / name
+    project.mkdir(parents=True)
+    data = {'name': name, 'status': status, 'created_date': '2024-05-01',
+            'metadata': {'tags': list(tags)}}
+    if software_type:
+        data['software_type'] = software_type
+    (project / "project.yaml").write_text(yaml.dump(data))
+    (project / "notes.txt").write_text("12345")
+    return project
+
+def age(path, seconds=60):
+    """Push a file or folder's mtime out of the racy window"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a workspace with two status folders"""
+    base = tmp_path / "workspace"
+    for project in (make_project(base, "ONGOING", "weather", ["esp32", "sensor"], "platformio"),
+                    make_project(base, "DONE", "lamp")):
+        age(project / "project.yaml")
+        age(project)
+    for status in ("ONGOING", "DONE"):
+        age(base / status)
+    return base
+
+class TestProjectCatalog:
+    def test_refresh_indexes_projects(self, workspace):
+        """Test that a refresh reads metadata, size and file counts"""
+        catalog = ProjectCatalog(str(workspace / ".forge_catalog.sqlite"), str(workspace))
+        assert catalog.refresh() == {'added': 2}
+        assert catalog.projects_by_status() == {'DONE': ['lamp'], 'ONGOING': ['weather']}
+
+        row = catalog.db.execute("SELECT * FROM projects WHERE name = 'weather'").fetchone()
+        assert row['status'] == 'ONGOING'
+        assert row['created_date'] == '2024-05-01'
+        assert json.loads(row['tags']) == ['esp32', 'sensor']
+        assert row['software_type'] == 'platformio'
+        assert row['file_count'] == 2
+        assert row['size'] == os.path.getsize(workspace / "ONGOING" / "weather" / "project.yaml") + 5
+
+    def test_refresh_only_lists_changed_status_folders(self, workspace):
+        """Test that unchanged status folders are skipped and moves are picked up"""
+        catalog = ProjectCatalog(str(workspace / ".forge_catalog.sqlite"), str(workspace))
+        catalog.refresh()
+        assert catalog.refresh() == {}
+
+        os.rename(workspace / "ONGOING" / "weather", workspace / "DONE" / "weather")
+        assert catalog.refresh() == {'added': 1, 'removed': 1}
+        assert catalog.projects_by_status() == {'DONE': ['lamp', 'weather'], 'ONGOING': []}
+
+    def test_refresh_and_update_project(self, workspace):
+        """Test that project.yaml edits are found by a refresh, nested files by a deep one or update_project"""
+        catalog = ProjectCatalog(str(workspace / ".forge_catalog.sqlite"), str(workspace))
+        catalog.refresh()
+        yaml_path = workspace / "DONE" / "lamp" / "project.yaml"
+        yaml_path.write_text(yaml.dump({'name': 'lamp', 'software_type': 'arduino'}))
+        os.utime(yaml_path, ns=(0, 10**9))
+
+        assert catalog.refresh() == {'updated': 1}
+        assert catalog.refresh() == {}
+        query = "SELECT software_type FROM projects WHERE name = 'lamp'"
+        assert catalog.db.execute(query).fetchone()[0] == 'arduino'
+
+        (workspace / "DONE" / "lamp" / "docs").mkdir()
+        age(workspace / "DONE" / "lamp")
+        catalog.refresh()
+        (workspace / "DONE" / "lamp" / "docs" / "guide.md").write_text("x")
+        assert catalog.refresh() == {}
+        assert catalog.refresh(deep=True) == {'updated': 2}
+        assert catalog.db.execute("SELECT file_count FROM projects WHERE name = 'lamp'").fetchone()[0] == 3
+
+        (workspace / "DONE" / "lamp" / "extra.txt").write_text("x")
+        catalog.update_project(str(workspace / "DONE" / "lamp"))
+        assert catalog.db.execute("SELECT file_count FROM projects WHERE name = 'lamp'").fetchone()[0] == 4
+
+class TestCatalogQuery:
+    @pytest.fixture
+    def catalog(self, workspace):
+        """Create a refreshed catalog over the workspace plus one more project"""
+        make_project(workspace, "ONGOING", "weather_v2", ["esp32"], "platformio")
+        catalog = ProjectCatalog(str(workspace / ".forge_catalog.sqlite"), str(workspace))
+        catalog.refresh()
+        return catalog
+
+    def test_filters(self, catalog):
+        """Test that filters combine and tags must all match"""
+        names = lambda **filters: [p['name'] for p in catalog.query(**filters)]
+        assert names(status='ONGOING') == ['weather', 'weather_v2']
+        assert names(tags=['esp32']) == ['weather', 'weather_v2']
+        assert names(tags=['esp32', 'sensor']) == ['weather']
+        assert names(software_type='platformio', name_glob='*_v2') == ['weather_v2']
+        assert names(status=['DONE', 'ONGOING'], created_after='2024-05-02') == []
+        assert catalog.count(tags=['esp32']) == 2
+
+    def test_sort_and_pagination(self, catalog):
+        """Test sorting with limit and offset"""
+        page = catalog.query(sort='name', descending=True, limit=2, offset=1)
+        assert [p['name'] for p in page] == ['weather', 'lamp']
+        assert page[0]['tags'] == ['esp32', 'sensor']
+        assert page[0]['path'].endswith(os.path.join("ONGOING", "weather"))
+        with pytest.raises(ValueError):
+            catalog.query(sort='path; DROP TABLE projects')
@@ -0,0 +1,75 @@
+import os
+import pytest
+import yaml
+from project_forge.constants.defaults import DEFAULT_CONFIG
+from project_forge.handlers.file_handler import FileHandler
+
+SHIPPED_CONFIG = os.path.join(os.path.dirname(os.path.dirname(__file__)), "project_config.yaml")
+
+def linear_category(file_categories, filename):
+    """The category lookup FileHandler used before the extension index"""
+    ext = os.path.splitext(filename)[1].lower()
+    for category, content in file_categories.items():
+        if isinstance(content, dict):
+            for subcategory, extensions in content.items():
+                if isinstance(extensions, list) and ext in extensions:
+                    if category == 'code':
+                        if subcategory == 'programming':
+                            return 'software/src'
+                    elif category == 'documents':
+                        if subcategory == 'notes':
+                            return '_docs/notes'
+                        elif subcategory == 'office_docs':
+                            return '_docs/references'
+                        elif subcategory == 'technical':
+                            return '_docs/datasheets'
+                    elif category == 'images':
+                        return '_docs/images'
+                    elif category == 'data':
+                        if subcategory == 'structured':
+                            return '_docs/data'
+                        elif subcategory == 'tabular':
+                            return '_docs/data'
+                        elif subcategory == 'database':
+                            return 'software/db'
+                    elif category == 'media':
+                        return '_docs/media'
+                    elif category == 'design':
+                        if subcategory == 'cad':
+                            return 'cad/models'
+                        elif subcategory == 'design_tools':
+                            return '_docs/design'
+        elif isinstance(content, list) and ext in content:
+            if category == 'archives':
+                return 'builds'
+            elif category == 'config':
+                return 'software/config'
+    return None
+
+def shipped_categories():
+    with open(SHIPPED_CONFIG) as f:
+        return yaml.safe_load(f)['file_categories']
+
+class TestExtensionIndex:
+    @pytest.mark.parametrize("file_categories", [shipped_categories(), DEFAULT_CONFIG['file_categories']],
+                             ids=["project_config", "defaults"])
+    def test_same_mapping_as_linear_lookup(self, file_categories):
+        """Test that the index maps every shipped extension like the old category walk"""
+        extensions = set()
+        for content in file_categories.values():
+            for group in (content.values() if isinstance(content, dict) else [content]):
+                extensions.update(group if isinstance(group, list) else [])
+        names = [f"file{ext}" for ext in extensions] + [f"FILE{ext.upper()}" for ext in extensions]
+        names += ["noext", ".bashrc", "archive.tar.gz", "file.unknown"]
+
+        handler = FileHandler({'file_categories': file_categories})
+        assert extensions
+        for name in names:
+            assert handler._get_file_category(name) == linear_category(file_categories, name), name
+
+    def test_multi_suffix(self):
+        """Test that a configured multi-dot suffix beats its last part, but needs a name in front"""
+        handler = FileHandler({'file_categories': {'archives': ['.tar.gz'], 'config': ['.gz']}})
+        assert handler._get_file_category("fw.tar.gz") == 'builds'
+        assert handler._get_file_category("fw.gz") == 'software/config'
+        assert handler._get_file_category(".tar.gz") == 'software/config'
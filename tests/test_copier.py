@@ -0,0 +1,70 @@
+import os
+import time
+import pytest
+from project_forge.core.copier import CopyEngine, CopyJob, FileCopier
+
+class TestCopyEngine:
+    def test_results_keep_submission_order(self):
+        """Test that results come back in job order"""
+        def slow_copy(source, target):
+            time.sleep(0.001 * (10 - int(source)))
+
+        engine = CopyEngine(workers=4, queue_size=2, copy_func=slow_copy)
+        jobs = [CopyJob(str(i), f"t{i}") for i in range(10)]
+        results = list(engine.run(jobs))
+        assert [r.job.source for r in results] == [str(i) for i in range(10)]
+        assert all(r.copied for r in results)
+
+    def test_errors_and_skips_are_reported(self):
+        """Test that copy errors and skipped jobs are surfaced per job"""
+        def failing_copy(source, target):
+            if source == "bad":
+                raise OSError("boom")
+
+        engine = CopyEngine(workers=2, copy_func=failing_copy)
+        results = list(engine.run([CopyJob("ok", "t1"), CopyJob("bad", "t2"), CopyJob("skip", None)]))
+        assert results[0].copied
+        assert isinstance(results[1].error, OSError)
+        assert not results[2].copied and results[2].error is None
+
+class TestFileCopier:
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Create a source file to copy"""
+        path = tmp_path / "datasheet.pdf"
+        path.write_bytes(b"x" * 4096)
+        return path
+
+    @pytest.mark.parametrize("mode", ["auto", "copy_file_range", "copy"])
+    def test_copy_modes_produce_identical_files(self, source, tmp_path, mode):
+        """Test that every copying backend yields an equal, independent file"""
+        copier = FileCopier(mode)
+        target = tmp_path / "out.pdf"
+        backend = copier.copy(str(source), str(target))
+        assert target.read_bytes() == source.read_bytes()
+        assert backend in copier.backends
+        assert copier.counts[backend] == 1
+
+    def test_short_copy_file_range_falls_back(self, source, tmp_path, monkeypatch):
+        """Test that hitting EOF before the expected size never leaves a truncated copy"""
+        monkeypatch.setattr(os, "copy_file_range", lambda src, dst, count: 0, raising=False)
+        target = tmp_path / "out.pdf"
+        FileCopier('copy_file_range').copy(str(source), str(target))
+        assert target.read_bytes() == source.read_bytes()
+
+    def test_hardlink_mode(self, source, tmp_path):
+        """Test that hardlink mode shares the inode"""
+        target = tmp_path / "linked.pdf"
+        FileCopier('hardlink').copy(str(source), str(target))
+        assert os.path.samefile(source, target)
+
+    def test_rename_mode_moves_source(self, source, tmp_path):
+        """Test that rename mode moves instead of copying"""
+        target = tmp_path / "moved.pdf"
+        FileCopier('rename').copy(str(source), str(target))
+        assert target.exists() and not source.exists()
+
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected"""
+        with pytest.raises(ValueError):
+            FileCopier('teleport')
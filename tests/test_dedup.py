@@ -0,0 +1,32 @@
+import pytest
+from project_forge.core.dedup import ContentIndex
+from project_forge.handlers.file_handler import FileHandler
+
+class TestContentIndex:
+    def test_is_duplicate(self, tmp_path):
+        """Test size and content comparison"""
+        a = tmp_path / "a.pdf"
+        b = tmp_path / "b.pdf"
+        c = tmp_path / "c.pdf"
+        a.write_bytes(b"same")
+        b.write_bytes(b"same")
+        c.write_bytes(b"diff")
+        index = ContentIndex()
+        assert index.is_duplicate(str(a), 4, str(b))
+        assert not index.is_duplicate(str(a), 4, str(c))
+        assert not index.is_duplicate(str(a), 4, str(b), 5)
+
+class TestOrganizeDedup:
+    def test_identical_files_stored_once(self, tmp_path):
+        """Test that identical datasheets are copied once and conflicts keep suffixes"""
+        source = tmp_path / "source"
+        for folder, content in [("a", "same"), ("b", "same"), ("c", "other")]:
+            (source / folder).mkdir(parents=True)
+            (source / folder / "datasheet.pdf").write_text(content)
+
+        handler = FileHandler({'file_categories': {'documents': {'office_docs': ['.pdf']}}})
+        organized, skipped = handler.organize_files(str(source), str(tmp_path / "target"), dedup=True)
+
+        stored = sorted(p.name for p in (tmp_path / "target" / "_docs" / "references").iterdir())
+        assert stored == ["datasheet.pdf", "datasheet_1.pdf"]
+        assert len(organized) == 3 and not skipped
@@ -0,0 +1,79 @@
+import os
+import pytest
+from project_forge.core.scanner import DirectoryScanner
+from project_forge.handlers.detectors import DetectorRegistry, ProjectDetector
+from project_forge.handlers.software_handler import SoftwareHandler
+
+class TestDetectorRegistry:
+    @pytest.fixture
+    def registry(self):
+        """Create the default registry with one general marker"""
+        return DetectorRegistry.from_config({'software_project_markers': {'files': ['setup.py']}})
+
+    def detect(self, registry, path):
+        matches = registry.detect(DirectoryScanner([r'^\.']), str(path))
+        return registry.best_match(matches).name
+
+    def test_builtin_types(self, registry, tmp_path):
+        """Test that each built-in project type is recognized"""
+        layouts = {
+            'esp-idf': ['sdkconfig', 'CMakeLists.txt'],
+            'zephyr': ['prj.conf', 'CMakeLists.txt'],
+            'cmake': ['CMakeLists.txt', 'setup.py'],
+            'kicad': ['board/board.kicad_pcb'],
+            'freecad': ['enclosure.FCStd'],
+        }
+        for expected, files in layouts.items():
+            project = tmp_path / expected
+            for name in files:
+                (project / name).parent.mkdir(parents=True, exist_ok=True)
+                (project / name).write_text("")
+            assert self.detect(registry, project) == expected
+
+    def test_root_markers_outrank_sketch_listed_first(self, registry, tmp_path):
+        """Test that platformio.ini wins even when a sketch is seen first"""
+        (tmp_path / "a.ino").write_text("")
+        (tmp_path / "platformio.ini").write_text("")
+        assert self.detect(registry, tmp_path) == "platformio"
+
+    def test_registered_detector_uses_same_scan(self, registry, tmp_path):
+        """Test that a custom detector is matched without another walk"""
+        registry.register(ProjectDetector('stm32cube', 95, suffixes=['.ioc']))
+        (tmp_path / "fw").mkdir()
+        (tmp_path / "fw" / "board.ioc").write_text("")
+        (tmp_path / "CMakeLists.txt").write_text("")
+        assert self.detect(registry, tmp_path) == "stm32cube"
+
+class TestDetectorCopy:
+    def test_kicad_copied_to_hardware(self, tmp_path):
+        """Test that a detector's destination and suffix files drive copy_project"""
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "board.kicad_pro").write_text("")
+        (source / "board.kicad_pcb").write_text("")
+        (source / "notes.txt").write_text("")
+
+        handler = SoftwareHandler({})
+        assert handler.detect_project_type(str(source))
+        handler.copy_project(str(source), str(tmp_path / "target"))
+        design = tmp_path / "target" / "hardware" / "pcb" / "design"
+        assert sorted(p.name for p in design.iterdir()) == ["board.kicad_pcb", "board.kicad_pro"]
+
+    def test_cad_files_do_not_displace_software(self, tmp_path):
+        """Test that a firmware project with design files keeps its layout and preserves both"""
+        source = tmp_path / "source"
+        (source / "src").mkdir(parents=True)
+        (source / "src" / "main.c").write_text("")
+        (source / "enclosure.FCStd").write_text("")
+        (source / "board.kicad_pcb").write_text("")
+
+        handler = SoftwareHandler({'software_project_markers': {'directories': ['src']}})
+        assert handler.detect_project_type(str(source))
+        assert handler.project_type == "general"
+        layout = handler.software_layout(str(source))
+        assert layout == [("src", os.path.join("software", "src")),
+                          ("board.kicad_pcb", os.path.join("hardware", "pcb", "design", "board.kicad_pcb")),
+                          ("enclosure.FCStd", os.path.join("cad", "models", "source", "enclosure.FCStd"))]
+        handler.copy_project(str(source), str(tmp_path / "target"), layout=layout)
+        assert (tmp_path / "target" / "software" / "src" / "main.c").exists()
+        assert (tmp_path / "target" / "cad" / "models" / "source" / "enclosure.FCStd").exists()
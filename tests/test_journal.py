@@ -0,0 +1,99 @@
+import os
+import pytest
+import yaml
+from project_forge.cli.reporter import QuietReporter
+from project_forge.core.journal import IN_PLACE_JOURNAL, Journal, rollback
+from project_forge.core.project_manager import ProjectManager
+
+class TestJournal:
+    def test_rollback_reverses_moves_and_dirs(self, tmp_path):
+        """Test that rollback undoes moves and removes created folders"""
+        (tmp_path / "a.txt").write_text("a")
+        with Journal(str(tmp_path / "journal.jsonl")) as journal:
+            journal.makedirs(str(tmp_path / "x" / "y"))
+            journal.record('move', src=str(tmp_path / "a.txt"), dst=str(tmp_path / "x" / "y" / "a.txt"))
+            os.rename(tmp_path / "a.txt", tmp_path / "x" / "y" / "a.txt")
+
+        records = Journal.load(str(tmp_path / "journal.jsonl"))
+        assert not Journal.is_committed(records)
+        assert rollback(records) == 3
+        assert (tmp_path / "a.txt").read_text() == "a"
+        assert not (tmp_path / "x").exists()
+
+class TestInPlaceOrganize:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a test-mode ProjectManager with a small structure"""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, 'w') as f:
+            yaml.dump({
+                'project_structure': {'_docs': {'subfolders': ['notes']}, 'software': {}},
+                'file_categories': {'documents': {'notes': ['.md', '.txt']}},
+                'ignore_patterns': [r'^\.'],
+                'defaults': {'status': 'ONGOING', 'create_readme': True,
+                             'readme_template': "# {project_name}\n"}
+            }, f)
+        manager = ProjectManager(str(config_path), test_mode=True)
+        manager.set_reporter(QuietReporter())
+        return manager
+
+    def test_moves_files_and_rolls_back(self, manager, tmp_path):
+        """Test that files are renamed into place and rollback restores the tree"""
+        source = tmp_path / "project"
+        (source / "sub").mkdir(parents=True)
+        (source / "todo.txt").write_text("todo")
+        (source / "sub" / "todo.txt").write_text("other")
+        (source / "data.bin").write_bytes(b"\0")
+        inode = os.stat(source / "todo.txt").st_ino
+
+        manager.organize_project_in_place(str(source), "demo", "ONGOING")
+        notes = source / "_docs" / "notes"
+        assert sorted(p.name for p in notes.iterdir()) == ["todo.txt", "todo_1.txt"]
+        assert os.stat(notes / "todo.txt").st_ino == inode
+        assert not (source / "todo.txt").exists()
+        assert (source / "data.bin").exists()
+        assert (source / "project.yaml").exists()
+        assert Journal.is_committed(Journal.load(str(source / IN_PLACE_JOURNAL)))
+
+        assert manager.rollback_in_place(str(source))
+        assert sorted(os.listdir(source)) == ["data.bin", "sub", "todo.txt"]
+        assert (source / "sub" / "todo.txt").read_text() == "other"
+
+    def test_second_run_leaves_organized_files(self, manager, tmp_path):
+        """Test that files already in their category folder are not renamed"""
+        source = tmp_path / "project"
+        source.mkdir()
+        (source / "todo.txt").write_text("todo")
+
+        manager.organize_project_in_place(str(source), "demo", "ONGOING")
+        manager.organize_project_in_place(str(source), "demo", "ONGOING")
+        assert os.listdir(source / "_docs" / "notes") == ["todo.txt"]
+
+    def test_in_place_plan_is_dry(self, manager, tmp_path):
+        """Test that planning an in-place run moves nothing and its plan is never copied"""
+        source = tmp_path / "project"
+        source.mkdir()
+        (source / "todo.txt").write_text("todo")
+        (source / "README.md").write_text("# demo")
+
+        plan = manager.plan_in_place(str(source), "demo", "ONGOING")
+        assert [(e.action, os.path.relpath(e.target, source)) for e in plan.entries] == [
+            ('copy', os.path.join("_docs", "notes", "todo.txt"))]
+        assert manager.execute_plan(plan) is None
+        assert sorted(os.listdir(source)) == ["README.md", "todo.txt"]
+
+    def test_partial_rollback_keeps_journal(self, manager, tmp_path):
+        """Test that a rollback that could not undo every move can be retried"""
+        source = tmp_path / "project"
+        source.mkdir()
+        (source / "todo.txt").write_text("todo")
+        manager.organize_project_in_place(str(source), "demo", "ONGOING")
+
+        (source / "todo.txt").write_text("new")
+        assert not manager.rollback_in_place(str(source))
+        assert not Journal.is_committed(Journal.load(str(source / IN_PLACE_JOURNAL)))
+        assert manager.organize_project_in_place(str(source), "demo", "ONGOING") is None
+
+        (source / "todo.txt").unlink()
+        assert manager.rollback_in_place(str(source))
+        assert os.listdir(source) == ["todo.txt"]
@@ -0,0 +1,55 @@
+import os
+import shutil
+import pytest
+from project_forge.core.library_store import LibraryStore
+
+@pytest.fixture
+def library(tmp_path):
+    """Create a PlatformIO-style library folder"""
+    library = tmp_path / "sources" / "ArduinoJson"
+    (library / "src").mkdir(parents=True)
+    (library / "library.json").write_text('{"name": "ArduinoJson", "version": "7.0.4"}')
+    (library / "src" / "ArduinoJson.h").write_text("#pragma once\n")
+    return library
+
+class TestLibraryStore:
+    def test_projects_share_one_entry(self, library, tmp_path):
+        """Test that the same library version is stored once and hardlinked"""
+        store = LibraryStore(str(tmp_path / "store"))
+        first = store.link(store.add(str(library)), str(tmp_path / "p1" / "lib" / "ArduinoJson"))
+        entry = store.add(str(library))
+        store.link(entry, str(tmp_path / "p2" / "lib" / "ArduinoJson"))
+
+        assert first == {'linked': 2}
+        assert os.path.basename(os.path.dirname(entry)) == "ArduinoJson"
+        assert os.path.basename(entry).startswith("7.0.4-")
+        assert os.listdir(tmp_path / "store" / "ArduinoJson") == [os.path.basename(entry)]
+        header = os.path.join("src", "ArduinoJson.h")
+        assert os.path.samefile(tmp_path / "p1" / "lib" / "ArduinoJson" / header,
+                                tmp_path / "p2" / "lib" / "ArduinoJson" / header)
+        assert store.link(entry, str(tmp_path / "p2" / "lib" / "ArduinoJson")) == {'unchanged': 2}
+
+    def test_stored_files_are_read_only(self, library, tmp_path):
+        """Test that a project cannot edit a stored library in place"""
+        store = LibraryStore(str(tmp_path / "store"))
+        store.link(store.add(str(library)), str(tmp_path / "p1" / "ArduinoJson"))
+        header = tmp_path / "p1" / "ArduinoJson" / "src" / "ArduinoJson.h"
+        assert not os.stat(header).st_mode & 0o222
+
+    def test_store_is_opt_in(self, tmp_path):
+        """Test that the store is only used when enabled in the config"""
+        assert LibraryStore.from_config({}, str(tmp_path)) is None
+        assert LibraryStore.from_config({'library_store': {'enabled': True}}, str(tmp_path)) is not None
+
+    def test_gc_removes_unreferenced_entries(self, library, tmp_path):
+        """Test that gc keeps entries still linked from a project"""
+        store = LibraryStore(str(tmp_path / "store"), link_mode='symlink')
+        entry = store.add(str(library))
+        store.link(entry, str(tmp_path / "p1" / "ArduinoJson"))
+        assert store.gc() == []
+
+        shutil.rmtree(tmp_path / "p1")
+        assert [key for key, _ in store.gc(dry_run=True)] == [os.path.relpath(entry, store.root)]
+        assert os.path.isdir(entry)
+        store.gc()
+        assert not os.path.exists(entry)
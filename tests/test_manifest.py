@@ -0,0 +1,80 @@
+import os
+import pytest
+from project_forge.core.manifest import SourceManifest
+from project_forge.handlers.file_handler import FileHandler
+
+class TestIncrementalOrganize:
+    @pytest.fixture
+    def handler(self):
+        """Create a FileHandler with a small category tree"""
+        return FileHandler({'file_categories': {'documents': {'notes': ['.md']}}})
+
+    def test_second_run_copies_only_deltas(self, handler, tmp_path):
+        """Test that unchanged files are skipped and changed ones replace their copy"""
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "a.md").write_text("a")
+        (source / "b.md").write_text("b")
+        target = tmp_path / "target"
+
+        handler.organize_files(str(source), str(target))
+        manifest = SourceManifest.load(str(target), str(source))
+        assert set(manifest.previous) == {"a.md", "b.md"}
+
+        (source / "b.md").write_text("b changed")
+        (source / "c.md").write_text("c")
+        plan = handler.plan_files(str(source), str(target))
+        actions = {os.path.basename(e.source): (e.action, os.path.basename(e.target)) for e in plan.entries}
+        assert actions == {"a.md": ("unchanged", "a.md"), "b.md": ("copy", "b.md"), "c.md": ("copy", "c.md")}
+
+        handler.organize_files(str(source), str(target))
+        notes = target / "_docs" / "notes"
+        assert sorted(p.name for p in notes.iterdir()) == ["a.md", "b.md", "c.md"]
+        assert (notes / "b.md").read_text() == "b changed"
+
+    def test_full_run_ignores_manifest(self, handler, tmp_path):
+        """Test that incremental=False copies everything again"""
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "a.md").write_text("a")
+        target = tmp_path / "target"
+        handler.organize_files(str(source), str(target))
+        handler.organize_files(str(source), str(target), incremental=False)
+        assert sorted(p.name for p in (target / "_docs" / "notes").iterdir()) == ["a.md", "a_1.md"]
+
+    @pytest.mark.parametrize("changed", ["a", "b"])
+    def test_changed_duplicate_keeps_shared_copy(self, handler, tmp_path, changed):
+        """Test that a changed file never overwrites a copy another file is a duplicate of"""
+        source = tmp_path / "source"
+        for folder in ("a", "b"):
+            (source / folder).mkdir(parents=True)
+            (source / folder / "datasheet.md").write_text("rev A")
+        target = tmp_path / "target"
+        handler.organize_files(str(source), str(target), dedup=True)
+
+        (source / changed / "datasheet.md").write_text("rev B")
+        handler.organize_files(str(source), str(target), dedup=True)
+        notes = target / "_docs" / "notes"
+        assert sorted(p.read_text() for p in notes.iterdir()) == ["rev A", "rev B"]
+        assert handler.plan_files(str(source), str(target), dedup=True).summary() == {
+            'unchanged': {'files': 2, 'bytes': 10}}
+
+    def test_interrupted_run_keeps_records(self, handler, tmp_path):
+        """Test that an interrupted run forgets no file and records every finished copy"""
+        source = tmp_path / "source"
+        source.mkdir()
+        for i in range(20):
+            (source / f"n{i:02}.md").write_text(str(i))
+        target = tmp_path / "target"
+        handler.organize_files(str(source), str(target))
+
+        for i in range(20, 40):
+            (source / f"n{i:02}.md").write_text(str(i))
+        results = handler.iter_organize(str(source), str(target))
+        next(results)
+        results.close()
+        assert set(SourceManifest.load(str(target), str(source)).previous) >= {f"n{i:02}.md" for i in range(20)}
+
+        handler.organize_files(str(source), str(target))
+        assert sorted(p.name for p in (target / "_docs" / "notes").iterdir()) == \
+            [f"n{i:02}.md" for i in range(40)]
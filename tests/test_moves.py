@@ -0,0 +1,100 @@
+import errno
+import os
+import pytest
+import yaml
+from project_forge.core.journal import Journal
+from project_forge.core.moves import MOVE_JOURNAL, STAGED_YAML, ProjectMover, with_status
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a workspace with three ONGOING projects"""
+    for name in ("alpha", "beta", "gamma"):
+        project = tmp_path / "ONGOING" / name
+        (project / "software" / "src").mkdir(parents=True)
+        (project / "software" / "src" / "main.c").write_text("int main;")
+        (project / "project.yaml").write_text(f"name: {name}\nstatus: ONGOING\nversion: 0.1.0\n")
+    (tmp_path / "DONE").mkdir()
+    return tmp_path
+
+def status_of(project):
+    return yaml.safe_load((project / "project.yaml").read_text())['status']
+
+class TestProjectMover:
+    def test_with_status_keeps_formatting(self):
+        """Test that only the status line of project.yaml is rewritten"""
+        assert with_status("name: x\nstatus: ONGOING\n# note\n", "DONE") == 'name: x\nstatus: "DONE"\n# note\n'
+        assert yaml.safe_load(with_status("name: x\n", "DONE")) == {'name': 'x', 'status': 'DONE'}
+
+    def test_batch_move(self, workspace):
+        """Test that valid moves are made and invalid ones reported and skipped"""
+        mover = ProjectMover(str(workspace))
+        moved = mover.move([("alpha", "ONGOING", "DONE"), ("beta", "ONGOING", "DONE"),
+                            ("missing", "ONGOING", "DONE"), ("gamma", "ONGOING", "LOST")])
+        assert moved == [str(workspace / "DONE" / "alpha"), str(workspace / "DONE" / "beta")]
+        assert status_of(workspace / "DONE" / "alpha") == "DONE"
+        assert not (workspace / "DONE" / "alpha" / STAGED_YAML).exists()
+        assert (workspace / "ONGOING" / "gamma").is_dir()
+        assert not (workspace / MOVE_JOURNAL).exists()
+
+    def test_cross_device_move(self, workspace, monkeypatch):
+        """Test that an EXDEV rename falls back to copy-then-delete"""
+        rename = os.rename
+        def no_cross_device_rename(src, dst):
+            if str(src).startswith(str(workspace / "ONGOING")):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            rename(src, dst)
+        monkeypatch.setattr(os, 'rename', no_cross_device_rename)
+
+        assert ProjectMover(str(workspace)).move([("alpha", "ONGOING", "DONE")]) == [str(workspace / "DONE" / "alpha")]
+        assert (workspace / "DONE" / "alpha" / "software" / "src" / "main.c").read_text() == "int main;"
+        assert status_of(workspace / "DONE" / "alpha") == "DONE"
+        assert not (workspace / "ONGOING" / "alpha").exists()
+        assert os.listdir(workspace / "DONE") == ["alpha"]
+
+    def test_recover_finishes_or_undoes(self, workspace):
+        """Test that an interrupted batch is finished for moved projects and undone for others"""
+        mover = ProjectMover(str(workspace))
+        with Journal(str(workspace / MOVE_JOURNAL)) as journal:
+            for name in ("alpha", "beta"):
+                journal.record('project_move', src=str(workspace / "ONGOING" / name),
+                               dst=str(workspace / "DONE" / name), status="DONE")
+                mover._stage_yaml(str(workspace / "ONGOING" / name), "DONE")
+        # Crash after alpha was renamed, before its metadata was swapped in
+        os.rename(workspace / "ONGOING" / "alpha", workspace / "DONE" / "alpha")
+
+        assert mover.recover() == 2
+        assert status_of(workspace / "DONE" / "alpha") == "DONE"
+        assert status_of(workspace / "ONGOING" / "beta") == "ONGOING"
+        assert not (workspace / "ONGOING" / "beta" / STAGED_YAML).exists()
+        assert not (workspace / MOVE_JOURNAL).exists()
+
+    def test_running_batch_is_not_recovered(self, workspace, monkeypatch):
+        """Test that recovery in another process leaves a batch that is still running alone"""
+        rename, recovered = os.rename, []
+        def rename_after_concurrent_start(src, dst):
+            recovered.append(ProjectMover(str(workspace)).recover())
+            rename(src, dst)
+        monkeypatch.setattr(os, 'rename', rename_after_concurrent_start)
+
+        ProjectMover(str(workspace)).move([("alpha", "ONGOING", "DONE")])
+        assert recovered == [0]
+        assert status_of(workspace / "DONE" / "alpha") == "DONE"
+
+    def test_unreadable_folder_aborts_cross_device_move(self, workspace, monkeypatch):
+        """Test that a folder the copy cannot read keeps the project at its source"""
+        rename, scandir = os.rename, os.scandir
+        def no_cross_device_rename(src, dst):
+            if str(src).startswith(str(workspace / "ONGOING")):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            rename(src, dst)
+        def unreadable_src(path):
+            if str(path).endswith(os.path.join("alpha", "software", "src")):
+                raise PermissionError(errno.EACCES, "Permission denied", str(path))
+            return scandir(path)
+        monkeypatch.setattr(os, 'rename', no_cross_device_rename)
+        monkeypatch.setattr(os, 'scandir', unreadable_src)
+
+        assert ProjectMover(str(workspace)).move([("alpha", "ONGOING", "DONE")]) == []
+        assert (workspace / "ONGOING" / "alpha" / "software" / "src" / "main.c").exists()
+        assert status_of(workspace / "ONGOING" / "alpha") == "ONGOING"
+        assert os.listdir(workspace / "DONE") == []
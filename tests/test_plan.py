@@ -0,0 +1,66 @@
+import pytest
+from project_forge.core.plan import OrganizePlan, OrganizeResult, PlanEntry
+from project_forge.handlers.file_handler import FileHandler
+
+class TestOrganizePlan:
+    @pytest.fixture
+    def handler(self):
+        """Create a FileHandler with a small category tree"""
+        return FileHandler({'file_categories': {
+            'documents': {'notes': ['.md'], 'office_docs': ['.pdf']}
+        }})
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Create a source directory with a few files"""
+        source = tmp_path / "source"
+        (source / "docs").mkdir(parents=True)
+        (source / "docs" / "notes.md").write_text("notes")
+        (source / "manual.pdf").write_text("pdf")
+        (source / "firmware.bin").write_text("bin")
+        return source
+
+    def test_plan_is_dry(self, handler, source, tmp_path):
+        """Test that planning records decisions without writing anything"""
+        target = tmp_path / "target"
+        plan = handler.plan_files(str(source), str(target))
+
+        assert not target.exists()
+        actions = {e.source.rsplit("/", 1)[-1]: e.action for e in plan.entries}
+        assert actions == {"notes.md": "copy", "manual.pdf": "copy", "firmware.bin": "skip"}
+        assert plan.summary()["copy"] == {"files": 2, "bytes": 8}
+
+    @pytest.mark.parametrize("filename", ["plan.json", "plan.jsonl"])
+    def test_round_trip_and_execute(self, handler, source, tmp_path, filename):
+        """Test writing, loading and replaying a plan"""
+        target = tmp_path / "target"
+        plan_path = str(tmp_path / filename)
+        handler.plan_files(str(source), str(target)).write(plan_path)
+
+        loaded = OrganizePlan.load(plan_path)
+        assert loaded.source_path == str(source)
+        assert all(isinstance(e, PlanEntry) for e in loaded.entries)
+
+        organized, skipped = handler.execute_plan(loaded.entries, loaded.source_path,
+                                                  target_dirs=loaded.target_dirs())
+        assert (target / "_docs" / "notes" / "notes.md").read_text() == "notes"
+        assert (target / "_docs" / "references" / "manual.pdf").exists()
+        assert len(organized) == 2 and len(skipped) == 1
+
+    def test_replayed_plan_does_not_overwrite(self, handler, source, tmp_path):
+        """Test that a target taken since planning is reported instead of overwritten"""
+        target = tmp_path / "target"
+        plan = handler.plan_files(str(source), str(target))
+        (target / "_docs" / "notes").mkdir(parents=True)
+        (target / "_docs" / "notes" / "notes.md").write_text("mine")
+
+        organized, _ = handler.execute_plan(plan.entries, plan.source_path, target_dirs=plan.target_dirs())
+        assert (target / "_docs" / "notes" / "notes.md").read_text() == "mine"
+        assert [t.rsplit("/", 1)[-1] for _, t in organized] == ["manual.pdf"]
+
+    def test_iter_organize_streams_results(self, handler, source, tmp_path):
+        """Test the generator API yields one record per file"""
+        results = list(handler.iter_organize(str(source), str(tmp_path / "target")))
+        statuses = {r.relative_path: r.status for r in results}
+        assert statuses == {"docs/notes.md": "copied", "manual.pdf": "copied", "firmware.bin": "skipped"}
+        assert all(isinstance(r, OrganizeResult) for r in results)
@@ -0,0 +1,41 @@
+import io
+import json
+import pytest
+from project_forge.cli.reporter import JsonReporter, ProgressReporter, QuietReporter, create_reporter
+
+class TestReporter:
+    def test_quiet_only_prints_errors_and_notes(self, capsys):
+        """Test that quiet mode drops per-file lines"""
+        reporter = QuietReporter()
+        reporter.item('success', "Organized: a.md")
+        reporter.item('error', "Error copying b.md")
+        reporter.note('header', "Summary")
+        out = capsys.readouterr().out
+        assert "a.md" not in out
+        assert "b.md" in out and "Summary" in out
+
+    def test_json_events(self):
+        """Test that JSON mode writes one object per event"""
+        stream = io.StringIO()
+        reporter = JsonReporter(stream)
+        reporter.item('success', "Organized: a.md", relative_path="a.md", status_code=1)
+        reporter.note('info', "\nDone")
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert events[0] == {'event': 'item', 'status': 'success', 'message': "Organized: a.md",
+                             'relative_path': "a.md", 'status_code': 1}
+        assert events[1]['message'] == "Done"
+
+    def test_progress_is_rate_limited(self):
+        """Test that the progress line is not redrawn for every item"""
+        stream = io.StringIO()
+        reporter = ProgressReporter(refresh_rate=1, stream=stream)
+        for i in range(1000):
+            reporter.item('success', f"file {i}")
+        reporter.close()
+        assert stream.getvalue().count('\r') <= 3
+        assert "1000 processed" in stream.getvalue()
+
+    def test_create_reporter(self):
+        """Test selecting a reporter by mode"""
+        assert isinstance(create_reporter('quiet'), QuietReporter)
+        assert type(create_reporter('lines')).__name__ == 'Reporter'
@@ -0,0 +1,95 @@
+import os
+import pytest
+from project_forge.core.journal import Journal
+from project_forge.core.reset import PURGE_PREFIX, RESET_JOURNAL, TRASH_DIR, StructureReset
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a workspace with two statuses, a project and a hidden store"""
+    project = tmp_path / "ONGOING" / "alpha"
+    project.mkdir(parents=True)
+    (project / "main.c").write_text("int main;")
+    (tmp_path / "DONE").mkdir()
+    (tmp_path / ".forge_libs").mkdir()
+    return tmp_path
+
+def build(workspace, *names):
+    for name in names:
+        (workspace / name).mkdir()
+    return list(names)
+
+class TestStructureReset:
+    def test_reset_replaces_folders(self, workspace):
+        """Test that folders are swapped for the new structure and the trash purged"""
+        reset = StructureReset(str(workspace))
+        assert reset.reset(lambda: build(workspace, "ACTIVE", "DONE")) == ["ACTIVE", "DONE"]
+        assert reset.folders() == ["ACTIVE", "DONE"]
+        assert (workspace / ".forge_libs").is_dir()
+        assert not (workspace / RESET_JOURNAL).exists()
+        reset.purge(wait=True)
+        assert os.listdir(workspace / TRASH_DIR) == []
+
+    def test_failed_build_restores_folders(self, workspace):
+        """Test that a build error removes the new folders and renames the old ones back"""
+        def failing_build():
+            build(workspace, "ACTIVE", "DONE")
+            raise KeyboardInterrupt
+        with pytest.raises(KeyboardInterrupt):
+            StructureReset(str(workspace)).reset(failing_build)
+        assert sorted(os.listdir(workspace)) == [".forge_libs", TRASH_DIR, "DONE", "ONGOING"]
+        assert (workspace / "ONGOING" / "alpha" / "main.c").read_text() == "int main;"
+
+    def test_recover_interrupted_reset(self, workspace):
+        """Test that recover() undoes a reset that never committed, keeping excluded folders"""
+        reset = StructureReset(str(workspace))
+        trash = workspace / TRASH_DIR / "reset_x"
+        trash.mkdir(parents=True)
+        (workspace / "KEEP").mkdir()
+        with Journal(str(workspace / RESET_JOURNAL)) as journal:
+            journal.record('reset', folders=reset.folders(), trash=str(trash))
+            journal.record('move', src=str(workspace / "ONGOING"), dst=str(trash / "ONGOING"))
+            os.rename(workspace / "ONGOING", trash / "ONGOING")
+            journal.record('move', src=str(workspace / "DONE"), dst=str(trash / "DONE"))
+        # Crash before DONE was moved, while the new structure was being built
+        build(workspace, "ONGOING", "ARCHIVE")
+
+        assert reset.recover()
+        assert reset.folders() == ["DONE", "KEEP", "ONGOING"]
+        assert (workspace / "ONGOING" / "alpha" / "main.c").exists()
+        assert not (workspace / RESET_JOURNAL).exists()
+        assert not reset.recover()
+        assert not trash.exists()
+
+    def test_unrestored_trash_is_kept(self, workspace):
+        """Test that trash a failed build blocks from being restored is neither purged nor forgotten"""
+        def failing_build():
+            (workspace / "ONGOING").mkdir()
+            (workspace / "ONGOING" / "README.md").write_text("new")
+            raise RuntimeError("build failed")
+        reset = StructureReset(str(workspace))
+        with pytest.raises(RuntimeError):
+            reset.reset(failing_build)
+        assert reset.unrestored and os.path.isdir(os.path.join(reset.unrestored, "ONGOING", "alpha"))
+        assert (workspace / RESET_JOURNAL).exists()
+        reset.purge(wait=True)
+        assert os.path.isdir(os.path.join(reset.unrestored, "ONGOING", "alpha"))
+
+        # Once the way is clear, the next recovery puts the folder back
+        (workspace / "ONGOING" / "README.md").unlink()
+        (workspace / "ONGOING").rmdir()
+        assert StructureReset(str(workspace)).recover()
+        assert (workspace / "ONGOING" / "alpha" / "main.c").exists()
+        assert not (workspace / RESET_JOURNAL).exists()
+
+    def test_running_reset_is_not_recovered(self, workspace):
+        """Test that recovery skips a reset whose journal is locked by its run"""
+        seen = {}
+        def build_while_another_process_starts():
+            seen['undone'] = StructureReset(str(workspace)).recover()
+            return build(workspace, "ACTIVE")
+        reset = StructureReset(str(workspace))
+        assert reset.reset(build_while_another_process_starts) == ["ACTIVE"]
+        assert seen['undone'] is False
+        assert reset.folders() == ["ACTIVE"]
+        trash = os.listdir(workspace / TRASH_DIR)
+        assert all(name.startswith(PURGE_PREFIX) for name in trash)
@@ -0,0 +1,36 @@
+import pytest
+from project_forge.core.scanner import DirectoryScanner
+
+class TestDirectoryScanner:
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Create a source tree with ignored and preserved folders"""
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text("")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.cpp").write_text("")
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "notes.md").write_text("notes")
+        (tmp_path / "readme.txt").write_text("")
+        return tmp_path
+
+    def test_prunes_ignored_directories(self, source):
+        """Test that ignored and preserved trees are never walked"""
+        scanner = DirectoryScanner([r'^\.', r'node_modules'], ['src'])
+        found = sorted(rel for _, rel in scanner.scan(str(source)))
+        assert found == ["docs/notes.md", "readme.txt"]
+
+    def test_reuses_dir_entry_stat(self, source):
+        """Test that yielded entries carry stat data"""
+        scanner = DirectoryScanner()
+        sizes = {rel: entry.stat().st_size for entry, rel in scanner.scan(str(source))}
+        assert sizes["docs/notes.md"] == 5
+        assert "node_modules/pkg/index.js" in sizes
+
+    def test_max_depth_and_dirs(self, source):
+        """Test that include_dirs yields folders and max_depth stops descending"""
+        scanner = DirectoryScanner([r'^\.', r'node_modules'], ['src'])
+        found = sorted(rel for _, rel in scanner.scan(str(source), include_dirs=True, max_depth=0))
+        assert found == ["docs", "readme.txt", "src"]
@@ -0,0 +1,136 @@
+import os
+import pytest
+from project_forge.core.copier import FileCopier
+from project_forge.core.scanner import DirectoryScanner
+from project_forge.core.snapshot import ScanSnapshot
+from project_forge.core.sync import TreeSync
+from project_forge.handlers.file_handler import FileHandler
+from project_forge.handlers.software_handler import SoftwareHandler
+
+@pytest.fixture
+def source(tmp_path):
+    """Create a small CMake project with docs"""
+    source = tmp_path / "source"
+    (source / "src" / "core").mkdir(parents=True)
+    (source / "src" / "core" / "main.cpp").write_text("int main() {}")
+    (source / "docs").mkdir()
+    (source / "docs" / "guide.md").write_text("guide")
+    (source / ".git").mkdir()
+    (source / ".git" / "HEAD").write_text("")
+    (source / "CMakeLists.txt").write_text("project(x)")
+    (source / "notes.md").write_text("notes")
+    return source
+
+class TestScanSnapshot:
+    def test_build_and_filter(self, source):
+        """Test that the snapshot keeps stat data and filters like the scanner"""
+        snapshot = ScanSnapshot.build(str(source), DirectoryScanner([r'^\.']))
+        sizes = {e.relative_path: e.size for e in snapshot.files()}
+        assert sizes == {"CMakeLists.txt": 10, "notes.md": 5,
+                         os.path.join("docs", "guide.md"): 5,
+                         os.path.join("src", "core", "main.cpp"): 13}
+        assert snapshot.contains(os.path.join("src", "core")) and snapshot.contains("notes.md")
+        assert not snapshot.contains(".git")
+
+        kept = {e.relative_path for e in snapshot.files(prune_dirs=['src'], exclude=['docs', 'notes.md'])}
+        assert kept == {"CMakeLists.txt"}
+        under = {e.relative_path for e in snapshot.files(under='src')}
+        assert under == {os.path.join("src", "core", "main.cpp")}
+
+    def test_one_copy_path_per_file(self, source, tmp_path):
+        """Test that files preserved by the software copy are not organized again"""
+        config = {'ignore_patterns': [r'^\.'],
+                  'file_categories': {'documents': {'notes': ['.md']}, 'config': ['.txt']}}
+        snapshot = ScanSnapshot.build(str(source), DirectoryScanner(config['ignore_patterns']))
+        software = SoftwareHandler(config)
+        assert software.detect_project_type(str(source), snapshot)
+        assert software.project_type == "cmake"
+
+        target = tmp_path / "target"
+        layout = software.software_layout(str(source), snapshot)
+        software.copy_project(str(source), str(target), snapshot=snapshot, layout=layout)
+        organized, _ = FileHandler(config).organize_files(str(source), str(target), snapshot=snapshot,
+                                                          exclude=[s for s, _ in layout])
+
+        assert (target / "software" / "src" / "core" / "main.cpp").exists()
+        assert (target / "software" / "docs" / "guide.md").exists()
+        assert [os.path.basename(t) for _, t in organized] == ["notes.md"]
+
+    def test_root_sketch_keeps_other_files_organized(self, tmp_path):
+        """Test that a sketch at the source root only preserves its sources, src/ and libraries/"""
+        source = tmp_path / "blink"
+        (source / "src").mkdir(parents=True)
+        (source / "src" / "led.h").write_text("#define LED 13")
+        (source / "blink.ino").write_text("void setup() {}")
+        (source / "datasheet.pdf").write_text("pdf")
+        (source / "photo.jpg").write_text("jpg")
+        config = {'ignore_patterns': [r'^\.'], 'arduino_libraries': {'resolve_includes': False},
+                  'file_categories': {'documents': {'office_docs': ['.pdf']}, 'media': {'images': ['.jpg']}}}
+        snapshot = ScanSnapshot.build(str(source), DirectoryScanner(config['ignore_patterns']))
+        software = SoftwareHandler(config)
+        assert software.detect_project_type(str(source), snapshot)
+
+        target = tmp_path / "target"
+        layout = software.software_layout(str(source), snapshot)
+        assert layout == [("blink.ino", os.path.join("software", "blink", "blink.ino")),
+                          ("src", os.path.join("software", "blink", "src"))]
+        software.copy_project(str(source), str(target), snapshot=snapshot, layout=layout)
+        organized, _ = FileHandler(config).organize_files(str(source), str(target), snapshot=snapshot,
+                                                          exclude=[s for s, _ in layout])
+
+        assert (target / "software" / "blink" / "blink.ino").exists()
+        assert (target / "software" / "blink" / "src" / "led.h").exists()
+        assert sorted(os.path.basename(t) for _, t in organized) == ["datasheet.pdf", "photo.jpg"]
+        assert not (target / "software" / "blink" / "datasheet.pdf").exists()
+
+    def test_preserved_folders_keep_ignored_files_and_symlinks(self, source, tmp_path):
+        """Test that preserved folders are copied whole, like copytree(symlinks=True)"""
+        (source / "src" / ".clang-format").write_text("style")
+        os.symlink("core/main.cpp", source / "src" / "main.cpp")
+        snapshot = ScanSnapshot.build(str(source), DirectoryScanner([r'^\.']))
+        software = SoftwareHandler({'ignore_patterns': [r'^\.']})
+        assert software.detect_project_type(str(source), snapshot)
+        software.copy_project(str(source), str(tmp_path / "target"), snapshot=snapshot)
+
+        src = tmp_path / "target" / "software" / "src"
+        assert (src / ".clang-format").read_text() == "style"
+        assert os.readlink(src / "main.cpp") == "core/main.cpp"
+
+class TestSoftwareDeltaSync:
+    def test_excludes_caches_and_copies_only_changes(self, tmp_path):
+        """Test that build caches are skipped and a re-import only copies deltas"""
+        source = tmp_path / "fw"
+        (source / "src").mkdir(parents=True)
+        (source / ".pio" / "build" / "esp32").mkdir(parents=True)
+        (source / ".pio" / "build" / "esp32" / "firmware.bin").write_bytes(b"\0" * 64)
+        (source / "platformio.ini").write_text("[env:esp32]")
+        (source / "src" / "main.cpp").write_text("v1")
+        (source / "src" / "old.cpp").write_text("old")
+        target = tmp_path / "target"
+
+        handler = SoftwareHandler({'ignore_patterns': [r'^\.']})
+        assert handler.detect_project_type(str(source))
+        handler.copy_project(str(source), str(target))
+        software = target / "software"
+        assert not (software / ".pio" / "build").exists()
+        assert (software / "src" / "main.cpp").read_text() == "v1"
+
+        (software / "src" / "local.txt").write_text("")
+        (source / "src" / "old.cpp").unlink()
+        (source / "src" / "main.cpp").write_text("v2")
+        handler.copy_project(str(source), str(target))
+        assert sorted(p.name for p in (software / "src").iterdir()) == ["local.txt", "main.cpp", "old.cpp"]
+        assert (software / "src" / "main.cpp").read_text() == "v2"
+
+        # Removing what the source no longer has is opt-in
+        handler.copy_project(str(source), str(target), delete_removed=True)
+        assert sorted(p.name for p in (software / "src").iterdir()) == ["main.cpp"]
+
+    def test_second_sync_copies_nothing(self, tmp_path):
+        """Test that an unchanged tree is left alone on the next sync"""
+        (tmp_path / "a" / "sub").mkdir(parents=True)
+        (tmp_path / "a" / "sub" / "x.h").write_text("x")
+        (tmp_path / "a" / "y.c").write_text("y")
+        sync = TreeSync(FileCopier())
+        assert sync.run(str(tmp_path / "a"), str(tmp_path / "b"))['copied'] == 2
+        assert sync.run(str(tmp_path / "a"), str(tmp_path / "b")) == {'unchanged': 2}
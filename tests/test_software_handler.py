@@ -25,4 +25,34 @@ class TestSoftwareHandler:
         
         # Test Arduino project
         (project_dir / "sketch.ino").write_text("")
-        assert handler.detect_project_type(str(project_dir)) == "arduino"
\ No newline at end of file
+        assert handler.detect_project_type(str(project_dir)) == "arduino"
+
+class TestProjectDetection:
+    @pytest.fixture
+    def handler(self):
+        """Create a SoftwareHandler with general markers and a depth limit"""
+        return SoftwareHandler({
+            'software_project_markers': {'files': ['setup.py'], 'directories': ['src']},
+            'software_detection': {'max_depth': 2},
+            'ignore_patterns': [r'^\.']
+        })
+
+    def test_sketch_outranks_general_markers(self, handler, tmp_path):
+        """Test that a nested .ino wins over markers found earlier"""
+        (tmp_path / "setup.py").write_text("")
+        (tmp_path / "firmware").mkdir()
+        (tmp_path / "firmware" / "blink.ino").write_text("")
+        assert handler.detect_project_type(str(tmp_path))
+        assert handler.project_type == "arduino"
+
+    def test_respects_max_depth_and_ignores(self, handler, tmp_path):
+        """Test that markers below max_depth or in ignored folders are not seen"""
+        (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+        (tmp_path / "a" / "b" / "c" / "setup.py").write_text("")
+        (tmp_path / ".cache").mkdir()
+        (tmp_path / ".cache" / "sketch.ino").write_text("")
+        assert not handler.detect_project_type(str(tmp_path))
+
+        (tmp_path / "a" / "src").mkdir()
+        assert handler.detect_project_type(str(tmp_path))
+        assert handler.project_type == "general"
@@ -0,0 +1,39 @@
+import os
+import yaml
+from project_forge.core.project_manager import PROJECT_YAML_TEMPLATE
+from project_forge.core.structure import ProjectSkeleton, compile_structure
+
+STRUCTURE = {'_docs': {'subfolders': ['notes']},
+             'cad': {'subfolders': {'models': ['source'],
+                                    'drawings': {'description': 'x', 'subfolders': {'assembly': []}}}},
+             'software': {}}
+
+class TestStructure:
+    def test_compile_structure(self):
+        """Test that nested structures of any depth flatten with parents first"""
+        assert compile_structure(STRUCTURE) == [
+            '_docs', os.path.join('_docs', 'notes'), 'cad', os.path.join('cad', 'models'),
+            os.path.join('cad', 'models', 'source'), os.path.join('cad', 'drawings'),
+            os.path.join('cad', 'drawings', 'assembly'), 'software']
+
+class TestProjectSkeleton:
+    def test_materialize_keeps_existing_metadata(self, tmp_path):
+        """Test that a skeleton creates folders and only missing metadata files"""
+        skeleton = ProjectSkeleton.compile(STRUCTURE, PROJECT_YAML_TEMPLATE, "# {project_name} ({date})\n")
+        project = tmp_path / "demo"
+        assert skeleton.materialize(str(project), "demo", "ONGOING", tags=['a'], date='2024-01-02') \
+            == (8, ['project.yaml', 'README.md'])
+        data = yaml.safe_load((project / "project.yaml").read_text())
+        assert (data['name'], data['created_date'], data['metadata']['tags']) == ('demo', '2024-01-02', ['a'])
+        assert (project / "README.md").read_text() == "# demo (2024-01-02)\n"
+
+        (project / "README.md").write_text("mine")
+        assert skeleton.materialize(str(project), "demo", "ONGOING") == (0, [])
+        assert (project / "README.md").read_text() == "mine"
+
+    def test_version_follows_config(self):
+        """Test that the version changes with the structure or templates"""
+        version = ProjectSkeleton.version_of(STRUCTURE, PROJECT_YAML_TEMPLATE, None)
+        assert version == ProjectSkeleton.version_of(dict(STRUCTURE), PROJECT_YAML_TEMPLATE, None)
+        assert version != ProjectSkeleton.version_of({'software': {}}, PROJECT_YAML_TEMPLATE, None)
+        assert version != ProjectSkeleton.version_of(STRUCTURE, PROJECT_YAML_TEMPLATE, "# {project_name}\n")
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import pytest
+from project_forge.core.utils import NameRegistry, PathUtils, is_case_insensitive
+
+class TestNameRegistry:
+    def test_claim_seeds_from_directory(self, tmp_path):
+        """Test that names on disk and names claimed this run are both avoided"""
+        (tmp_path / "main.cpp").write_text("")
+        (tmp_path / "main_1.cpp").write_text("")
+        registry = NameRegistry()
+        assert registry.claim(str(tmp_path), "main.cpp") == "main_2.cpp"
+        assert registry.claim(str(tmp_path), "main.cpp") == "main_3.cpp"
+        assert registry.claim(str(tmp_path), "other.cpp") == "other.cpp"
+        assert registry.claim(str(tmp_path), "other.cpp") == "other_1.cpp"
+
+    def test_claim_without_extension_split(self, tmp_path):
+        """Test folder-style suffixes"""
+        (tmp_path / "blink.v2").mkdir()
+        registry = NameRegistry()
+        assert registry.claim(str(tmp_path), "blink.v2", split_ext=False) == "blink.v2_1"
+
+    def test_iter_taken(self, tmp_path):
+        """Test iterating over the taken variants of a name"""
+        registry = NameRegistry()
+        registry.reserve(str(tmp_path), "a.pdf")
+        registry.reserve(str(tmp_path), "a_1.pdf")
+        assert list(registry.iter_taken(str(tmp_path), "a.pdf")) == ["a.pdf", "a_1.pdf"]
+
+    @pytest.mark.parametrize("case_sensitive", [True, False])
+    def test_case_sensitivity_setting(self, tmp_path, case_sensitive):
+        """Test that names differing only in case collide only when the filesystem folds case"""
+        (tmp_path / "main.cpp").write_text("")
+        registry = NameRegistry(case_sensitive)
+        expected = "Main.cpp" if case_sensitive else "Main_1.cpp"
+        assert registry.claim(str(tmp_path), "Main.cpp") == expected
+
+    def test_case_sensitivity_is_probed(self, tmp_path):
+        """Test that the filesystem decides by default, probed at the nearest existing folder"""
+        registry = NameRegistry()
+        registry.reserve(str(tmp_path / "new"), "a.pdf")
+        assert registry.is_taken(str(tmp_path / "new"), "A.pdf") == is_case_insensitive(str(tmp_path))
+        assert os.listdir(tmp_path) == []
+
+    def test_probe_is_shared(self, tmp_path, monkeypatch):
+        """Test that path helpers without a registry do not probe the filesystem again"""
+        NameRegistry().is_taken(str(tmp_path), "a.pdf")
+        monkeypatch.setattr(tempfile, "NamedTemporaryFile", None)
+        (tmp_path / "notes.md").write_text("")
+        for _ in range(3):
+            assert PathUtils.ensure_unique_path(str(tmp_path / "notes.md")) == str(tmp_path / "notes_1.md")
+
+    def test_ensure_unique_path(self, tmp_path):
+        """Test the PathUtils wrapper"""
+        (tmp_path / "notes.md").write_text("")
+        assert PathUtils.ensure_unique_path(str(tmp_path / "notes.md")) == str(tmp_path / "notes_1.md")